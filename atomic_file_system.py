@@ -6,6 +6,8 @@ Provides enterprise-grade file handling for the Discord bot framework
 
 import os
 import json
+import copy
+import bisect
 import asyncio
 import aiofiles
 import tempfile
@@ -14,7 +16,10 @@ from pathlib import Path
 from typing import Any, Dict, Optional, List, Tuple
 from datetime import datetime, timedelta
 from collections import OrderedDict
+from types import MappingProxyType
 import logging
+import logging.handlers
+import threading
 import time
 import traceback
 from discord.ext import commands, tasks
@@ -528,12 +533,69 @@ class SafeConfig:
         self.file_handler = file_handler or AtomicFileHandler()
         self.data = {}
         self._initialized = False
+        self._subscribers: List[Tuple[str, Any, bool]] = []
+        self._index: MappingProxyType = MappingProxyType({})
+        self.version = 0
+    
+    def subscribe(self, prefix: str, callback, local_only: bool = False):
+        """Call ``callback(key, value)`` (sync or async) whenever ``prefix``, a key below it or a
+        parent of it changes (``""`` matches every key). Fires for local ``set`` calls and for
+        in-memory ``apply`` updates from other clusters, unless ``local_only`` is set"""
+        if not any(p == prefix and cb == callback for p, cb, _ in self._subscribers):
+            self._subscribers.append((prefix, callback, local_only))
+    
+    def unsubscribe(self, prefix: str, callback):
+        self._subscribers = [s for s in self._subscribers if not (s[0] == prefix and s[1] == callback)]
+    
+    @property
+    def snapshot(self) -> MappingProxyType:
+        """Read-only flattened view of the current version (``"a.b.c" -> value``, parents included)"""
+        return self._index
+    
+    def _rebuild_index(self):
+        index = {}
+        pending = [("", self.data)]
+        while pending:
+            prefix, node = pending.pop()
+            for k, v in node.items():
+                key = f"{prefix}{k}"
+                index[key] = v
+                if isinstance(v, dict):
+                    pending.append((f"{key}.", v))
+        self._index = MappingProxyType(index)
+        self.version += 1
+    
+    def _notify(self, changes: Dict[str, Any], local: bool) -> List[Any]:
+        """Run matching callbacks; returns the coroutines of async ones for the caller to await"""
+        pending = []
+        for key, value in changes.items():
+            callbacks = [
+                callback for prefix, callback, local_only in self._subscribers
+                if (local or not local_only)
+                and (not prefix or key == prefix or key.startswith(f"{prefix}.") or prefix.startswith(f"{key}."))
+            ]
+            for callback in callbacks:
+                try:
+                    result = callback(key, value)
+                    if asyncio.iscoroutine(result):
+                        pending.append(result)
+                except Exception as e:
+                    logger.error(f"SafeConfig: Listener error for {key}: {e}")
+        return pending
+    
+    async def _await_callbacks(self, pending: List[Any]):
+        for result in pending:
+            try:
+                await result
+            except Exception as e:
+                logger.error(f"SafeConfig: Listener error: {e}")
     
     async def initialize(self):
         """Initialize configuration from file"""
         if self._initialized:
             return
         self.data = await self._load_config()
+        self._rebuild_index()
         self._initialized = True
         logger.info(f"SafeConfig: Initialized from {self.config_path}")
     
@@ -595,6 +657,7 @@ class SafeConfig:
         """Save configuration atomically"""
         if data:
             self.data = data
+        self._rebuild_index()
         success = await self.file_handler.atomic_write_json(self.config_path, self.data)
         if success:
             logger.debug("SafeConfig: Configuration saved")
@@ -602,20 +665,16 @@ class SafeConfig:
             logger.error("SafeConfig: Failed to save configuration")
     
     def get(self, key: str, default: Any = None) -> Any:
-        """Get configuration value with dot notation support"""
-        keys = key.split('.')
-        value = self.data
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k)
-            else:
-                return default
-            if value is None:
-                return default
+        """Get configuration value with dot notation support (one lookup in the flattened index).
+        Dicts and lists are returned as copies so callers can't mutate the live config"""
+        value = self._index.get(key)
+        if value is None:
+            return default
+        if isinstance(value, (dict, list)):
+            return copy.deepcopy(value)
         return value
     
-    async def set(self, key: str, value: Any):
-        """Set configuration value with dot notation support"""
+    def _assign(self, key: str, value: Any):
         keys = key.split('.')
         data = self.data
         for k in keys[:-1]:
@@ -623,8 +682,27 @@ class SafeConfig:
                 data[k] = {}
             data = data[k]
         data[keys[-1]] = value
+    
+    def apply(self, key: str, value: Any):
+        """Update the in-memory value only — for changes another process already persisted"""
+        self._assign(key, value)
+        self._rebuild_index()
+        pending = self._notify({key: value}, local=False)
+        if pending:
+            asyncio.get_running_loop().create_task(self._await_callbacks(pending))
+    
+    async def set(self, key: str, value: Any):
+        """Set configuration value with dot notation support"""
+        await self.set_many({key: value})
+    
+    async def set_many(self, values: Dict[str, Any]):
+        """Set several dotted keys, then persist and re-index once"""
+        for key, value in values.items():
+            self._assign(key, value)
         await self.save()
-        logger.debug(f"SafeConfig: Set {key} = {value}")
+        for key, value in values.items():
+            logger.debug(f"SafeConfig: Set {key} = {value}")
+        await self._await_callbacks(self._notify(values, local=True))
 
 
 class SafeDatabaseManager:
@@ -860,6 +938,198 @@ class SafeDatabaseManager:
                 del self._connection_locks[guild_id]
 
 
+class BatchedLogFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    File handler for the log writer thread
+    Flushes when the pending queue drains (or on ERROR and above) instead of after every
+    record, and performs rollovers requested from the event loop by renaming
+    """
+    
+    def __init__(self, filename: str, mode: str = "a", maxBytes: int = 0, backupCount: int = 0,
+                 encoding: Optional[str] = None, pending=None):
+        super().__init__(filename, mode=mode, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding)
+        self.pending = pending
+        self._rollover_requested = False
+    
+    def request_rollover(self):
+        """Rotate before the next record is written (safe to call from any thread)"""
+        self._rollover_requested = True
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            if self._rollover_requested or self.shouldRollover(record):
+                self._rollover_requested = False
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR or self.pending is None or self.pending.empty():
+                self.stream.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record, for log shippers"""
+    
+    def __init__(self):
+        super().__init__()
+        self.cluster = os.getenv("SHARD_CLUSTER_NAME") if os.getenv("ZDBF_LAUNCHER") else None
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": f"{self.formatTime(record, '%Y-%m-%dT%H:%M:%S')}.{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+        }
+        if self.cluster:
+            entry["cluster"] = self.cluster
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+DEFAULT_LOG_RATE_LIMITS = {
+    "default": {"rate": 20, "burst": 100},
+}
+
+
+class LogRateLimiter(logging.Filter):
+    """
+    Per-call-site token buckets and sampling, applied before records are queued
+    Rules are keyed by logger name (longest dotted prefix wins, then ``default``):
+    ``rate`` records/s (0 = unlimited), ``burst`` bucket size, ``sample`` fraction kept,
+    ``max_level`` highest level affected (ERROR and above always pass by default)
+    """
+    
+    def __init__(self, rules: Optional[Dict[str, dict]] = None):
+        super().__init__()
+        self._lock = threading.Lock()
+        self.dropped_total = 0
+        self.configure(rules)
+    
+    def configure(self, rules: Optional[Dict[str, dict]] = None):
+        compiled = {}
+        for name, rule in (rules or DEFAULT_LOG_RATE_LIMITS).items():
+            if not isinstance(rule, dict):
+                continue
+            try:
+                sample = float(rule.get("sample", 1.0))
+                level = rule.get("max_level", "WARNING")
+                compiled[name] = (
+                    max(0.0, float(rule.get("rate", 0))),
+                    max(1.0, float(rule.get("burst", rule.get("rate", 1) or 1))),
+                    max(1, round(1 / sample)) if 0 < sample < 1 else 1,
+                    logging.getLevelName(level) if isinstance(level, str) else int(level),
+                )
+            except (TypeError, ValueError, ZeroDivisionError) as e:
+                logger.error(f"LogRateLimiter: Invalid rule for '{name}': {e}")
+        with self._lock:
+            self._rules = compiled
+            self._resolved: Dict[str, Optional[tuple]] = {}
+            # site -> [tokens, last seen, seen count, suppressed, first suppressed at]
+            self._sites: Dict[Tuple[str, str, int], list] = {}
+    
+    def _rule_for(self, name: str) -> Optional[tuple]:
+        rule = self._resolved.get(name, False)
+        if rule is False:
+            probe = name
+            rule = self._rules.get(probe)
+            while rule is None and "." in probe:
+                probe = probe.rsplit(".", 1)[0]
+                rule = self._rules.get(probe)
+            if rule is None:
+                rule = self._rules.get("default")
+            self._resolved[name] = rule
+        return rule
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        rule = self._rule_for(record.name)
+        if rule is None or not isinstance(rule[3], int) or record.levelno > rule[3]:
+            return True
+        rate, burst, every, _ = rule
+        now = time.monotonic()
+        
+        with self._lock:
+            key = (record.name, record.pathname, record.lineno)
+            site = self._sites.get(key)
+            if site is None:
+                site = self._sites[key] = [burst, now, 0, 0, 0.0]
+            
+            if rate > 0:
+                site[0] = min(burst, site[0] + (now - site[1]) * rate)
+            site[1] = now
+            site[2] += 1
+            allowed = every == 1 or site[2] % every == 1
+            if allowed and rate > 0:
+                if site[0] >= 1:
+                    site[0] -= 1
+                else:
+                    allowed = False
+            
+            if not allowed:
+                if not site[3]:
+                    site[4] = now
+                site[3] += 1
+                self.dropped_total += 1
+                return False
+            
+            suppressed, since = site[3], site[4]
+            site[3] = 0
+        
+        if suppressed:
+            record.msg = f"{record.getMessage()} [suppressed {suppressed} similar messages in {now - since:.0f}s]"
+            record.args = None
+        return True
+    
+    def flush(self, older_than: float = 60.0) -> List[Tuple[str, int, int]]:
+        """Collect and reset counts for sites that went quiet while suppressed,
+        so their summary is not lost; returns ``(path, line, count)``"""
+        now = time.monotonic()
+        quiet = []
+        with self._lock:
+            for (_, path, line), site in self._sites.items():
+                if site[3] and now - site[1] >= older_than:
+                    quiet.append((path, line, site[3]))
+                    site[3] = 0
+        return quiet
+    
+    def stats(self, top: int = 5) -> Dict[str, Any]:
+        with self._lock:
+            suppressing = sorted(
+                ((f"{Path(path).name}:{line}", site[3]) for (_, path, line), site in self._sites.items() if site[3]),
+                key=lambda item: item[1], reverse=True
+            )
+            return {
+                "dropped_total": self.dropped_total,
+                "call_sites": len(self._sites),
+                "suppressing": suppressing[:top],
+            }
+
+
+class BucketHistogram:
+    """Fixed-bucket counter shared by the latency histograms. ``counts[i]``
+    holds values ``<= BOUNDS[i]``; the final slot is the overflow bucket."""
+
+    BOUNDS: Tuple[float, ...] = ()
+
+    __slots__ = ("counts",)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+
+    def bucket(self, value: float):
+        self.counts[bisect.bisect_left(self.BOUNDS, value)] += 1
+
+    def labels(self, unit: str = "") -> List[str]:
+        return [f"<={b}{unit}" for b in self.BOUNDS] + [f">{self.BOUNDS[-1]}{unit}"]
+
+
 class SafeLogRotator:
     """Safe log file rotation with size and age management"""
     
@@ -869,8 +1139,13 @@ class SafeLogRotator:
         self.backup_count = backup_count
         self.log_dir.mkdir(exist_ok=True)
         self._rotation_lock = asyncio.Lock()
+        self._handlers: Dict[Path, BatchedLogFileHandler] = {}
         logger.info(f"SafeLogRotator: Initialized with max_size={max_size}, backup_count={backup_count}")
     
+    def attach_handler(self, handler: BatchedLogFileHandler):
+        """Files written by a live handler are rotated by that handler on its own thread"""
+        self._handlers[Path(handler.baseFilename).resolve()] = handler
+    
     def should_rotate(self, log_file: Path) -> bool:
         """Check if log file should be rotated"""
         if not log_file.exists():
@@ -878,27 +1153,26 @@ class SafeLogRotator:
         return log_file.stat().st_size >= self.max_size
 
     async def rotate_log(self, log_file: Path):
-        """Rotate log file with backup management"""
+        """Rotate log file with backup management (renames only, never copies)"""
         async with self._rotation_lock:
             if not self.should_rotate(log_file):
                 return
             
+            handler = self._handlers.get(log_file.resolve())
+            if handler is not None:
+                handler.request_rollover()
+                logger.info(f"SafeLogRotator: Rotation requested for {log_file.name}")
+                return
+            
             for i in range(self.backup_count - 1, 0, -1):
                 old_backup = log_file.with_suffix(f"{log_file.suffix}.{i}")
                 new_backup = log_file.with_suffix(f"{log_file.suffix}.{i+1}")
                 
                 if old_backup.exists():
-                    if new_backup.exists():
-                        new_backup.unlink()
-                    old_backup.rename(new_backup)
-            
-            first_backup = log_file.with_suffix(f"{log_file.suffix}.1")
-            if first_backup.exists():
-                first_backup.unlink()
+                    os.replace(old_backup, new_backup)
             
             if log_file.exists():
-                shutil.copy2(log_file, first_backup)
-                log_file.unlink()
+                os.replace(log_file, log_file.with_suffix(f"{log_file.suffix}.1"))
                 log_file.touch()
             
             logger.info(f"SafeLogRotator: Rotated log file: {log_file.name}")
@@ -10,7 +10,9 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import asyncio
+import heapq
 import re
+import time
 from collections import defaultdict
 import aiohttp
 import aiofiles
@@ -89,6 +91,11 @@ class AdvancedConditionEngine:
         else:
             return any(results) if results else False
 
+async def hook_id_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+    if interaction.guild_id is None:
+        return []
+    return await interaction.client.autocomplete.choices("hooks", current, scope=interaction.guild_id)
+
 class EventHooksCreater(commands.Cog):
     hooks_group = app_commands.Group(name="hooks", description="Manage event hooks for this server")
 
@@ -103,7 +110,14 @@ class EventHooksCreater(commands.Cog):
         self._cooldowns = defaultdict(dict)
         self._analytics = self._load_analytics()
         self._user_message_counts = defaultdict(int)
-        self._scheduled_tasks = {}
+        # Shared timer heap for scheduled hooks: (due_ts, hook_id). Stale entries are
+        # skipped lazily by comparing against _schedule_due.
+        self._schedule_heap: List[tuple] = []
+        self._schedule_due: Dict[str, float] = {}
+        self._scheduled_hooks: Dict[str, Dict[str, Any]] = {}
+        self._schedule_wakeup = asyncio.Event()
+        self._scheduler_task: Optional[asyncio.Task] = None
+        self._fire_tasks: set = set()
         self._registered_hook_ids: set = set()
         self._dirty: bool = False
         self._http_session: aiohttp.ClientSession = None
@@ -112,6 +126,8 @@ class EventHooksCreater(commands.Cog):
 
         self.condition_engine = AdvancedConditionEngine()
         self._register_all_hooks()
+        for hook in self.created_hooks:
+            self._index_hook(hook)
         self.analytics_task.start()
         self.auto_save_task.start()
 
@@ -119,14 +135,23 @@ class EventHooksCreater(commands.Cog):
 
     async def cog_load(self):
         self._http_session = aiohttp.ClientSession()
+        self._ensure_scheduler()
 
     async def cog_unload(self):
         self.analytics_task.cancel()
         self.auto_save_task.cancel()
         for hook in self.created_hooks:
             self._unregister_hook(hook)
+        if self._scheduler_task and not self._scheduler_task.done():
+            self._scheduler_task.cancel()
+        for task in list(self._fire_tasks):
+            task.cancel()
+        if self._dirty:
+            await self._save_created_hooks()
+            self._dirty = False
         if self._http_session and not self._http_session.closed:
             await self._http_session.close()
+        self.bot.autocomplete.unregister("hooks")
 
     def _load_analytics(self) -> Dict:
         if self.analytics_file.exists():
@@ -824,7 +849,7 @@ class EventHooksCreater(commands.Cog):
                 logger.error(f"EventHooksCreater: Failed to load hooks: {e}")
         return []
 
-    async def _save_created_hooks(self):
+    async def _save_created_hooks(self) -> bool:
         try:
             # Create a copy without handler functions (not JSON serializable)
             serializable_hooks = []
@@ -835,8 +860,15 @@ class EventHooksCreater(commands.Cog):
             content = json.dumps(serializable_hooks, indent=4)
             async with aiofiles.open(self.config_file, 'w', encoding='utf-8') as f:
                 await f.write(content)
+            return True
         except Exception as e:
             logger.error(f"EventHooksCreater: Failed to save hooks: {e}")
+            return False
+
+    def _index_hook(self, hook: Dict[str, Any]):
+        self.bot.autocomplete.index("hooks", hook.get("guild_id")).add(
+            hook["hook_id"], f"{hook.get('template_name', hook['template_id'])} ({hook['hook_id']})"
+        )
 
     def _register_all_hooks(self):
         for hook in self.created_hooks:
@@ -1296,38 +1328,7 @@ class EventHooksCreater(commands.Cog):
             self._registered_hook_ids.add(hook_id)
 
         elif template_id == "scheduled_announcement":
-            interval_hours = float(hook["params"].get("interval_hours", 24))
-
-            async def announcement_loop():
-                await self.bot.wait_until_ready()
-                while True:
-                    await asyncio.sleep(interval_hours * 3600)
-                    if not hook.get("enabled", True):
-                        continue
-                    try:
-                        channel_id = int(hook["params"]["announcement_channel_id"])
-                        channel = self.bot.get_channel(channel_id)
-                        if not channel:
-                            continue
-                        context = {"guild_name": getattr(channel.guild, 'name', ''), "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-                        msg_text = self._format_message(hook["params"]["announcement_message"], **context)
-                        if hook["params"].get("use_embed", True):
-                            embed = discord.Embed(description=msg_text, color=0x5865F2, timestamp=datetime.now())
-                            await channel.send(embed=embed)
-                        else:
-                            await channel.send(msg_text)
-                        hook["execution_count"] = hook.get("execution_count", 0) + 1
-                        self._dirty = True
-                        self._track_execution(hook["hook_id"], success=True, context={"guild_id": getattr(channel.guild, 'id', 0)})
-                    except asyncio.CancelledError:
-                        break
-                    except Exception as e:
-                        hook["error_count"] = hook.get("error_count", 0) + 1
-                        self._dirty = True
-                        logger.error(f"Scheduled announcement error: {e}")
-
-            task = asyncio.ensure_future(announcement_loop())
-            self._scheduled_tasks[hook["hook_id"]] = task
+            self._schedule_hook(hook)
             self._registered_hook_ids.add(hook_id)
 
         elif template_id == "ticket_system":
@@ -1525,6 +1526,132 @@ class EventHooksCreater(commands.Cog):
         else:
             logger.warning(f"[_register_hook] No handler implementation for template '{template_id}' - hook will be created but won't trigger")
 
+    # --- Shared scheduler for "scheduled" hooks ---
+
+    @staticmethod
+    def _hook_interval_seconds(hook: Dict[str, Any]) -> float:
+        try:
+            hours = float(hook["params"].get("interval_hours", 24))
+        except (TypeError, ValueError):
+            hours = 24.0
+        return max(hours, 1 / 60) * 3600
+
+    def _schedule_hook(self, hook: Dict[str, Any]):
+        """Register a scheduled hook with the shared timer heap.
+
+        The next fire time is derived from the persisted ``last_fired_at`` so a
+        restart resumes the original cadence instead of starting from zero.
+        """
+        hook_id = hook["hook_id"]
+        interval = self._hook_interval_seconds(hook)
+        now = time.time()
+
+        last_fired = hook.get("last_fired_at")
+        due = None
+        if last_fired:
+            try:
+                due = datetime.fromisoformat(last_fired).timestamp() + interval
+            except (TypeError, ValueError):
+                due = None
+        if due is None:
+            due = now + interval
+
+        self._scheduled_hooks[hook_id] = hook
+        self._push_schedule(hook_id, max(due, now))
+        self._ensure_scheduler()
+
+    def _unschedule_hook(self, hook_id: str):
+        self._scheduled_hooks.pop(hook_id, None)
+        self._schedule_due.pop(hook_id, None)
+
+    def _push_schedule(self, hook_id: str, due: float):
+        self._schedule_due[hook_id] = due
+        heapq.heappush(self._schedule_heap, (due, hook_id))
+        # Stale entries accumulate on reschedule/unregister; compact when they dominate
+        if len(self._schedule_heap) > 2 * len(self._schedule_due) + 64:
+            self._schedule_heap = [(d, h) for d, h in self._schedule_heap if self._schedule_due.get(h) == d]
+            heapq.heapify(self._schedule_heap)
+        self._schedule_wakeup.set()
+
+    def _ensure_scheduler(self):
+        if self._scheduler_task is not None and not self._scheduler_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # cog_load starts it once the loop is running
+        self._scheduler_task = loop.create_task(self._scheduler_loop())
+
+    async def _scheduler_loop(self):
+        await self.bot.wait_until_ready()
+        while True:
+            self._schedule_wakeup.clear()
+            now = time.time()
+            due_hooks = []
+
+            while self._schedule_heap and self._schedule_heap[0][0] <= now:
+                due, hook_id = heapq.heappop(self._schedule_heap)
+                if self._schedule_due.get(hook_id) != due:
+                    continue  # stale entry (rescheduled or unregistered)
+                hook = self._scheduled_hooks.get(hook_id)
+                if hook is None:
+                    self._schedule_due.pop(hook_id, None)
+                    continue
+
+                hook["last_fired_at"] = datetime.fromtimestamp(now).isoformat()
+                self._push_schedule(hook_id, now + self._hook_interval_seconds(hook))
+                self._schedule_wakeup.clear()
+
+                if hook.get("enabled", True):
+                    due_hooks.append(hook)
+
+            if due_hooks:
+                # Write the fire times before sending, so a crash mid-send can't fire them
+                # again on restart; if the write fails, the auto-save retries it.
+                if not await self._save_created_hooks():
+                    self._dirty = True
+                for hook in due_hooks:
+                    task = asyncio.create_task(self._fire_scheduled_hook(hook))
+                    self._fire_tasks.add(task)
+                    task.add_done_callback(self._fire_tasks.discard)
+
+            timeout = self._schedule_heap[0][0] - time.time() if self._schedule_heap else None
+            try:
+                await asyncio.wait_for(self._schedule_wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fire_scheduled_hook(self, hook: Dict[str, Any]):
+        try:
+            channel_id = int(hook["params"]["announcement_channel_id"])
+            channel = self.bot.get_channel(channel_id)
+            if not channel:
+                return
+            context = {"guild_name": getattr(channel.guild, 'name', ''), "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+            msg_text = self._format_message(hook["params"]["announcement_message"], **context)
+            if hook["params"].get("use_embed", True):
+                embed = discord.Embed(description=msg_text, color=0x5865F2, timestamp=datetime.now())
+                await channel.send(embed=embed)
+            else:
+                await channel.send(msg_text)
+            hook["execution_count"] = hook.get("execution_count", 0) + 1
+            self._dirty = True
+            self._track_execution(hook["hook_id"], success=True, context={"guild_id": getattr(channel.guild, 'id', 0)})
+        except Exception as e:
+            hook["error_count"] = hook.get("error_count", 0) + 1
+            self._dirty = True
+            logger.error(f"Scheduled announcement error: {e}")
+
+    def get_scheduler_stats(self) -> Dict[str, Any]:
+        next_due = min(self._schedule_due.values()) if self._schedule_due else None
+        return {
+            "scheduled_hooks": len(self._scheduled_hooks),
+            "heap_size": len(self._schedule_heap),
+            "next_fire_in": round(next_due - time.time(), 1) if next_due else None,
+            "running": self._scheduler_task is not None and not self._scheduler_task.done(),
+            "sending": len(self._fire_tasks)
+        }
+
     def _unregister_hook(self, hook: Dict[str, Any]):
         if "_handler" in hook:
             event_name = hook["event"]
@@ -1536,9 +1663,7 @@ class EventHooksCreater(commands.Cog):
             self.bot.remove_listener(hook["_handler_remove"], "on_raw_reaction_remove")
             del hook["_handler_remove"]
 
-        if hook["hook_id"] in self._scheduled_tasks:
-            self._scheduled_tasks[hook["hook_id"]].cancel()
-            del self._scheduled_tasks[hook["hook_id"]]
+        self._unschedule_hook(hook["hook_id"])
 
         self._registered_hook_ids.discard(hook.get("hook_id"))
 
@@ -1574,6 +1699,7 @@ class EventHooksCreater(commands.Cog):
         self.created_hooks.append(hook)
         asyncio.ensure_future(self._save_created_hooks())
         self._register_hook(hook)
+        self._index_hook(hook)
 
         logger.info(f"EventHooksCreater: Created hook {hook_id} ({template['name']}) for guild {guild_id}")
 
@@ -1586,6 +1712,7 @@ class EventHooksCreater(commands.Cog):
 
         self._unregister_hook(hook)
         self.created_hooks.remove(hook)
+        self.bot.autocomplete.index("hooks", hook.get("guild_id")).discard(hook_id)
         asyncio.ensure_future(self._save_created_hooks())
 
         logger.info(f"EventHooksCreater: Deleted hook {hook_id}")
@@ -1686,6 +1813,7 @@ class EventHooksCreater(commands.Cog):
 
     @hooks_group.command(name="info", description="Show detailed info about a hook")
     @app_commands.describe(hook_id="The hook ID")
+    @app_commands.autocomplete(hook_id=hook_id_autocomplete)
     async def hooks_info(self, interaction: discord.Interaction, hook_id: str):
         hook = next((h for h in self.created_hooks if h["hook_id"] == hook_id and h["guild_id"] == interaction.guild_id), None)
         if not hook:
@@ -1699,6 +1827,9 @@ class EventHooksCreater(commands.Cog):
         embed.add_field(name="Errors", value=str(hook.get("error_count", 0)), inline=True)
         embed.add_field(name="Created by", value=hook.get("created_by", "Unknown"), inline=True)
         embed.add_field(name="Created at", value=hook.get("created_at", "Unknown")[:19], inline=True)
+        next_due = self._schedule_due.get(hook["hook_id"])
+        if next_due is not None:
+            embed.add_field(name="Next run", value=f"<t:{int(next_due)}:R>", inline=True)
         params_str = "\n".join(f"`{k}`: {str(v)[:50]}" for k, v in hook.get("params", {}).items())
         if params_str:
             embed.add_field(name="Parameters", value=params_str[:1024], inline=False)
@@ -1706,6 +1837,7 @@ class EventHooksCreater(commands.Cog):
 
     @hooks_group.command(name="delete", description="Delete a hook (Bot Owner / Admin only)")
     @app_commands.describe(hook_id="The hook ID to delete")
+    @app_commands.autocomplete(hook_id=hook_id_autocomplete)
     async def hooks_delete(self, interaction: discord.Interaction, hook_id: str):
         if not interaction.user.guild_permissions.administrator:
             app_info = await self.bot.application_info()
@@ -1724,6 +1856,7 @@ class EventHooksCreater(commands.Cog):
 
     @hooks_group.command(name="toggle", description="Enable or disable a hook")
     @app_commands.describe(hook_id="The hook ID to toggle")
+    @app_commands.autocomplete(hook_id=hook_id_autocomplete)
     async def hooks_toggle(self, interaction: discord.Interaction, hook_id: str):
         if not interaction.user.guild_permissions.administrator:
             app_info = await self.bot.application_info()
@@ -54,17 +54,14 @@ import glob as glob_lib
 import asyncio
 import time
 
+ASK_ZDBF_ACTIONS = [
+    "help", "framework", "plugins", "diagnose", "database", "file",
+    "extension", "permission", "slash", "hooks", "automations", "readme"
+]
+
 async def ask_zdbf_autocomplete(interaction: discord.Interaction, current: str):
     
-    choices = [
-        "help", "framework", "plugins", "diagnose", "database", "file",
-        "extension", "permission", "slash", "hooks", "automations", "readme"
-    ]
-    
-    filtered_choices = [
-        app_commands.Choice(name=choice, value=choice)
-        for choice in choices if current.lower() in choice.lower()
-    ]
+    filtered_choices = await interaction.client.autocomplete.choices("ask_zdbf.actions", current)
     
 
     try:
@@ -250,6 +247,7 @@ class GeminiService(commands.Cog):
         self._COOLDOWN_SECONDS = 15
         self._MAX_CONCURRENT = 3
         self._request_semaphore: asyncio.Semaphore = asyncio.Semaphore(self._MAX_CONCURRENT)
+        self.bot.autocomplete.index("ask_zdbf.actions").replace((action, None, None) for action in ASK_ZDBF_ACTIONS)
 
     async def cog_load(self):
         if not os.getenv("GEMINI_API_KEY"):
@@ -260,6 +258,7 @@ class GeminiService(commands.Cog):
         self._cleanup_cache_task.cancel()
         self._user_cooldowns.clear()
         self._ai_cache.clear()
+        self.bot.autocomplete.unregister("ask_zdbf.actions")
 
     @tasks.loop(minutes=5)
     async def _cleanup_cache_task(self):
@@ -122,6 +122,8 @@ class GuildSettings(commands.Cog):
             # Enable mention prefix
             try:
                 await self.bot.db.set_guild_mention_prefix_enabled(ctx.guild.id, True)
+                if hasattr(self.bot, "invalidate_prefix"):
+                    await self.bot.invalidate_prefix(ctx.guild.id)
             except Exception as e:
                 logger.error(f"GuildSettings: DB error enabling mention prefix: {e}")
                 await ctx.send("❌ Could not update guild settings — please try again.", ephemeral=True)
@@ -160,6 +162,8 @@ class GuildSettings(commands.Cog):
             # Disable mention prefix
             try:
                 await self.bot.db.set_guild_mention_prefix_enabled(ctx.guild.id, False)
+                if hasattr(self.bot, "invalidate_prefix"):
+                    await self.bot.invalidate_prefix(ctx.guild.id)
             except Exception as e:
                 logger.error(f"GuildSettings: DB error disabling mention prefix: {e}")
                 await ctx.send("❌ Could not update guild settings — please try again.", ephemeral=True)
@@ -50,9 +50,9 @@ import asyncio
 import uuid
 import hashlib
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Any, Tuple, Set
+from typing import Dict, List, Optional, Any, Tuple, Set, Callable
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, deque
 import traceback
 import aiohttp
 import base64
@@ -65,6 +65,14 @@ BACKUP_COOLDOWN_SECONDS = int(os.getenv("BACKUP_COOLDOWN", 300))
 BACKUP_DATA_DIR = "./data/backups"
 AUTO_BACKUP_INTERVAL_HOURS = int(os.getenv("BACKUP_AUTO_INTERVAL", 0))
 BACKUP_RETENTION_DAYS = int(os.getenv("BACKUP_RETENTION_DAYS", 0))
+RESTORE_CONCURRENCY = int(os.getenv("BACKUP_RESTORE_CONCURRENCY", 8))
+RESTORE_PROGRESS_INTERVAL = 3.0
+MEMBER_SYNC_BATCH = 50
+AUTO_BACKUP_WORKERS = int(os.getenv("BACKUP_AUTO_WORKERS", 2))
+AUTO_BACKUP_TICK_MINUTES = 5
+AUTO_BACKUP_RETRY_MAX_SECONDS = 3600
+INDEX_FLUSH_DELAY = 2.0
+AUDIT_KEEP = 200
 
 _UTC = timezone.utc
 
@@ -93,6 +101,16 @@ def is_backup_authorized():
     return commands.check(predicate)
 
 
+async def backup_id_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+    """Backup ids of the current guild, offered only to users who may run backup commands"""
+    if interaction.guild_id is None:
+        return []
+    perms = getattr(interaction.user, "guild_permissions", None)
+    if interaction.user.id != BOT_OWNER_ID and not (perms and perms.administrator):
+        return []
+    return await interaction.client.autocomplete.choices("backups", current, scope=interaction.guild_id)
+
+
 VERIFICATION_NAMES = {0: "None", 1: "Low", 2: "Medium", 3: "High", 4: "Highest"}
 
 
@@ -113,6 +131,114 @@ def _capture_overwrites(channel):
     return result
 
 
+def _diff_member_roles(guild, member_data, role_map, snap_roles, role_sync, start=0):
+    """Precompute per-member role edits from a snapshot.
+
+    Snapshot role ids are resolved to live roles once (by restored id, live id, then
+    name), then each member's target set is diffed against their live set. Only members
+    whose roles actually differ produce an edit, as ``(index, member, new_roles, added,
+    removed)`` for a single ``member.edit(roles=...)``. Entries before ``start`` (a resume
+    checkpoint) are ignored. Returns ``(edits, unchanged_count)``.
+    """
+    bot_top = guild.me.top_role if guild.me else None
+    manageable = {
+        r.id for r in guild.roles
+        if not r.is_default() and not r.managed and (not bot_top or r < bot_top)
+    }
+    by_name = {r.name.lower(): r.id for r in guild.roles if not r.is_default() and not r.managed}
+    snap_names = {rd["id"]: rd["name"] for rd in snap_roles}
+
+    resolved: Dict[int, Optional[int]] = {}
+
+    def resolve(old_id, old_name):
+        if old_id in resolved:
+            return resolved[old_id]
+        r = role_map.get(old_id)
+        rid = r.id if r else None
+        if rid is None:
+            live = guild.get_role(old_id)
+            if live and not live.is_default() and not live.managed:
+                rid = live.id
+        if rid is None:
+            name = old_name or snap_names.get(old_id)
+            rid = by_name.get(name.lower()) if name else None
+        resolved[old_id] = rid
+        return rid
+
+    edits = []
+    unchanged = 0
+    for idx in range(start, len(member_data)):
+        md = member_data[idx]
+        member = guild.get_member(md["user_id"])
+        if not member or member.bot:
+            continue
+
+        names = md.get("role_names", [])
+        target = {
+            rid for i, old in enumerate(md.get("role_ids", []))
+            if (rid := resolve(old, names[i] if i < len(names) else None)) is not None
+        }
+        current = {r.id for r in member.roles if not r.is_default()}
+
+        to_add = (target - current) & manageable
+        to_remove = ((current & manageable) - target) if role_sync else set()
+        if not to_add and not to_remove:
+            unchanged += 1
+            continue
+
+        new_ids = (current - to_remove) | to_add
+        new_roles = [r for rid in new_ids if (r := guild.get_role(rid))]
+        edits.append((idx, member, new_roles, len(to_add), len(to_remove)))
+    return edits, unchanged
+
+
+def _stagger_offset(gid, period_seconds):
+    """Stable per-guild phase in ``[0, period)`` so auto-backups spread across the interval."""
+    h = int.from_bytes(hashlib.blake2b(str(gid).encode(), digest_size=8).digest(), "big")
+    return h % max(1, int(period_seconds))
+
+
+def _next_auto_due(gid, interval_hours, last_iso=None, now=None):
+    """Epoch seconds of the guild's next auto-backup slot.
+
+    Slots sit at ``offset + k * interval`` on the epoch timeline, so each guild keeps a
+    fixed phase and due times stay evenly spread instead of bunching on the hourly tick.
+    The slot after a backup is at least half an interval later.
+    """
+    period = max(1, interval_hours) * 3600
+    offset = _stagger_offset(gid, period)
+    now = now if now is not None else time.time()
+    after = now
+    if last_iso:
+        try:
+            last_dt = datetime.fromisoformat(last_iso)
+            if last_dt.tzinfo is None:
+                last_dt = last_dt.replace(tzinfo=_UTC)
+            after = last_dt.timestamp() + period / 2
+        except Exception:
+            pass
+    k = int((after - offset) // period) + 1
+    return offset + k * period
+
+
+def _tail_lines(path, n, block=8192):
+    """Last ``n`` non-empty lines of a text file, reading backwards from the end."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            buf = b""
+            while pos > 0 and buf.count(b"\n") <= n:
+                step = min(block, pos)
+                pos -= step
+                f.seek(pos)
+                buf = f.read(step) + buf
+    except FileNotFoundError:
+        return []
+    lines = [l for l in buf.decode("utf-8", errors="replace").splitlines() if l.strip()]
+    return lines[-n:]
+
+
 def _ts(iso_str):
     try:
         dt = datetime.fromisoformat(iso_str)
@@ -372,12 +498,40 @@ class BackupStorage:
         self.fh = file_handler
         self._cooldowns: Dict[int, float] = {}
         self._audit_lock = asyncio.Lock()
+        self._schedules: Dict[int, Optional[dict]] = {}
+        self._known_guilds: Set[int] = set()
+        self._scanned = False
+        # Loaded-once indexes, persisted write-behind by flush()
+        self._indexes: Dict[int, List[dict]] = {}
+        self._by_id: Dict[int, Dict[str, dict]] = {}
+        self._totals: Dict[int, Tuple[int, int, int]] = {}
+        self._dirty_idx: Set[int] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        # Called with (gid, index) whenever a guild's index is loaded or changes
+        self.on_index_change: Optional[Callable[[int, List[dict]], None]] = None
+        # Recent audit entries per guild (oldest first); the NDJSON file is append-only
+        self._audit: Dict[int, deque] = {}
+        self._audit_lines: Dict[int, int] = {}
 
     def _gdir(self, gid):
         d = self.base_dir / str(gid)
-        d.mkdir(parents=True, exist_ok=True)
+        if int(gid) not in self._known_guilds:
+            d.mkdir(parents=True, exist_ok=True)
+            self._known_guilds.add(int(gid))
         return d
 
+    def _scan(self):
+        if self._scanned:
+            return
+        for d in self.base_dir.iterdir():
+            if d.is_dir() and d.name.isdigit():
+                self._known_guilds.add(int(d.name))
+        self._scanned = True
+
+    def known_guilds(self):
+        self._scan()
+        return sorted(self._known_guilds)
+
     async def _rj(self, path, default=None):
         if self.fh:
             data = await self.fh.atomic_read_json(path, use_cache=False)
@@ -402,11 +556,41 @@ class BackupStorage:
         except Exception:
             return False
 
+    def _set_index(self, gid, idx):
+        self._indexes[gid] = idx
+        self._by_id[gid] = {e["id"]: e for e in idx}
+        self._totals[gid] = (len(idx), sum(e.get("size_bytes", 0) for e in idx), sum(1 for e in idx if e.get("pinned")))
+        if self.on_index_change is not None:
+            self.on_index_change(gid, idx)
+
     async def _ridx(self, gid):
-        return await self._rj(str(self._gdir(gid) / "index.json"), [])
+        idx = self._indexes.get(gid)
+        if idx is None:
+            data = await self._rj(str(self._gdir(gid) / "index.json"), [])
+            idx = data if isinstance(data, list) else []
+            self._set_index(gid, idx)
+        return idx
 
     async def _widx(self, gid, idx):
-        return await self._wj(str(self._gdir(gid) / "index.json"), idx)
+        self._set_index(gid, idx)
+        self._dirty_idx.add(gid)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._flush_later())
+        return True
+
+    async def _flush_later(self):
+        await asyncio.sleep(INDEX_FLUSH_DELAY)
+        await self.flush()
+
+    async def flush(self):
+        """Persist every index modified since the last flush."""
+        while self._dirty_idx:
+            gid = self._dirty_idx.pop()
+            if not await self._wj(str(self._gdir(gid) / "index.json"), self._indexes.get(gid, [])):
+                self._dirty_idx.add(gid)
+                logger.error(f"BackupRestore: Failed to persist index for {gid}")
+                return False
+        return True
 
     def check_cd(self, gid):
         elapsed = time.time() - self._cooldowns.get(gid, 0)
@@ -417,14 +601,82 @@ class BackupStorage:
     def set_cd(self, gid):
         self._cooldowns[gid] = time.time()
 
+    async def _load_audit(self, gid):
+        """Caller holds ``_audit_lock``: the legacy migration appends to the file."""
+        log = self._audit.get(gid)
+        if log is not None:
+            return log
+        gdir = self._gdir(gid)
+
+        def _read():
+            path = gdir / "audit_log.ndjson"
+            legacy = gdir / "audit_log.json"
+            if legacy.exists():
+                # One-time migration from the old newest-first JSON array
+                try:
+                    with open(legacy, "r", encoding="utf-8") as f:
+                        old = json.load(f)
+                    with open(path, "a", encoding="utf-8") as f:
+                        for e in reversed(old if isinstance(old, list) else []):
+                            f.write(json.dumps(e, default=str) + "\n")
+                    legacy.unlink()
+                except Exception as e:
+                    logger.warning(f"BackupRestore: Audit log migration failed for {gid}: {e}")
+            lines = _tail_lines(path, AUDIT_KEEP)
+            entries = []
+            for line in lines:
+                try:
+                    entries.append(json.loads(line))
+                except Exception:
+                    continue
+            # Compaction is driven by the file's full length, not the tail that was kept
+            try:
+                with open(path, "rb") as f:
+                    count = sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(65536), b""))
+            except FileNotFoundError:
+                count = 0
+            return entries, count
+
+        entries, count = await asyncio.to_thread(_read)
+        log = self._audit[gid] = deque(entries, maxlen=AUDIT_KEEP)
+        self._audit_lines[gid] = count
+        return log
+
     async def audit(self, gid, action, uid, bid=None, details=""):
         async with self._audit_lock:
-            log = await self._rj(str(self._gdir(gid) / "audit_log.json"), [])
-            log.insert(0, {"timestamp": _utcnow().isoformat(), "action": action, "user_id": uid, "backup_id": bid, "details": details})
-            await self._wj(str(self._gdir(gid) / "audit_log.json"), log[:200])
+            log = await self._load_audit(gid)
+            e = {"timestamp": _utcnow().isoformat(), "action": action, "user_id": uid, "backup_id": bid, "details": details}
+            log.append(e)
+            path = self._gdir(gid) / "audit_log.ndjson"
+            line = json.dumps(e, default=str) + "\n"
+            self._audit_lines[gid] = self._audit_lines.get(gid, 0) + 1
+            compact = self._audit_lines[gid] > AUDIT_KEEP * 5
+            snapshot = list(log) if compact else None
+
+            def _append():
+                if snapshot is None:
+                    with open(path, "a", encoding="utf-8") as f:
+                        f.write(line)
+                    return
+                tmp = path.with_suffix(".ndjson.tmp")
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.writelines(json.dumps(x, default=str) + "\n" for x in snapshot)
+                os.replace(tmp, path)
+
+            try:
+                await asyncio.to_thread(_append)
+                if compact:
+                    self._audit_lines[gid] = len(snapshot)
+            except Exception as ex:
+                logger.error(f"BackupRestore: Audit write failed for {gid}: {ex}")
 
     async def get_audit(self, gid, limit=50):
-        return (await self._rj(str(self._gdir(gid) / "audit_log.json"), []))[:limit]
+        log = self._audit.get(gid)
+        if log is None:
+            async with self._audit_lock:
+                log = await self._load_audit(gid)
+        n = min(limit, len(log))
+        return [log[-1 - i] for i in range(n)]
 
     async def save(self, gid, snap, label, uid, pinned=False):
         idx = await self._ridx(gid)
@@ -463,7 +715,7 @@ class BackupStorage:
         return entry
 
     async def get_list(self, gid):
-        return await self._ridx(gid)
+        return list(await self._ridx(gid))
 
     async def get_snap(self, gid, bid):
         return await self._rj(str(self._gdir(gid) / f"{bid}.json"), None)
@@ -489,26 +741,27 @@ class BackupStorage:
         return True
 
     async def get_entry(self, gid, bid):
-        return next((e for e in await self._ridx(gid) if e["id"] == bid), None)
+        await self._ridx(gid)
+        return self._by_id[gid].get(bid)
 
     async def update_entry(self, gid, bid, updates):
         idx = await self._ridx(gid)
-        for e in idx:
-            if e["id"] == bid:
-                e.update(updates)
-                return await self._widx(gid, idx)
-        return False
+        e = self._by_id[gid].get(bid)
+        if e is None:
+            return False
+        e.update(updates)
+        return await self._widx(gid, idx)
 
     async def toggle_pin(self, gid, bid, uid):
         idx = await self._ridx(gid)
-        for e in idx:
-            if e["id"] == bid:
-                new = not e.get("pinned", False)
-                e["pinned"] = new
-                await self._widx(gid, idx)
-                await self.audit(gid, "pin" if new else "unpin", uid, bid)
-                return new
-        return None
+        e = self._by_id[gid].get(bid)
+        if e is None:
+            return None
+        new = not e.get("pinned", False)
+        e["pinned"] = new
+        await self._widx(gid, idx)
+        await self.audit(gid, "pin" if new else "unpin", uid, bid)
+        return new
 
     async def verify(self, gid, bid):
         entry = await self.get_entry(gid, bid)
@@ -552,25 +805,128 @@ class BackupStorage:
             await self._widx(gid, new_idx)
         return removed
 
+    async def get_checkpoint(self, gid):
+        return await self._rj(str(self._gdir(gid) / "restore_checkpoint.json"), None)
+
+    async def set_checkpoint(self, gid, data):
+        return await self._wj(str(self._gdir(gid) / "restore_checkpoint.json"), data)
+
+    async def clear_checkpoint(self, gid):
+        try:
+            (self._gdir(gid) / "restore_checkpoint.json").unlink(missing_ok=True)
+        except Exception:
+            pass
+
+    async def load_schedules(self):
+        """Read every guild's ``schedule.json`` once; afterwards schedules are served from memory."""
+        for gid in self.known_guilds():
+            await self.get_schedule(gid)
+
+    def enabled_schedules(self):
+        return {gid: s for gid, s in self._schedules.items() if s and s.get("enabled")}
+
     async def get_schedule(self, gid):
-        return await self._rj(str(self._gdir(gid) / "schedule.json"), None)
+        if gid not in self._schedules:
+            data = await self._rj(str(self._gdir(gid) / "schedule.json"), None)
+            self._schedules[gid] = data if isinstance(data, dict) else None
+        sched = self._schedules[gid]
+        return dict(sched) if sched else None
 
     async def set_schedule(self, gid, data):
+        self._schedules[gid] = dict(data)
         return await self._wj(str(self._gdir(gid) / "schedule.json"), data)
 
     async def global_stats(self):
-        total = guilds = size = pinned = 0
-        for d in self.base_dir.iterdir():
-            if not d.is_dir():
-                continue
-            guilds += 1
-            idx = await self._rj(str(d / "index.json"), [])
-            total += len(idx)
-            for e in idx:
-                size += e.get("size_bytes", 0)
-                if e.get("pinned"):
-                    pinned += 1
-        return {"total": total, "guilds": guilds, "size": size, "pinned": pinned}
+        gids = self.known_guilds()
+        for gid in gids:
+            if gid not in self._totals:
+                await self._ridx(gid)
+        total = size = pinned = 0
+        for gid in gids:
+            c, sz, p = self._totals[gid]
+            total += c
+            size += sz
+            pinned += p
+        return {"total": total, "guilds": len(gids), "size": size, "pinned": pinned}
+
+
+class RestorePlan:
+    """Dependency graph of restore phases.
+
+    Phases start as soon as the phases they depend on have finished, so independent
+    work (emojis, stickers, bot settings) overlaps with roles -> categories -> channels.
+    Individual API calls inside a phase go through ``map`` and share one concurrency
+    budget; pacing is left to discord.py's HTTP client, which tracks the per-route
+    ``X-RateLimit-*`` bucket headers and waits out 429s itself.
+    """
+
+    def __init__(self, concurrency: int = RESTORE_CONCURRENCY):
+        self._sem = asyncio.Semaphore(max(1, concurrency))
+        self._phases: Dict[str, Tuple[Any, Tuple[str, ...]]] = {}
+
+    def add(self, name, func, deps=()):
+        self._phases[name] = (func, tuple(deps))
+
+    async def map(self, func, items):
+        async def bounded(item):
+            async with self._sem:
+                await func(item)
+        await asyncio.gather(*(bounded(i) for i in items))
+
+    async def run(self):
+        """Run every phase; returns ``[(phase, exception)]`` for phases that raised."""
+        done = {name: asyncio.Event() for name in self._phases}
+        failures = []
+
+        async def runner(name, func, deps):
+            try:
+                for dep in deps:
+                    if dep in done:
+                        await done[dep].wait()
+                await func()
+            except Exception as e:
+                failures.append((name, e))
+                logger.debug(traceback.format_exc())
+            finally:
+                done[name].set()
+
+        await asyncio.gather(*(runner(n, f, d) for n, (f, d) in self._phases.items()))
+        return failures
+
+
+class RestoreProgress:
+    """Throttled progress embed — edits at most once per ``interval`` seconds."""
+
+    def __init__(self, msg, embed, interval: float = RESTORE_PROGRESS_INTERVAL):
+        self.msg = msg
+        self.embed = embed
+        self.interval = interval
+        self.lines: List[str] = []
+        self._last_edit = 0.0
+        self._pending: Optional[asyncio.Task] = None
+
+    def add(self, line):
+        self.lines.append(line)
+        if self._pending is None or self._pending.done():
+            self._pending = asyncio.ensure_future(self._flush_later())
+
+    async def _flush_later(self):
+        wait = self._last_edit + self.interval - time.time()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        await self._flush()
+
+    async def _flush(self):
+        self._last_edit = time.time()
+        self.embed.description = "```\n" + "\n".join(self.lines) + "\n```"
+        try:
+            await self.msg.edit(embed=self.embed)
+        except Exception:
+            pass
+
+    async def close(self):
+        if self._pending and not self._pending.done():
+            self._pending.cancel()
 
 
 class DashboardView(discord.ui.View):
@@ -871,7 +1227,7 @@ class SelectiveRestoreView(discord.ui.View):
             "```\n"
             "- Bot needs Administrator permission\n"
             "- Bot's role must be above roles it manages\n"
-            "- Rate-limited by Discord (~2 members/sec)\n"
+            "- Only members whose roles differ are edited\n"
             "- Members must still be in the server\n"
             "- Guild will be chunked to load all members\n"
             "```"
@@ -1048,45 +1404,87 @@ class BackupRestore(commands.Cog):
         except ImportError:
             pass
         self.storage = BackupStorage(file_handler=fh)
+        self.storage.on_index_change = self._index_autocomplete
+        self.bot.autocomplete.register("backups", self._load_autocomplete)
         self._locks: Dict[int, asyncio.Lock] = {}
+        self._auto_sem = asyncio.Semaphore(max(1, AUTO_BACKUP_WORKERS))
+        self._auto_inflight: Set[int] = set()
+        self._auto_due: Dict[int, float] = {}
+        self._auto_failures: Dict[int, int] = {}
+        self.capture_metrics: Dict[int, Dict[str, Any]] = {}
         if AUTO_BACKUP_INTERVAL_HOURS > 0:
             self.auto_loop.start()
         if BACKUP_RETENTION_DAYS > 0:
             self.cleanup_loop.start()
         logger.info("BackupRestore cog loaded (v2.2.0)")
 
-    def cog_unload(self):
+    async def cog_unload(self):
         if self.auto_loop.is_running():
             self.auto_loop.cancel()
         if self.cleanup_loop.is_running():
             self.cleanup_loop.cancel()
+        await self.storage.flush()
+        self.bot.autocomplete.unregister("backups")
+
+    def _index_autocomplete(self, gid, idx):
+        self.bot.autocomplete.index("backups", int(gid)).replace(
+            (e["id"], f"{e['id']} \u2014 {e.get('label') or 'Backup'} ({str(e.get('timestamp', ''))[:10]})", e["id"])
+            for e in idx
+        )
+
+    async def _load_autocomplete(self, gid):
+        if gid is not None:
+            await self.storage.get_list(int(gid))
+
+    def lazy_unload_ok(self) -> bool:
+        """Lazy loading may only defer/unload this cog while nothing is running or scheduled"""
+        if self._auto_inflight or any(lock.locked() for lock in self._locks.values()):
+            return False
+        if AUTO_BACKUP_INTERVAL_HOURS <= 0:
+            return True
+        if any(gid not in self.storage._schedules for gid in self.storage.known_guilds()):
+            return False  # schedules not read yet
+        return not self.storage.enabled_schedules()
 
     def _lock(self, gid):
         if gid not in self._locks:
             self._locks[gid] = asyncio.Lock()
         return self._locks[gid]
 
-    @tasks.loop(hours=1)
+    @tasks.loop(minutes=AUTO_BACKUP_TICK_MINUTES)
     async def auto_loop(self):
-        for guild in self.bot.guilds:
+        now = time.time()
+        for gid, sched in self.storage.enabled_schedules().items():
+            if gid in self._auto_inflight:
+                continue
+            guild = self.bot.get_guild(gid)
+            if guild is None:
+                continue
+            due = self._auto_due.get(gid)
+            if due is None:
+                interval = sched.get("interval_hours", AUTO_BACKUP_INTERVAL_HOURS)
+                due = self._auto_due[gid] = _next_auto_due(gid, interval, sched.get("last_auto_backup"), now)
+            if due > now:
+                continue
+            self._auto_inflight.add(gid)
+            task = asyncio.ensure_future(self._auto_backup(guild))
+            task.add_done_callback(lambda _t, g=gid: self._auto_inflight.discard(g))
+
+    async def _auto_backup(self, guild):
+        async with self._auto_sem:
+            sched = None
+            t0 = None
+            ok = False
             try:
                 sched = await self.storage.get_schedule(guild.id)
                 if not sched or not sched.get("enabled"):
-                    continue
-                interval = sched.get("interval_hours", AUTO_BACKUP_INTERVAL_HOURS)
-                last = sched.get("last_auto_backup")
-                if last:
-                    try:
-                        last_dt = datetime.fromisoformat(last)
-                        if last_dt.tzinfo is None:
-                            last_dt = last_dt.replace(tzinfo=_UTC)
-                        if _utcnow() - last_dt < timedelta(hours=interval):
-                            continue
-                    except Exception:
-                        pass
-                bks = await self.storage.get_list(guild.id)
-                if len(bks) >= MAX_BACKUPS_PER_GUILD:
-                    continue
+                    return
+                if len(await self.storage.get_list(guild.id)) >= MAX_BACKUPS_PER_GUILD:
+                    # Storage full: skip this slot without recording it as a failed capture
+                    interval = sched.get("interval_hours", AUTO_BACKUP_INTERVAL_HOURS)
+                    self._auto_due[guild.id] = _next_auto_due(guild.id, interval, None)
+                    return
+                t0 = time.perf_counter()
                 snap = await BackupSnapshot.capture(guild, self.bot)
                 label = f"Auto-backup {_utcnow().strftime('%Y-%m-%d %H:%M')} UTC"
                 entry = await self.storage.save(guild.id, snap, label, self.bot.user.id)
@@ -1094,26 +1492,51 @@ class BackupRestore(commands.Cog):
                     await self.storage.update_entry(guild.id, entry["id"], {"auto_backup": True})
                     sched["last_auto_backup"] = _utcnow().isoformat()
                     await self.storage.set_schedule(guild.id, sched)
-                    logger.info(f"BackupRestore: Auto-backup for guild {guild.id}")
+                    ok = True
+                    logger.info(f"BackupRestore: Auto-backup for guild {guild.id} ({time.perf_counter() - t0:.2f}s)")
             except Exception as e:
                 logger.error(f"BackupRestore: Auto-backup failed for {guild.id}: {e}")
+            if t0 is not None:
+                self._record_capture(guild.id, time.perf_counter() - t0, ok)
+            interval = (sched or {}).get("interval_hours", AUTO_BACKUP_INTERVAL_HOURS)
+            if ok:
+                self._auto_failures.pop(guild.id, None)
+                self._auto_due[guild.id] = _next_auto_due(guild.id, interval, sched.get("last_auto_backup"))
+            else:
+                self._auto_due[guild.id] = self._retry_due(guild.id, interval)
+
+    def _retry_due(self, gid, interval):
+        """Capped exponential backoff after a failed capture, never later than the regular slot."""
+        failures = self._auto_failures[gid] = self._auto_failures.get(gid, 0) + 1
+        delay = min(AUTO_BACKUP_RETRY_MAX_SECONDS, AUTO_BACKUP_TICK_MINUTES * 60 * 2 ** min(failures - 1, 10))
+        now = time.time()
+        return min(now + delay, _next_auto_due(gid, interval, None, now))
+
+    def _record_capture(self, gid, duration, ok):
+        m = self.capture_metrics.setdefault(gid, {"runs": 0, "failures": 0, "last": 0.0, "avg": 0.0, "max": 0.0, "last_run": None})
+        m["runs"] += 1
+        if not ok:
+            m["failures"] += 1
+        m["last"] = duration
+        m["max"] = max(m["max"], duration)
+        m["avg"] = duration if m["runs"] == 1 else m["avg"] * 0.8 + duration * 0.2
+        m["last_run"] = _utcnow().isoformat()
 
     @auto_loop.before_loop
     async def _wait1(self):
         await self.bot.wait_until_ready()
+        await self.storage.load_schedules()
 
     @tasks.loop(hours=24)
     async def cleanup_loop(self):
-        for d in self.storage.base_dir.iterdir():
-            if not d.is_dir():
-                continue
+        for gid in self.storage.known_guilds():
             try:
-                gid = int(d.name)
                 removed = await self.storage.cleanup_old(gid, BACKUP_RETENTION_DAYS)
                 if removed:
                     await self.storage.audit(gid, "cleanup", self.bot.user.id, details=f"Removed {removed} expired")
             except Exception:
                 pass
+            await asyncio.sleep(0)
 
     @cleanup_loop.before_loop
     async def _wait2(self):
@@ -1208,6 +1631,7 @@ class BackupRestore(commands.Cog):
     @commands.guild_only()
     @is_backup_authorized()
     @app_commands.describe(backup_id="Backup ID to restore")
+    @app_commands.autocomplete(backup_id=backup_id_autocomplete)
     async def backup_restore(self, ctx, backup_id: str):
         entry = await self.storage.get_entry(ctx.guild.id, backup_id)
         if not entry:
@@ -1224,310 +1648,221 @@ class BackupRestore(commands.Cog):
             return await interaction.followup.send(embed=discord.Embed(title="\U0001f512 Restore Already Running", description="Please wait for the current restore to finish.", color=0xff9900), ephemeral=True)
 
         async with lock:
-            prog = discord.Embed(title="\U0001f504 Restoring Your Server\u2026", description="Working through Discord's rate limits. This may take a few minutes for large servers.", color=0xffaa00, timestamp=discord.utils.utcnow())
-            status = []
+            prog = discord.Embed(title="\U0001f504 Restoring Your Server…", description="Working through Discord's rate limits. This may take a few minutes for large servers.", color=0xffaa00, timestamp=discord.utils.utcnow())
             msg = await interaction.followup.send(embed=prog, wait=True)
+            progress = RestoreProgress(msg, prog)
+            plan = RestorePlan()
             res = {"created": 0, "skipped": 0, "failed": 0, "roles_added": 0, "roles_removed": 0, "members_processed": 0, "members_skipped": 0, "errors": []}
             t0 = time.time()
             role_map = {}
             cat_map = {}
+            reason = f"Backup restore: {entry['id']}"
 
-            if "roles" in components:
+            async def restore_roles():
                 existing = {r.name.lower(): r for r in guild.roles}
                 roles = snap.get("roles", [])
-                status.append(f"\U0001f3ad Restoring {len(roles)} roles\u2026")
-                prog.description = "```\n"+"\n".join(status)+"\n```"
-                try: await msg.edit(embed=prog)
-                except Exception: pass
+                progress.add(f"\U0001f3ad Restoring {len(roles)} roles…")
+                created = []
 
-                for rd in reversed(roles):
+                async def create(rd):
                     n = rd["name"]
-                    if n.lower() in existing:
-                        role_map[rd["id"]] = existing[n.lower()]
-                        res["skipped"] += 1
-                        continue
                     try:
-                        nr = await guild.create_role(name=n, color=discord.Color(rd.get("color", 0)), hoist=rd.get("hoist", False), mentionable=rd.get("mentionable", False), permissions=discord.Permissions(rd.get("permissions_value", 0)), reason=f"Backup restore: {entry['id']}")
+                        nr = await guild.create_role(name=n, color=discord.Color(rd.get("color", 0)), hoist=rd.get("hoist", False), mentionable=rd.get("mentionable", False), permissions=discord.Permissions(rd.get("permissions_value", 0)), reason=reason)
                         role_map[rd["id"]] = nr
+                        created.append((rd.get("position", 0), nr))
                         res["created"] += 1
-                        await asyncio.sleep(1)
                     except discord.Forbidden:
                         res["failed"] += 1; res["errors"].append(f"Role '{n}': Missing permissions")
                     except discord.HTTPException as e:
                         res["failed"] += 1; res["errors"].append(f"Role '{n}': {str(e)[:50]}")
                     except Exception as e:
                         res["failed"] += 1; res["errors"].append(f"Role '{n}': {str(e)[:50]}")
-            else:
-                for r in guild.roles:
-                    role_map[r.id] = r
 
-            if "categories" in components:
+                pending = []
+                for rd in reversed(roles):
+                    match = existing.get(rd["name"].lower())
+                    if match:
+                        role_map[rd["id"]] = match
+                        res["skipped"] += 1
+                    else:
+                        pending.append(rd)
+                await plan.map(create, pending)
+
+                # Concurrent creates land in completion order; put new roles back in snapshot order
+                if len(created) > 1:
+                    created.sort(key=lambda x: x[0])
+                    try:
+                        await guild.edit_role_positions(positions={r: i + 1 for i, (_, r) in enumerate(created)}, reason=reason)
+                    except Exception as e:
+                        res["errors"].append(f"Role order: {str(e)[:50]}")
+
+            async def restore_categories():
                 existing = {c.name.lower(): c for c in guild.categories}
                 cats = snap.get("categories", [])
-                status.append(f"\U0001f4c2 Restoring {len(cats)} categories\u2026")
-                prog.description = "```\n"+"\n".join(status)+"\n```"
-                try: await msg.edit(embed=prog)
-                except Exception: pass
+                progress.add(f"\U0001f4c2 Restoring {len(cats)} categories…")
 
-                for cd in cats:
+                async def create(cd):
                     n = cd["name"]
-                    if n.lower() in existing:
-                        cat_map[cd["id"]] = existing[n.lower()]
-                        res["skipped"] += 1
-                        continue
                     try:
                         ow = self._ow(cd.get("overwrites", []), guild, role_map)
-                        nc = await guild.create_category(name=n, overwrites=ow, reason=f"Backup restore: {entry['id']}")
+                        nc = await guild.create_category(name=n, overwrites=ow, position=cd.get("position"), reason=reason)
                         cat_map[cd["id"]] = nc
                         res["created"] += 1
-                        await asyncio.sleep(1)
                     except Exception as e:
                         res["failed"] += 1; res["errors"].append(f"Category '{n}': {str(e)[:50]}")
-            else:
-                for c in guild.categories:
-                    cat_map[c.id] = c
 
-            if "channels" in components:
-                ex_text = {c.name.lower(): c for c in guild.text_channels}
-                text_chs = snap.get("text_channels", [])
-                status.append(f"\U0001f4ac Restoring {len(text_chs)} text channels\u2026")
-                prog.description = "```\n"+"\n".join(status)+"\n```"
-                try: await msg.edit(embed=prog)
-                except Exception: pass
-
-                for chd in text_chs:
-                    n = chd["name"]
-                    if n.lower() in ex_text:
-                        res["skipped"] += 1; continue
+                pending = []
+                for cd in cats:
+                    match = existing.get(cd["name"].lower())
+                    if match:
+                        cat_map[cd["id"]] = match
+                        res["skipped"] += 1
+                    else:
+                        pending.append(cd)
+                await plan.map(create, pending)
+
+            async def restore_channels():
+                kinds = (
+                    ("text_channels", "Text", "\U0001f4ac", guild.text_channels,
+                     lambda chd, cat, ow: guild.create_text_channel(name=chd["name"], topic=chd.get("topic"), slowmode_delay=chd.get("slowmode_delay", 0), nsfw=chd.get("nsfw", False), category=cat, overwrites=ow, position=chd.get("position"), reason=reason)),
+                    ("voice_channels", "Voice", "\U0001f50a", guild.voice_channels,
+                     lambda chd, cat, ow: guild.create_voice_channel(name=chd["name"], bitrate=min(chd.get("bitrate", 64000), guild.bitrate_limit), user_limit=chd.get("user_limit", 0), category=cat, overwrites=ow, position=chd.get("position"), reason=reason)),
+                    ("forum_channels", "Forum", "\U0001f4ac", _safe_channels(guild, "forum_channels"),
+                     lambda chd, cat, ow: guild.create_forum(name=chd["name"], topic=chd.get("topic"), slowmode_delay=chd.get("slowmode_delay", 0), nsfw=chd.get("nsfw", False), category=cat, overwrites=ow, position=chd.get("position"), reason=reason)),
+                    ("stage_channels", "Stage", "\U0001f399️", _safe_channels(guild, "stage_channels"),
+                     lambda chd, cat, ow: guild.create_stage_channel(name=chd["name"], topic=chd.get("topic"), category=cat, overwrites=ow, position=chd.get("position"), reason=reason)),
+                )
+                jobs = []
+                for key, label, icon, live, factory in kinds:
+                    chs = snap.get(key, [])
+                    if not chs and key in ("forum_channels", "stage_channels"):
+                        continue
+                    progress.add(f"{icon} Restoring {len(chs)} {label.lower()} channels…")
+                    ex = {c.name.lower() for c in live}
+                    for chd in chs:
+                        if chd["name"].lower() in ex:
+                            res["skipped"] += 1
+                        else:
+                            jobs.append((label, factory, chd))
+
+                async def create(job):
+                    label, factory, chd = job
                     try:
                         cat = cat_map.get(chd.get("category_id"))
                         ow = self._ow(chd.get("overwrites", []), guild, role_map)
-                        await guild.create_text_channel(name=n, topic=chd.get("topic"), slowmode_delay=chd.get("slowmode_delay", 0), nsfw=chd.get("nsfw", False), category=cat, overwrites=ow, reason=f"Backup restore: {entry['id']}")
-                        res["created"] += 1; await asyncio.sleep(1)
+                        await factory(chd, cat, ow)
+                        res["created"] += 1
                     except Exception as e:
-                        res["failed"] += 1; res["errors"].append(f"Text '{n}': {str(e)[:50]}")
-
-                ex_voice = {c.name.lower(): c for c in guild.voice_channels}
-                voice_chs = snap.get("voice_channels", [])
-                status.append(f"\U0001f50a Restoring {len(voice_chs)} voice channels\u2026")
-                prog.description = "```\n"+"\n".join(status)+"\n```"
-                try: await msg.edit(embed=prog)
-                except Exception: pass
-
-                for chd in voice_chs:
-                    n = chd["name"]
-                    if n.lower() in ex_voice:
-                        res["skipped"] += 1; continue
+                        res["failed"] += 1; res["errors"].append(f"{label} '{chd['name']}': {str(e)[:50]}")
+
+                await plan.map(create, jobs)
+
+            async def restore_member_roles():
+                member_data = snap.get("member_roles", [])
+                if not member_data:
+                    return
+                progress.add(f"\U0001f465 {'Syncing' if role_sync else 'Restoring'} roles for {len(member_data)} members…")
+
+                if not guild.chunked:
                     try:
-                        cat = cat_map.get(chd.get("category_id"))
-                        ow = self._ow(chd.get("overwrites", []), guild, role_map)
-                        await guild.create_voice_channel(name=n, bitrate=min(chd.get("bitrate", 64000), guild.bitrate_limit), user_limit=chd.get("user_limit", 0), category=cat, overwrites=ow, reason=f"Backup restore: {entry['id']}")
-                        res["created"] += 1; await asyncio.sleep(1)
+                        await guild.chunk(cache=True)
                     except Exception as e:
-                        res["failed"] += 1; res["errors"].append(f"Voice '{n}': {str(e)[:50]}")
-
-                # Forum channels
-                ex_forum = {c.name.lower(): c for c in _safe_channels(guild, "forum_channels")}
-                forum_chs = snap.get("forum_channels", [])
-                if forum_chs:
-                    status.append(f"💬 Restoring {len(forum_chs)} forum channels…")
-                    prog.description = "```\n"+"\n".join(status)+"\n```"
-                    try: await msg.edit(embed=prog)
-                    except Exception: pass
-                    for chd in forum_chs:
-                        n = chd["name"]
-                        if n.lower() in ex_forum:
-                            res["skipped"] += 1; continue
-                        try:
-                            cat = cat_map.get(chd.get("category_id"))
-                            ow = self._ow(chd.get("overwrites", []), guild, role_map)
-                            await guild.create_forum(name=n, topic=chd.get("topic"), slowmode_delay=chd.get("slowmode_delay", 0), nsfw=chd.get("nsfw", False), category=cat, overwrites=ow, reason=f"Backup restore: {entry['id']}")
-                            res["created"] += 1; await asyncio.sleep(1)
-                        except Exception as e:
-                            res["failed"] += 1; res["errors"].append(f"Forum '{n}': {str(e)[:50]}")
-
-                # Stage channels
-                ex_stage = {c.name.lower(): c for c in _safe_channels(guild, "stage_channels")}
-                stage_chs = snap.get("stage_channels", [])
-                if stage_chs:
-                    status.append(f"🎙️ Restoring {len(stage_chs)} stage channels…")
-                    prog.description = "```\n"+"\n".join(status)+"\n```"
-                    try: await msg.edit(embed=prog)
-                    except Exception: pass
-                    for chd in stage_chs:
-                        n = chd["name"]
-                        if n.lower() in ex_stage:
-                            res["skipped"] += 1; continue
-                        try:
-                            cat = cat_map.get(chd.get("category_id"))
-                            ow = self._ow(chd.get("overwrites", []), guild, role_map)
-                            await guild.create_stage_channel(name=n, topic=chd.get("topic"), category=cat, overwrites=ow, reason=f"Backup restore: {entry['id']}")
-                            res["created"] += 1; await asyncio.sleep(1)
-                        except Exception as e:
-                            res["failed"] += 1; res["errors"].append(f"Stage '{n}': {str(e)[:50]}")
+                        res["errors"].append(f"Guild chunk failed: {str(e)[:60]}")
 
-            if "member_roles" in components:
-                member_data = snap.get("member_roles", [])
-                if member_data:
-                    status.append(f"\U0001f465 {'Syncing' if role_sync else 'Restoring'} roles for {len(member_data)} members\u2026")
-                    prog.description = "```\n"+"\n".join(status)+"\n```"
-                    try: await msg.edit(embed=prog)
-                    except Exception: pass
-
-                    if not guild.chunked:
-                        try:
-                            await guild.chunk(cache=True)
-                        except Exception as e:
-                            res["errors"].append(f"Guild chunk failed: {str(e)[:60]}")
-
-                    backup_role_names = {rd["id"]: rd["name"] for rd in snap.get("roles", [])}
-                    guild_roles_by_name = {
-                        r.name.lower(): r for r in guild.roles
-                        if not r.is_default() and not r.managed
-                    }
-                    bot_top_role = guild.me.top_role if guild.me else None
-
-                    def _resolve_role(old_id, old_name=None):
-                        r = role_map.get(old_id)
-                        if r:
-                            return r
-                        r = guild.get_role(old_id)
-                        if r and not r.is_default() and not r.managed:
-                            return r
-                        name = old_name or backup_role_names.get(old_id)
-                        if name:
-                            r = guild_roles_by_name.get(name.lower())
-                            if r:
-                                return r
-                        return None
+                mode = "sync" if role_sync else "add"
+                cp = await self.storage.get_checkpoint(guild.id)
+                start = 0
+                if cp and cp.get("backup_id") == entry["id"] and cp.get("mode") == mode:
+                    start = min(int(cp.get("cursor", 0)), len(member_data))
+                    progress.add(f"↩️ Resuming member sync at {start}/{len(member_data)}")
 
-                    for md in member_data:
-                        member = guild.get_member(md["user_id"])
-                        if not member or member.bot:
-                            continue
-
-                        current_role_ids = {r.id for r in member.roles if not r.is_default()}
-
-                        backup_names = set()
-                        target_roles = []
-                        for i, old_rid in enumerate(md.get("role_ids", [])):
-                            rn_list = md.get("role_names", [])
-                            old_name = rn_list[i] if i < len(rn_list) else None
-                            resolved = _resolve_role(old_rid, old_name)
-                            if resolved:
-                                target_roles.append(resolved)
-                                backup_names.add(resolved.name.lower())
-
-                        roles_to_add = [
-                            r for r in target_roles
-                            if r.id not in current_role_ids
-                            and (not bot_top_role or r.position < bot_top_role.position)
-                        ]
-
-                        roles_to_remove = []
-                        if role_sync:
-                            for r in member.roles:
-                                if r.is_default() or r.managed:
-                                    continue
-                                if bot_top_role and r.position >= bot_top_role.position:
-                                    continue
-                                if r.name.lower() not in backup_names:
-                                    roles_to_remove.append(r)
-
-                        changed = False
-                        if roles_to_add:
-                            try:
-                                await member.add_roles(*roles_to_add, reason=f"Backup restore: {entry['id']}")
-                                res["roles_added"] += len(roles_to_add)
-                                changed = True
-                            except Exception as e:
-                                res["errors"].append(f"Add roles {member}: {str(e)[:50]}")
+                edits, skipped = _diff_member_roles(guild, member_data, role_map, snap.get("roles", []), role_sync, start)
+                res["members_skipped"] += skipped
 
-                        if roles_to_remove:
-                            try:
-                                await member.remove_roles(*roles_to_remove, reason=f"Backup role sync: {entry['id']}")
-                                res["roles_removed"] += len(roles_to_remove)
-                                changed = True
-                            except Exception as e:
-                                res["errors"].append(f"Remove roles {member}: {str(e)[:50]}")
+                async def apply(edit):
+                    _, member, new_roles, added, removed = edit
+                    try:
+                        await member.edit(roles=new_roles, reason=f"Backup role sync: {entry['id']}" if removed else reason)
+                        res["roles_added"] += added
+                        res["roles_removed"] += removed
+                        res["members_processed"] += 1
+                    except Exception as e:
+                        res["errors"].append(f"Roles {member}: {str(e)[:50]}")
 
-                        if changed:
-                            res["members_processed"] += 1
-                            await asyncio.sleep(0.5)
-                        else:
-                            res["members_skipped"] += 1
+                for i in range(0, len(edits), MEMBER_SYNC_BATCH):
+                    batch = edits[i:i + MEMBER_SYNC_BATCH]
+                    await plan.map(apply, batch)
+                    # Cursor into the snapshot's member list; everything before it has been applied
+                    await self.storage.set_checkpoint(guild.id, {"backup_id": entry["id"], "mode": mode, "cursor": batch[-1][0] + 1, "updated_at": _utcnow().isoformat()})
+                await self.storage.clear_checkpoint(guild.id)
 
-            if "bot_settings" in components:
-                status.append("\u2699\ufe0f Restoring bot settings\u2026")
-                prog.description = "```\n"+"\n".join(status)+"\n```"
-                try: await msg.edit(embed=prog)
-                except Exception: pass
+            async def restore_bot_settings():
+                progress.add("⚙️ Restoring bot settings…")
                 bs = snap.get("bot_settings", {})
                 if bs and hasattr(self.bot, "db") and self.bot.db:
                     try:
                         if bs.get("custom_prefix") is not None:
                             await self.bot.db.set_guild_prefix(guild.id, bs["custom_prefix"])
-                            if hasattr(self.bot, "prefix_cache"):
-                                await self.bot.prefix_cache.invalidate(guild.id)
                         if bs.get("mention_prefix_enabled") is not None:
                             await self.bot.db.set_guild_mention_prefix_enabled(guild.id, bs["mention_prefix_enabled"])
+                        if hasattr(self.bot, "invalidate_prefix"):
+                            await self.bot.invalidate_prefix(guild.id)
                     except Exception as e:
                         res["errors"].append(f"Bot settings: {str(e)[:60]}")
 
-            if "emojis" in components:
-                status.append("😀 Restoring emojis…")
-                prog.description = "```\n"+"\n".join(status)+"\n```"
-                try: await msg.edit(embed=prog)
-                except Exception: pass
+            async def restore_emojis():
+                progress.add("😀 Restoring emojis…")
                 existing_emoji_names = {e.name.lower() for e in guild.emojis}
+                pending = []
                 for ed in snap.get("emojis", []):
-                    if ed.get("managed"):
+                    if ed.get("managed") or ed["name"].lower() in existing_emoji_names:
                         res["skipped"] += 1; continue
-                    if ed["name"].lower() in existing_emoji_names:
-                        res["skipped"] += 1; continue
-                    image_b64 = ed.get("image_b64")
-                    if not image_b64:
+                    if not ed.get("image_b64"):
                         res["failed"] += 1; res["errors"].append(f"Emoji '{ed['name']}': no image data in backup (re-backup to capture images)"); continue
+                    existing_emoji_names.add(ed["name"].lower())
+                    pending.append(ed)
+
+                async def create(ed):
                     try:
-                        img_bytes = base64.b64decode(image_b64)
-                        await guild.create_custom_emoji(name=ed["name"], image=img_bytes, reason=f"Backup restore: {entry['id']}")
-                        existing_emoji_names.add(ed["name"].lower())
-                        res["created"] += 1; await asyncio.sleep(1)
+                        img_bytes = base64.b64decode(ed["image_b64"])
+                        await guild.create_custom_emoji(name=ed["name"], image=img_bytes, reason=reason)
+                        res["created"] += 1
                     except discord.Forbidden:
                         res["failed"] += 1; res["errors"].append(f"Emoji '{ed['name']}': Missing permissions")
                     except Exception as e:
                         res["failed"] += 1; res["errors"].append(f"Emoji '{ed['name']}': {str(e)[:50]}")
 
-            if "stickers" in components:
-                status.append("🎨 Restoring stickers…")
-                prog.description = "```\n"+"\n".join(status)+"\n```"
-                try: await msg.edit(embed=prog)
-                except Exception: pass
+                await plan.map(create, pending)
+
+            async def restore_stickers():
+                progress.add("🎨 Restoring stickers…")
                 existing_sticker_names = {s.name.lower() for s in getattr(guild, "stickers", []) or []}
+                pending = []
                 for sd in snap.get("stickers", []):
                     if sd["name"].lower() in existing_sticker_names:
                         res["skipped"] += 1; continue
-                    image_b64 = sd.get("image_b64")
-                    if not image_b64:
+                    if not sd.get("image_b64"):
                         res["failed"] += 1; res["errors"].append(f"Sticker '{sd['name']}': no image data in backup (re-backup to capture images)"); continue
+                    existing_sticker_names.add(sd["name"].lower())
+                    pending.append(sd)
+
+                async def create(sd):
                     try:
-                        img_bytes = base64.b64decode(image_b64)
+                        img_bytes = base64.b64decode(sd["image_b64"])
                         sf = discord.File(io.BytesIO(img_bytes), filename=f"{sd['name']}.png")
                         emoji_str = sd.get("emoji") or "⭐"
                         desc = sd.get("description") or ""
-                        await guild.create_sticker(name=sd["name"], description=desc[:100], emoji=emoji_str, file=sf, reason=f"Backup restore: {entry['id']}")
-                        existing_sticker_names.add(sd["name"].lower())
-                        res["created"] += 1; await asyncio.sleep(2)
+                        await guild.create_sticker(name=sd["name"], description=desc[:100], emoji=emoji_str, file=sf, reason=reason)
+                        res["created"] += 1
                     except discord.Forbidden:
                         res["failed"] += 1; res["errors"].append(f"Sticker '{sd['name']}': Missing permissions")
                     except Exception as e:
                         res["failed"] += 1; res["errors"].append(f"Sticker '{sd['name']}': {str(e)[:50]}")
 
-            if "server_settings" in components:
-                status.append("⚙️ Restoring server settings…")
-                prog.description = "```\n"+"\n".join(status)+"\n```"
-                try: await msg.edit(embed=prog)
-                except Exception: pass
+                await plan.map(create, pending)
+
+            async def restore_server_settings():
+                progress.add("⚙️ Restoring server settings…")
                 ss = snap.get("server_settings", {})
                 gi = snap.get("guild", {})
                 edit_kwargs = {}
@@ -1549,29 +1884,48 @@ class BackupRestore(commands.Cog):
                     if ss.get("premium_progress_bar_enabled") is not None:
                         edit_kwargs["premium_progress_bar_enabled"] = ss["premium_progress_bar_enabled"]
                     if edit_kwargs:
-                        await guild.edit(**edit_kwargs, reason=f"Backup restore: {entry['id']}")
+                        await guild.edit(**edit_kwargs, reason=reason)
                         res["created"] += 1
-                    # Icon restore
-                    icon_b64 = gi.get("icon_b64")
-                    if icon_b64:
-                        try:
-                            icon_bytes = base64.b64decode(icon_b64)
-                            await guild.edit(icon=icon_bytes, reason=f"Backup restore icon: {entry['id']}")
-                        except Exception as e:
-                            res["errors"].append(f"Icon restore: {str(e)[:60]}")
-                    # Banner restore
-                    banner_b64 = gi.get("banner_b64")
-                    if banner_b64:
-                        try:
-                            banner_bytes = base64.b64decode(banner_b64)
-                            await guild.edit(banner=banner_bytes, reason=f"Backup restore banner: {entry['id']}")
-                        except Exception as e:
-                            res["errors"].append(f"Banner restore: {str(e)[:60]}")
+                    # Icon and banner are edited separately so an unsupported banner (boost tier) doesn't fail the rest
+                    for key in ("icon", "banner"):
+                        raw = gi.get(f"{key}_b64")
+                        if raw:
+                            try:
+                                await guild.edit(**{key: base64.b64decode(raw)}, reason=f"Backup restore {key}: {entry['id']}")
+                            except Exception as e:
+                                res["errors"].append(f"{key.title()} restore: {str(e)[:60]}")
                 except discord.Forbidden:
                     res["failed"] += 1; res["errors"].append("Server settings: Missing permissions (need Manage Guild)")
                 except Exception as e:
                     res["failed"] += 1; res["errors"].append(f"Server settings: {str(e)[:60]}")
 
+            if "roles" in components:
+                plan.add("roles", restore_roles)
+            else:
+                for r in guild.roles:
+                    role_map[r.id] = r
+            if "categories" in components:
+                plan.add("categories", restore_categories, deps=("roles",))
+            else:
+                for c in guild.categories:
+                    cat_map[c.id] = c
+            if "channels" in components:
+                plan.add("channels", restore_channels, deps=("roles", "categories"))
+            if "member_roles" in components:
+                plan.add("member_roles", restore_member_roles, deps=("roles",))
+            if "bot_settings" in components:
+                plan.add("bot_settings", restore_bot_settings)
+            if "emojis" in components:
+                plan.add("emojis", restore_emojis)
+            if "stickers" in components:
+                plan.add("stickers", restore_stickers)
+            if "server_settings" in components:
+                plan.add("server_settings", restore_server_settings, deps=("channels",))
+
+            for phase, err in await plan.run():
+                res["failed"] += 1; res["errors"].append(f"{phase}: {str(err)[:60]}")
+            await progress.close()
+
             elapsed = time.time() - t0
             sync_str = " SYNC" if role_sync else ""
             await self.storage.audit(guild.id, "restore", interaction.user.id, entry["id"], f"C:{res['created']} S:{res['skipped']} F:{res['failed']} +R:{res['roles_added']} -R:{res['roles_removed']} M:{res['members_processed']}{sync_str} [{','.join(components)}]")
@@ -1623,6 +1977,7 @@ class BackupRestore(commands.Cog):
     @commands.guild_only()
     @is_backup_authorized()
     @app_commands.describe(backup_id="Backup ID")
+    @app_commands.autocomplete(backup_id=backup_id_autocomplete)
     async def backup_view(self, ctx, backup_id: str):
         entry = await self.storage.get_entry(ctx.guild.id, backup_id)
         if not entry:
@@ -1660,6 +2015,7 @@ class BackupRestore(commands.Cog):
     @commands.guild_only()
     @is_backup_authorized()
     @app_commands.describe(backup_id="Backup ID")
+    @app_commands.autocomplete(backup_id=backup_id_autocomplete)
     async def backup_delete(self, ctx, backup_id: str):
         entry = await self.storage.get_entry(ctx.guild.id, backup_id)
         if not entry:
@@ -1686,6 +2042,7 @@ class BackupRestore(commands.Cog):
     @commands.guild_only()
     @is_backup_authorized()
     @app_commands.describe(backup_id="Backup ID")
+    @app_commands.autocomplete(backup_id=backup_id_autocomplete)
     async def backup_pin(self, ctx, backup_id: str):
         r = await self.storage.toggle_pin(ctx.guild.id, backup_id, ctx.author.id)
         if r is None:
@@ -1699,6 +2056,7 @@ class BackupRestore(commands.Cog):
     @commands.guild_only()
     @is_backup_authorized()
     @app_commands.describe(backup_id="Backup ID", note="Note text (max 500)")
+    @app_commands.autocomplete(backup_id=backup_id_autocomplete)
     async def backup_note(self, ctx, backup_id: str, *, note: str):
         if len(note) > 500:
             return await ctx.send(embed=discord.Embed(title="\u274c Too Long", description="Notes are limited to 500 characters.", color=0xff0000), ephemeral=True)
@@ -1713,6 +2071,7 @@ class BackupRestore(commands.Cog):
     @commands.guild_only()
     @is_backup_authorized()
     @app_commands.describe(backup_id="Backup ID")
+    @app_commands.autocomplete(backup_id=backup_id_autocomplete)
     async def backup_verify(self, ctx, backup_id: str):
         ok, message = await self.storage.verify(ctx.guild.id, backup_id)
         await self.storage.audit(ctx.guild.id, "verify", ctx.author.id, backup_id, message)
@@ -1744,6 +2103,7 @@ class BackupRestore(commands.Cog):
             iv = max(1, min(168, interval_hours or AUTO_BACKUP_INTERVAL_HOURS or 24))
             sched.update({"enabled": True, "interval_hours": iv})
             await self.storage.set_schedule(ctx.guild.id, sched)
+            self._auto_due.pop(ctx.guild.id, None)
             await self.storage.audit(ctx.guild.id, "schedule", ctx.author.id, details=f"Enabled every {iv}h")
             e = discord.Embed(title="\u2705 Auto-Backup Enabled", description=f"Automatic snapshots every **{iv} hours**.\nBackups will be labeled as auto-backups in the list.", color=0x00ff00)
             if AUTO_BACKUP_INTERVAL_HOURS <= 0:
@@ -1760,6 +2120,7 @@ class BackupRestore(commands.Cog):
     @commands.guild_only()
     @is_backup_authorized()
     @app_commands.describe(id_a="First backup ID", id_b="Second backup ID")
+    @app_commands.autocomplete(id_a=backup_id_autocomplete, id_b=backup_id_autocomplete)
     async def backup_diff(self, ctx, id_a: str, id_b: str):
         ea = await self.storage.get_entry(ctx.guild.id, id_a)
         eb = await self.storage.get_entry(ctx.guild.id, id_b)
@@ -1819,6 +2180,7 @@ class BackupRestore(commands.Cog):
     @commands.guild_only()
     @is_bot_owner()
     @app_commands.describe(backup_id="Backup ID")
+    @app_commands.autocomplete(backup_id=backup_id_autocomplete)
     async def backup_export(self, ctx, backup_id: str):
         snap = await self.storage.get_snap(ctx.guild.id, backup_id)
         if not snap:
@@ -1837,6 +2199,14 @@ class BackupRestore(commands.Cog):
         s = await self.storage.global_stats()
         e = discord.Embed(title="\U0001f4ca Global Backup Statistics", description="Across all guilds using this bot instance.", color=0x5865f2, timestamp=discord.utils.utcnow())
         e.add_field(name="\U0001f4e6 Storage", value=f"```\nBackups: {s['total']}\nGuilds:  {s['guilds']}\nPinned:  {s['pinned']}\nSize:    {_sz(s['size'])}\n```", inline=True)
+        cm = self.capture_metrics
+        if cm:
+            runs = sum(m["runs"] for m in cm.values())
+            fails = sum(m["failures"] for m in cm.values())
+            avg = sum(m["avg"] for m in cm.values()) / len(cm)
+            slowest = sorted(cm.items(), key=lambda kv: kv[1]["last"], reverse=True)[:5]
+            lines = "\n".join(f"{gid}: {m['last']:.1f}s (avg {m['avg']:.1f}s)" for gid, m in slowest)
+            e.add_field(name="\u23f1\ufe0f Auto-Backup Captures", value=f"```\nRuns:     {runs} ({fails} failed)\nGuilds:   {len(cm)}\nAvg:      {avg:.2f}s\nWorkers:  {AUTO_BACKUP_WORKERS}\nIn-flight:{len(self._auto_inflight)}\n```\n**Slowest (last run)**\n```\n{lines}\n```", inline=False)
         e.add_field(name="\u2699\ufe0f Config", value=f"```\nMax/Guild:  {MAX_BACKUPS_PER_GUILD}\nCooldown:   {BACKUP_COOLDOWN_SECONDS}s\nAuto:       {AUTO_BACKUP_INTERVAL_HOURS}h {'(on)' if AUTO_BACKUP_INTERVAL_HOURS > 0 else '(off)'}\nRetention:  {BACKUP_RETENTION_DAYS}d {'(on)' if BACKUP_RETENTION_DAYS > 0 else '(off)'}\n```", inline=True)
         await ctx.send(embed=e)
 
@@ -154,6 +154,12 @@ CONFIG_SCHEMA = {
                 "min": 0,
                 "max": 50,
             },
+            "rate_limits": {
+                "type": dict,
+                "required": False,
+                "default": {"default": {"rate": 20, "burst": 100}},
+                "description": "Per-logger log rate limits: {logger: {rate, burst, sample, max_level}}",
+            },
         },
     },
     "extensions": {
@@ -308,6 +314,25 @@ CONFIG_SCHEMA = {
                 "default": True,
                 "description": "Enable ConfigValidator cog",
             },
+            "lazy_load": {
+                "type": bool,
+                "required": False,
+                "default": False,
+                "description": "Defer heavy optional cogs until their first command",
+            },
+            "lazy_cogs": {
+                "type": list,
+                "required": False,
+                "default": ["ZExtensionAI", "GeminiService", "GeminiServiceHelper", "backup_restore"],
+                "description": "Cog file names deferred when lazy_load is on",
+            },
+            "lazy_idle_minutes": {
+                "type": (int, float),
+                "required": False,
+                "default": 0,
+                "description": "Unload a deferred cog after this many idle minutes (0 = never)",
+                "min": 0,
+            },
         },
     },
 }
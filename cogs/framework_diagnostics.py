@@ -7,15 +7,335 @@ import psutil
 import platform
 import sys
 from typing import Dict, Any, Optional
-from collections import deque
+from collections import deque, Counter
+import threading
 import logging
 import asyncio
 import time
 import json
 import os
 
+from atomic_file_system import BucketHistogram
+
 logger = logging.getLogger('discord.cogs.framework_diagnostics')
 
+LAG_PROBE_MIN_MS = float(os.getenv("FW_LAG_PROBE_MIN_MS", 20))
+LAG_PROBE_MAX_MS = float(os.getenv("FW_LAG_PROBE_MAX_MS", 100))
+SLOW_CALLBACK_MS = float(os.getenv("FW_SLOW_CALLBACK_MS", 100))
+SLOW_CALLBACK_STACK_DEPTH = 8
+PROFILE_INTERVAL_MS = float(os.getenv("FW_PROFILE_INTERVAL_MS", 10))
+PROFILE_MAX_SECONDS = 120
+PROFILE_TIMEOUT_GRACE = 10
+PROFILE_KEEP_FILES = 20
+
+
+class LagHistogram(BucketHistogram):
+    """Event-loop lag samples: fixed ms buckets for the lifetime distribution
+    plus a short time-bounded window for averages and percentiles."""
+
+    BOUNDS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self, window: float = 10.0):
+        super().__init__()
+        self.window = window
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+        self._recent: deque = deque()
+
+    def add(self, lag_ms: float, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        self.bucket(lag_ms)
+        self.total += 1
+        self.sum_ms += lag_ms
+        if lag_ms > self.max_ms:
+            self.max_ms = lag_ms
+        self._recent.append((now, lag_ms))
+        cutoff = now - self.window
+        while self._recent and self._recent[0][0] < cutoff:
+            self._recent.popleft()
+
+    def recent(self) -> list:
+        return [lag for _, lag in self._recent]
+
+    def average(self) -> float:
+        values = self.recent()
+        return sum(values) / len(values) if values else 0.0
+
+    @staticmethod
+    def _pick(values: list, pct: float) -> float:
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+    def percentile(self, pct: float) -> float:
+        return self._pick(sorted(self.recent()), pct)
+
+    def buckets(self) -> Dict[str, int]:
+        return dict(zip(self.labels("ms"), self.counts))
+
+    def snapshot(self) -> Dict[str, Any]:
+        values = sorted(self.recent())
+        return {
+            "samples": self.total,
+            "window_samples": len(values),
+            "avg_ms": round(sum(values) / len(values), 2) if values else 0.0,
+            "p50_ms": round(self._pick(values, 50), 2),
+            "p95_ms": round(self._pick(values, 95), 2),
+            "p99_ms": round(self._pick(values, 99), 2),
+            "window_max_ms": round(values[-1], 2) if values else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "histogram": self.buckets()
+        }
+
+
+class SlowCallbackTracker:
+    """Times every asyncio Handle and records the ones that block the loop
+    longer than the threshold. Only slow callbacks pay for attribution, so
+    the steady-state cost is two perf_counter calls per callback."""
+
+    def __init__(self, threshold_ms: float = SLOW_CALLBACK_MS, maxlen: int = 50):
+        self.threshold_ms = threshold_ms
+        self.records: deque = deque(maxlen=maxlen)
+        self.by_name: Dict[str, Dict[str, Any]] = {}
+        self.total = 0
+        self._original = None
+
+    @property
+    def installed(self) -> bool:
+        return self._original is not None
+
+    def install(self) -> bool:
+        if self._original is not None or self.threshold_ms <= 0:
+            return False
+        current = asyncio.events.Handle._run
+        original = getattr(current, '__wrapped__', current)
+        threshold = self.threshold_ms / 1000
+        clock = time.perf_counter
+        tracker = self
+
+        def _run(handle):
+            start = clock()
+            original(handle)
+            elapsed = clock() - start
+            if elapsed >= threshold:
+                tracker._record(handle, elapsed)
+
+        _run.__wrapped__ = original
+        asyncio.events.Handle._run = _run
+        self._original = original
+        return True
+
+    def uninstall(self):
+        if self._original is None:
+            return
+        current = asyncio.events.Handle._run
+        if getattr(current, '__wrapped__', None) is self._original:
+            asyncio.events.Handle._run = self._original
+        self._original = None
+
+    @staticmethod
+    def _format_frame(frame) -> str:
+        code = frame.f_code
+        return f"{Path(code.co_filename).name}:{frame.f_lineno} in {code.co_name}"
+
+    def _describe(self, handle) -> Optional[Dict[str, Any]]:
+        callback = handle._callback
+        if callback is None:
+            return None
+        owner = getattr(callback, '__self__', None)
+        if isinstance(owner, asyncio.Task):
+            coro = owner.get_coro()
+            frames = owner.get_stack(limit=SLOW_CALLBACK_STACK_DEPTH)
+            frame = getattr(coro, 'cr_frame', None) or (frames[0] if frames else None)
+            return {
+                "kind": "task",
+                "name": getattr(coro, '__qualname__', None) or repr(coro),
+                "task": owner.get_name(),
+                "module": frame.f_globals.get('__name__', '?') if frame else '?',
+                "stack": [self._format_frame(f) for f in frames]
+            }
+        func = getattr(callback, '__func__', None) or getattr(callback, 'func', None) or callback
+        stack = []
+        source = getattr(handle, '_source_traceback', None)
+        if source:
+            stack = [f"{Path(fs.filename).name}:{fs.lineno} in {fs.name}" for fs in source[-SLOW_CALLBACK_STACK_DEPTH:]]
+        return {
+            "kind": "callback",
+            "name": getattr(func, '__qualname__', None) or repr(callback),
+            "task": None,
+            "module": getattr(func, '__module__', None) or '?',
+            "stack": stack
+        }
+
+    def _record(self, handle, elapsed: float):
+        try:
+            info = self._describe(handle)
+            if info is None:
+                return
+            elapsed_ms = round(elapsed * 1000, 2)
+            info["duration_ms"] = elapsed_ms
+            info["timestamp"] = datetime.now().isoformat()
+            self.records.append(info)
+            self.total += 1
+            key = f"{info['module']}:{info['name']}"
+            stats = self.by_name.get(key)
+            if stats is None:
+                if len(self.by_name) >= 500:
+                    return
+                stats = self.by_name[key] = {"name": info["name"], "module": info["module"], "count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            stats["count"] += 1
+            stats["total_ms"] += elapsed_ms
+            if elapsed_ms > stats["max_ms"]:
+                stats["max_ms"] = elapsed_ms
+        except Exception:
+            pass
+
+    def top(self, limit: int = 5) -> list:
+        ranked = sorted(self.by_name.values(), key=lambda s: s["total_ms"], reverse=True)
+        return [dict(s, total_ms=round(s["total_ms"], 2)) for s in ranked[:limit]]
+
+
+class StackSampler:
+    """Thread-based sampling profiler. A daemon thread snapshots every other
+    thread's stack via sys._current_frames() at a fixed interval and
+    aggregates identical stacks, so the sampled threads run uninstrumented."""
+
+    IDLE_LEAVES = {
+        ("selectors.py", "select"),
+        ("threading.py", "wait"),
+        ("threading.py", "_wait_for_tstate_lock"),
+        ("queue.py", "get"),
+        ("thread.py", "_worker"),
+    }
+    MAX_DEPTH = 64
+
+    def __init__(self, interval: float = PROFILE_INTERVAL_MS / 1000, include_idle: bool = False):
+        self.interval = max(0.001, interval)
+        self.include_idle = include_idle
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.idle_samples = 0
+        self.ticks = 0
+        self.threads = set()
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+
+    @staticmethod
+    def _label(frame) -> str:
+        code = frame.f_code
+        module = frame.f_globals.get('__name__', '?')
+        return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+    def _is_idle(self, frame) -> bool:
+        return (Path(frame.f_code.co_filename).name, frame.f_code.co_name) in self.IDLE_LEAVES
+
+    def _sample(self, own_ident: int, names: Dict[int, str]):
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            if not self.include_idle and self._is_idle(frame):
+                self.idle_samples += 1
+                continue
+            labels = []
+            while frame is not None and len(labels) < self.MAX_DEPTH:
+                labels.append(self._label(frame))
+                frame = frame.f_back
+            if ident not in names:
+                names.update((t.ident, t.name) for t in threading.enumerate())
+            thread_name = names.get(ident, f"thread-{ident}")
+            labels.append(thread_name)
+            labels.reverse()
+            self.stacks[tuple(labels)] += 1
+            self.threads.add(thread_name)
+            self.samples += 1
+
+    def run(self, duration: float):
+        own_ident = threading.get_ident()
+        clock = time.perf_counter
+        start = clock()
+        deadline = start + duration
+        next_tick = start
+        names: Dict[int, str] = {}
+        while not self._stop.is_set():
+            now = clock()
+            if now >= deadline:
+                break
+            if self.ticks % 50 == 0:
+                names = {t.ident: t.name for t in threading.enumerate()}
+            self._sample(own_ident, names)
+            self.ticks += 1
+            next_tick += self.interval
+            delay = next_tick - clock()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                next_tick = clock()
+        self.elapsed = clock() - start
+
+    async def profile(self, duration: float):
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+
+        def _target():
+            try:
+                self.run(duration)
+                loop.call_soon_threadsafe(lambda: done.done() or done.set_result(None))
+            except Exception as e:
+                loop.call_soon_threadsafe(lambda exc=e: done.done() or done.set_exception(exc))
+
+        threading.Thread(target=_target, name="fw-stack-sampler", daemon=True).start()
+        try:
+            await asyncio.wait_for(done, duration + PROFILE_TIMEOUT_GRACE)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"CPU sampler did not finish within {duration + PROFILE_TIMEOUT_GRACE:g}s") from None
+        finally:
+            # Also stops the thread if the caller was cancelled
+            self._stop.set()
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common())
+
+    @staticmethod
+    def _owner(stack: tuple) -> str:
+        # Innermost cog/extension frame; otherwise the leaf's top-level package
+        # (e.g. "discord" for gateway parsing, "json" for a large dump).
+        for label in reversed(stack[1:]):
+            module = label.split(':', 1)[0]
+            if module.startswith(("cogs.", "extensions.")):
+                return module
+        return stack[-1].split(':', 1)[0].split('.', 1)[0] if len(stack) > 1 else stack[0]
+
+    def summary(self, top: int = 10) -> Dict[str, Any]:
+        own: Counter = Counter()
+        total: Counter = Counter()
+        owners: Counter = Counter()
+        per_thread: Counter = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack[1:]):
+                total[label] += count
+            owners[self._owner(stack)] += count
+            per_thread[stack[0]] += count
+        samples = self.samples or 1
+        as_rows = lambda counter: [
+            {"name": name, "samples": count, "percent": round(count / samples * 100, 1)}
+            for name, count in counter.most_common(top)
+        ]
+        observed = self.samples + self.idle_samples
+        return {
+            "duration_s": round(self.elapsed, 2),
+            "interval_ms": round(self.interval * 1000, 2),
+            "ticks": self.ticks,
+            "samples": self.samples,
+            "idle_percent": round(self.idle_samples / observed * 100, 1) if observed else 0.0,
+            "unique_stacks": len(self.stacks),
+            "threads": dict(per_thread.most_common()),
+            "top_self": as_rows(own),
+            "top_total": as_rows(total),
+            "by_module": as_rows(owners)
+        }
+
 
 class FrameworkDiagnostics(commands.Cog):
     
@@ -30,7 +350,13 @@ class FrameworkDiagnostics(commands.Cog):
         self.alert_channel_id = None
         self.last_loop_check = time.monotonic()
         self.loop_lag_threshold_ms = int(os.getenv("FW_LOOP_LAG_THRESHOLD_MS", 500))
-        self._lag_samples = deque(maxlen=10)
+        self.lag_histogram = LagHistogram(window=10.0)
+        self.slow_callbacks = SlowCallbackTracker()
+        self._lag_probe_ms = LAG_PROBE_MIN_MS
+        self._lag_sampler_task: Optional[asyncio.Task] = None
+        self.profiles_dir = Path("./data/profiles")
+        self._profile_lock = asyncio.Lock()
+        self.last_profile: Optional[Dict[str, Any]] = None
         self._metrics_snapshots = deque(maxlen=12)  
         self._health_history = deque(maxlen=48)
         self._error_history = deque(maxlen=20)
@@ -98,17 +424,53 @@ class FrameworkDiagnostics(commands.Cog):
         except Exception as e:
             logger.error(f"Framework Diagnostics: Failed to save config: {e}")
 
+    async def _lag_sampler(self):
+        # Sleeps for a short interval and measures the overshoot. The interval
+        # halves while the loop is lagging and relaxes back once it recovers,
+        # so bursts are captured at high resolution without constant polling.
+        clock = time.perf_counter
+        while True:
+            interval = self._lag_probe_ms / 1000
+            start = clock()
+            await asyncio.sleep(interval)
+            lag_ms = max(0.0, (clock() - start - interval) * 1000)
+            self.lag_histogram.add(lag_ms)
+            if lag_ms >= self._lag_probe_ms:
+                self._lag_probe_ms = max(LAG_PROBE_MIN_MS, self._lag_probe_ms / 2)
+            else:
+                self._lag_probe_ms = min(LAG_PROBE_MAX_MS, self._lag_probe_ms * 1.1)
+    
+    def _start_lag_profiler(self):
+        if self._lag_sampler_task is None or self._lag_sampler_task.done():
+            self._lag_sampler_task = asyncio.create_task(self._lag_sampler(), name="fw-lag-sampler")
+        if self.slow_callbacks.install():
+            logger.info(f"Framework Diagnostics: Slow-callback tracking enabled (>= {self.slow_callbacks.threshold_ms:g}ms)")
+    
     async def _check_event_loop_lag(self) -> float:
-        current = time.monotonic()
-        expected_interval = 5.0
-        if hasattr(self, '_last_lag_check'):
-            actual_interval = current - self._last_lag_check
-            lag = max(0, actual_interval - expected_interval)
-        else:
-            lag = 0
-        
-        self._last_lag_check = current
-        return lag * 1000
+        return self.lag_histogram.average()
+    
+    def _cog_for_module(self, module: str) -> Optional[str]:
+        for name, cog in self.bot.cogs.items():
+            if type(cog).__module__ == module:
+                return name
+        return None
+    
+    def get_loop_profile(self, limit: int = 5) -> Dict[str, Any]:
+        recent = []
+        for record in list(self.slow_callbacks.records)[-limit:]:
+            recent.append(dict(record, cog=self._cog_for_module(record["module"])))
+        top = [dict(entry, cog=self._cog_for_module(entry["module"])) for entry in self.slow_callbacks.top(limit)]
+        return {
+            "lag": self.lag_histogram.snapshot(),
+            "probe_interval_ms": round(self._lag_probe_ms, 1),
+            "slow_callbacks": {
+                "enabled": self.slow_callbacks.installed,
+                "threshold_ms": self.slow_callbacks.threshold_ms,
+                "total": self.slow_callbacks.total,
+                "top": top,
+                "recent": list(reversed(recent))
+            }
+        }
     
     def _calculate_error_rate(self) -> float:
         if len(self._metrics_snapshots) >= 2:
@@ -134,9 +496,49 @@ class FrameworkDiagnostics(commands.Cog):
         if not self.health_monitor.is_running():
             self.health_monitor.start()
         
+        self._start_lag_profiler()
+        
         if not self.loop_lag_monitor.is_running():
             self.loop_lag_monitor.start()
     
+    def _write_profile(self, path: Path, collapsed: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(collapsed + "\n")
+        os.replace(tmp, path)
+        old = sorted(path.parent.glob("cpu_*.folded"))[:-PROFILE_KEEP_FILES]
+        for stale in old:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+    
+    async def run_profile(self, duration: float = 10.0, top: int = 10) -> Dict[str, Any]:
+        """Sample every thread for `duration` seconds, write a collapsed-stack
+        file under data/profiles/ and return the hot-function summary."""
+        if self._profile_lock.locked():
+            raise RuntimeError("A CPU profile is already running")
+        duration = max(1.0, min(float(duration), PROFILE_MAX_SECONDS))
+        async with self._profile_lock:
+            logger.info(f"Framework Diagnostics: CPU profile started ({duration:g}s @ {PROFILE_INTERVAL_MS:g}ms)")
+            sampler = StackSampler()
+            await sampler.profile(duration)
+            summary = sampler.summary(top=top)
+            for row in summary["by_module"]:
+                row["cog"] = self._cog_for_module(row["name"])
+            path = self.profiles_dir / f"cpu_{datetime.now().strftime('%Y%m%d_%H%M%S')}.folded"
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self._write_profile, path, sampler.collapsed())
+                summary["file"] = str(path)
+            except Exception as e:
+                logger.error(f"Framework Diagnostics: Failed to write CPU profile: {e}")
+                summary["file"] = None
+            summary["generated_at"] = datetime.now().isoformat()
+            self.last_profile = summary
+            logger.info(f"Framework Diagnostics: CPU profile finished — {summary['samples']} samples, {summary['unique_stacks']} stacks → {summary['file']}")
+            return summary
+    
     async def generate_diagnostics(self) -> Optional[Dict[str, Any]]:
         try:
             system_info = await self._get_system_metrics()
@@ -165,7 +567,10 @@ class FrameworkDiagnostics(commands.Cog):
                     "total_loaded": len([e for e in self.bot.extensions.keys() if e.startswith("extensions.")]),
                     "user_extensions": [e for e in self.bot.extensions.keys() if e.startswith("extensions.")],
                     "framework_cogs": [e for e in self.bot.extensions.keys() if e.startswith("cogs.")],
-                    "load_times": dict(getattr(self.bot, 'extension_load_times', {}))
+                    "load_times": dict(getattr(self.bot, 'extension_load_times', {})),
+                    "load_phases": dict(getattr(self.bot, 'extension_load_phases', {})),
+                    "lazy": self.bot.lazy_cogs.status() if hasattr(self.bot, 'lazy_cogs') else {},
+                    "plugin_graph": self.bot.plugin_graph_stats() if hasattr(self.bot, 'plugin_graph_stats') else {}
                 },
                 
                 "cogs": {
@@ -176,7 +581,10 @@ class FrameworkDiagnostics(commands.Cog):
                 "commands": {
                     "total_registered": len(self.bot.commands),
                     "slash_commands": len(self.bot.tree.get_commands()),
-                    "command_list": [cmd.name for cmd in self.bot.commands]
+                    "command_list": [cmd.name for cmd in self.bot.commands],
+                    "permissions": self.bot.permissions.stats() if hasattr(self.bot, 'permissions') else {},
+                    "help_index": self.bot.help_index.stats() if hasattr(self.bot, 'help_index') else {},
+                    "autocomplete": self.bot.autocomplete.stats() if hasattr(self.bot, 'autocomplete') else {}
                 },
                 
                 "servers": {
@@ -190,12 +598,15 @@ class FrameworkDiagnostics(commands.Cog):
                     "commands_processed": getattr(getattr(self.bot, 'metrics', None), 'commands_processed', 0),
                     "messages_seen": getattr(getattr(self.bot, 'metrics', None), 'messages_seen', 0),
                     "error_count": getattr(getattr(self.bot, 'metrics', None), 'error_count', 0),
-                    "event_loop_lag_ms": round(self.health_metrics["event_loop_lag_ms"], 2)
+                    "event_loop_lag_ms": round(self.health_metrics["event_loop_lag_ms"], 2),
+                    "event_loop": self.get_loop_profile(limit=10),
+                    "log_limiter": self.bot.log_limiter.stats() if hasattr(self.bot, 'log_limiter') else {}
                 },
                 
                 "config": {
                     "prefix": getattr(self.bot, 'config', {}).get("prefix", "!"),
                     "auto_reload": getattr(self.bot, 'config', {}).get("auto_reload", False),
+                    "hot_reload": self.bot.extension_watcher.status() if hasattr(self.bot, 'extension_watcher') else {},
                     "extensions_auto_load": getattr(self.bot, 'config', {}).get("extensions.auto_load", True)
                 },
 
@@ -237,14 +648,17 @@ class FrameworkDiagnostics(commands.Cog):
     
     @tasks.loop(seconds=5)
     async def loop_lag_monitor(self):
-        lag = await self._check_event_loop_lag()
-        self._lag_samples.append(lag)
-        avg_lag = sum(self._lag_samples) / len(self._lag_samples)
+        avg_lag = await self._check_event_loop_lag()
         self.health_metrics["event_loop_lag_ms"] = avg_lag
         
         if avg_lag > self.loop_lag_threshold_ms:
-            logger.warning(f"Event loop lag detected (avg): {avg_lag:.2f}ms")
-            await self._send_alert(f"⚠️ Framework event loop lag: {avg_lag:.2f}ms avg (threshold: {self.loop_lag_threshold_ms}ms)")
+            culprit = ""
+            top = self.get_loop_profile(limit=1)["slow_callbacks"]["top"]
+            if top:
+                owner = top[0]["cog"] or top[0]["module"]
+                culprit = f" — top blocker: `{top[0]['name']}` ({owner}, {top[0]['count']}x, max {top[0]['max_ms']:.0f}ms)"
+            logger.warning(f"Event loop lag detected (avg): {avg_lag:.2f}ms{culprit}")
+            await self._send_alert(f"⚠️ Framework event loop lag: {avg_lag:.2f}ms avg (threshold: {self.loop_lag_threshold_ms}ms){culprit}")
     
     @tasks.loop(minutes=5)
     async def health_monitor(self):
@@ -325,7 +739,6 @@ class FrameworkDiagnostics(commands.Cog):
     @loop_lag_monitor.before_loop
     async def before_loop_lag_monitor(self):
         await self.bot.wait_until_ready()
-        self._last_lag_check = time.monotonic()
     
     @health_monitor.before_loop
     async def before_health_monitor(self):
@@ -420,6 +833,31 @@ class FrameworkDiagnostics(commands.Cog):
             inline=False
         )
         
+        profile = diag['performance']['event_loop']
+        lag = profile['lag']
+        nonzero = [f"{label:>9} {count}" for label, count in lag['histogram'].items() if count]
+        embed.add_field(
+            name="⏲️ Event Loop Lag",
+            value=f"```p50 {lag['p50_ms']}ms | p95 {lag['p95_ms']}ms | p99 {lag['p99_ms']}ms\nmax {lag['window_max_ms']}ms (10s) | {lag['max_ms']}ms (lifetime)\nprobe every {profile['probe_interval_ms']}ms\n" + ("\n".join(nonzero) or "no samples yet") + "```",
+            inline=False
+        )
+        
+        slow = profile['slow_callbacks']
+        if not slow['enabled']:
+            slow_text = "Slow-callback tracking disabled (FW_SLOW_CALLBACK_MS=0)"
+        elif not slow['top']:
+            slow_text = f"No callbacks over {slow['threshold_ms']:g}ms"
+        else:
+            slow_text = "\n".join(
+                f"`{entry['name'][:48]}` ({entry['cog'] or entry['module']}) — {entry['count']}x, max {entry['max_ms']:.0f}ms, total {entry['total_ms']:.0f}ms"
+                for entry in slow['top'][:5]
+            )
+        embed.add_field(
+            name=f"🐢 Slow Callbacks ({slow['total']} over {slow['threshold_ms']:g}ms)",
+            value=slow_text[:1024],
+            inline=False
+        )
+        
         embed.add_field(
             name="📊 Diagnostics Files",
             value=f"```Full Report: {self.diagnostics_file}\nHealth Status: {self.health_file}```",
@@ -435,6 +873,46 @@ class FrameworkDiagnostics(commands.Cog):
         except:
             pass
     
+    @commands.hybrid_command(name="fw_profile", help="Sample the bot's CPU usage for N seconds and show the hottest functions (Bot Owner Only)")
+    @commands.is_owner()
+    @app_commands.describe(seconds="Sampling duration (1-120, default 10)", top="Number of functions to list (1-15, default 10)")
+    async def fw_profile_command(self, ctx, seconds: int = 10, top: int = 10):
+        top = max(1, min(top, 15))
+        if self._profile_lock.locked():
+            await ctx.send("❌ A CPU profile is already running — try again when it finishes.", ephemeral=True)
+            return
+        
+        await ctx.defer()
+        try:
+            profile = await self.run_profile(seconds, top=top)
+        except Exception as e:
+            await ctx.send(f"❌ CPU profile failed: {e}", ephemeral=True)
+            return
+        
+        embed = discord.Embed(
+            title="🔥 CPU Profile",
+            description=f"**{profile['samples']}** busy samples over **{profile['duration_s']}s** @ {profile['interval_ms']}ms ({profile['idle_percent']}% idle)",
+            color=0xff6600,
+            timestamp=discord.utils.utcnow()
+        )
+        
+        def _rows(rows, with_owner=False):
+            lines = []
+            for row in rows:
+                name = (row.get("cog") or row["name"]) if with_owner else row["name"]
+                lines.append(f"{row['percent']:>5}%  {name[-60:]}")
+            return "```" + ("\n".join(lines) or "no busy samples") + "```"
+        
+        embed.add_field(name="🔝 Top Functions (self)", value=_rows(profile["top_self"])[:1024], inline=False)
+        embed.add_field(name="📚 Top Functions (inclusive)", value=_rows(profile["top_total"])[:1024], inline=False)
+        embed.add_field(name="🧩 By Cog / Module", value=_rows(profile["by_module"][:5], with_owner=True)[:1024], inline=False)
+        threads = "\n".join(f"{name[:40]}: {count}" for name, count in list(profile["threads"].items())[:5])
+        embed.add_field(name="🧵 Threads", value=f"```{threads or 'none'}```", inline=True)
+        embed.add_field(name="📁 Collapsed Stacks", value=f"```{profile['file'] or 'write failed'}```", inline=True)
+        embed.set_footer(text="Framework Diagnostics — feed the .folded file to flamegraph.pl or speedscope")
+        
+        await ctx.send(embed=embed)
+    
     @commands.hybrid_command(name="fw_alert_channel", help="Set the alert channel for framework diagnostics (Bot Owner Only)")
     @commands.is_owner()
     async def fw_alert_channel_command(self, ctx, channel: discord.TextChannel = None):
@@ -519,6 +997,9 @@ class FrameworkDiagnostics(commands.Cog):
             self.health_monitor.cancel()
         if self.loop_lag_monitor.is_running():
             self.loop_lag_monitor.cancel()
+        if self._lag_sampler_task and not self._lag_sampler_task.done():
+            self._lag_sampler_task.cancel()
+        self.slow_callbacks.uninstall()
         logger.info("Framework Diagnostics: Cog unloaded")
 
 
@@ -933,8 +933,11 @@ echo json_encode([
             cmd_type = self._get_command_type(cmd)
             
             usage_count = 0
+            latency = {}
             if hasattr(self.bot, 'metrics') and hasattr(self.bot.metrics, 'command_count'):
                 usage_count = self.bot.metrics.command_count.get(cmd.qualified_name, 0)
+            if hasattr(self.bot, 'metrics') and hasattr(self.bot.metrics, 'command_latency_summary'):
+                latency = self.bot.metrics.command_latency_summary(cmd.qualified_name)
             
             db_count = db_stats_dict.get(cmd.qualified_name, 0)
             usage_count = max(usage_count, db_count)
@@ -956,6 +959,7 @@ echo json_encode([
                 "usage_count": max(usage["count"], usage_count),
                 "last_used": usage["last_used"],
                 "error_count": usage["errors"],
+                "latency": latency,
                 "aliases": list(cmd.aliases) if hasattr(cmd, 'aliases') else [],
                 "params": [p for p in cmd.clean_params.keys()] if hasattr(cmd, 'clean_params') else []
             })
@@ -979,6 +983,7 @@ echo json_encode([
                     "usage_count": usage["count"],
                     "last_used": usage["last_used"],
                     "error_count": usage["errors"],
+                    "latency": self.bot.metrics.command_latency_summary(cmd.qualified_name) if hasattr(getattr(self.bot, 'metrics', None), 'command_latency_summary') else {},
                     "aliases": [],
                     "params": []
                 })
@@ -1375,9 +1380,12 @@ echo json_encode([
                 
                 for name, metadata in all_plugins.items():
                     loaded_plugin_names.add(name)
-                    deps_ok, dep_messages = plugin_registry_cog.check_dependencies(name)
-                    has_conflicts, conflict_messages = plugin_registry_cog.detect_conflicts(name)
-                    has_cycle, cycle_path = plugin_registry_cog._detect_circular_dependencies(name)
+                    plugin_status = plugin_registry_cog.validation_status(name) or {}
+                    deps_ok = plugin_status.get("deps_ok", False)
+                    dep_messages = plugin_status.get("dep_issues", [])
+                    has_conflicts = plugin_status.get("has_conflicts", False)
+                    conflict_messages = plugin_status.get("conflicts", [])
+                    has_cycle = plugin_status.get("has_cycle", False)
                     
                     plugin_commands = list(metadata.commands)[:20]
                     
@@ -1433,7 +1441,7 @@ echo json_encode([
 
                 full_name = f"extensions.{ext_name}"
                 is_loaded = full_name in self.bot.extensions
-                load_time = self.bot.extension_load_times.get(ext_name, 0) if hasattr(self.bot, 'extension_load_times') else 0
+                load_time = self.bot.extension_load_times.get(full_name, 0) if hasattr(self.bot, 'extension_load_times') else 0
                 
                 plugins_list.append({
                     "name": ext_name,
@@ -1476,7 +1484,7 @@ echo json_encode([
                 full_name = f"extensions.{ext_name}"
                 is_loaded = full_name in self.bot.extensions
                 
-                load_time = self.bot.extension_load_times.get(ext_name, 0) if hasattr(self.bot, 'extension_load_times') else 0
+                load_time = self.bot.extension_load_times.get(full_name, 0) if hasattr(self.bot, 'extension_load_times') else 0
                 
                 available_extensions.append({
                     "name": ext_name,
@@ -1495,7 +1503,15 @@ echo json_encode([
                     "error_rate": error_rate,
                     "status": "critical" if error_rate >= 10 else "degraded" if error_rate >= 5 else "healthy",
                     "event_loop_lag_ms": round(diagnostics_cog.health_metrics.get("event_loop_lag_ms", 0), 2),
-                    "consecutive_write_failures": diagnostics_cog.health_metrics.get("consecutive_write_failures", 0)
+                    "consecutive_write_failures": diagnostics_cog.health_metrics.get("consecutive_write_failures", 0),
+                    "event_loop": diagnostics_cog.get_loop_profile(limit=5),
+                    "cpu_profile": {
+                        "running": diagnostics_cog._profile_lock.locked(),
+                        "last": {
+                            key: diagnostics_cog.last_profile.get(key)
+                            for key in ("generated_at", "duration_s", "samples", "idle_percent", "file", "top_self", "by_module")
+                        } if diagnostics_cog.last_profile else None
+                    }
                 }
             except Exception as e:
                 logger.error(f"Live Monitor: Failed to collect health data: {e}")
@@ -1504,7 +1520,8 @@ echo json_encode([
 
         commands_data = {
             "total": len(commands_list),
-            "commands": commands_list
+            "commands": commands_list,
+            "latency": self.bot.metrics.get_latency_stats() if hasattr(getattr(self.bot, 'metrics', None), 'get_latency_stats') else {}
         }
         
 
@@ -1552,12 +1569,9 @@ echo json_encode([
                 stats = await backup_cog.storage.global_stats()
                 guild_list = []
                 all_recent = []
-                for d in backup_cog.storage.base_dir.iterdir():
-                    if not d.is_dir():
-                        continue
+                for gid in backup_cog.storage.known_guilds():
                     try:
-                        gid = int(d.name)
-                        idx = await backup_cog.storage._rj(str(d / "index.json"), [])
+                        idx = await backup_cog.storage.get_list(gid)
                         if idx:
                             guild = self.bot.get_guild(gid)
                             guild_name = guild.name if guild else f"Unknown ({gid})"
@@ -1640,6 +1654,10 @@ echo json_encode([
                         "disconnects": m.disconnect_count,
                         "reconnects": m.reconnect_count,
                         "errors": m.error_count,
+                        "events_per_sec": m.all_events.last_second(),
+                        "events_per_min": m.all_events.last_minute(),
+                        "events_peak_per_sec": m.all_events.peak_per_sec,
+                        "events_peak_per_min": m.all_events.peak_per_min,
                     })
                 avg_latency = round(total_latency / len(shard_monitor_cog.metrics), 1) if shard_monitor_cog.metrics else 0
                 shard_data["monitor"] = {
@@ -1672,7 +1690,12 @@ echo json_encode([
                     "clusters": cluster_list,
                     "total_guilds": sum(c.get("guild_count", 0) for c in cluster_list),
                     "total_users": sum(c.get("user_count", 0) for c in cluster_list),
+                    "bus": dict(shard_manager_cog.bus_stats),
                 }
+                try:
+                    shard_data["manager"]["aggregate"] = await shard_manager_cog.cluster_metrics()
+                except Exception as e:
+                    logger.debug(f"Live Monitor: Cluster metrics unavailable: {e}")
             except Exception as e:
                 logger.error(f"Live Monitor: Failed to collect shard manager data: {e}")
 
@@ -1778,7 +1801,7 @@ echo json_encode([
                     actions = await resp.json()
                     if not actions or not isinstance(actions, list):
                         return
-                    backup_cog = self.bot.get_cog("BackupRestore")
+                    backup_cog = await self.bot.ensure_cog("BackupRestore") if hasattr(self.bot, "ensure_cog") else self.bot.get_cog("BackupRestore")
                     if not backup_cog:
                         return
                     processed = 0
@@ -2040,10 +2063,10 @@ echo json_encode([
                         try:
                             if bs.get("custom_prefix") is not None:
                                 await self.bot.db.set_guild_prefix(guild.id, bs["custom_prefix"])
-                                if hasattr(self.bot, "prefix_cache"):
-                                    await self.bot.prefix_cache.invalidate(guild.id)
                             if bs.get("mention_prefix_enabled") is not None:
                                 await self.bot.db.set_guild_mention_prefix_enabled(guild.id, bs["mention_prefix_enabled"])
+                            if hasattr(self.bot, "invalidate_prefix"):
+                                await self.bot.invalidate_prefix(guild.id)
                         except Exception as e:
                             res["errors"].append(f"Bot settings: {str(e)[:60]}")
 
@@ -2407,12 +2430,8 @@ echo json_encode([
                     start_time = time.time()
                     await self.bot.load_extension(ext_name)
                     load_time = time.time() - start_time
-                    
 
                     simple_name = ext_name.replace("extensions.", "").replace("cogs.", "")
-                    if not hasattr(self.bot, 'extension_load_times'):
-                        self.bot.extension_load_times = {}
-                    self.bot.extension_load_times[simple_name] = load_time
                     
                     logger.info(f"Live Monitor: [OK] Extension loaded successfully: {ext_name} ({load_time:.3f}s)")
                     self._log_event("extension_loaded", {"extension": ext_name, "success": True, "load_time": load_time})
@@ -2514,14 +2533,13 @@ echo json_encode([
                 except Exception as e:
                     logger.error(f"Live Monitor: Failed to update auto_reload in config: {e}")
                 try:
-                    if hasattr(self.bot, "extension_reloader"):
-                        task = self.bot.extension_reloader
-                        if enabled and not task.is_running():
-                            task.start()
-                        elif not enabled and task.is_running():
-                            task.cancel()
+                    if hasattr(self.bot, "extension_watcher"):
+                        if enabled:
+                            self.bot.extension_watcher.start()
+                        else:
+                            self.bot.extension_watcher.stop()
                 except Exception as e:
-                    logger.error(f"Live Monitor: Failed to start/stop extension_reloader: {e}")
+                    logger.error(f"Live Monitor: Failed to start/stop extension_watcher: {e}")
                 self._log_event("auto_reload_updated", {"enabled": enabled})
 
             elif cmd_type == "set_extensions_auto_load":
@@ -2580,6 +2598,24 @@ echo json_encode([
                         logger.error(f"Live Monitor: Failed to generate framework diagnostics via dashboard: {e}")
                         self._log_event("framework_diagnostics_failed", {"error": str(e)})
 
+            elif cmd_type == "run_cpu_profile":
+                diagnostics_cog = self.bot.get_cog("FrameworkDiagnostics")
+                if diagnostics_cog and hasattr(diagnostics_cog, "run_profile"):
+                    try:
+                        seconds = int(params.get("seconds", 10))
+                    except (TypeError, ValueError):
+                        seconds = 10
+                    try:
+                        profile = await diagnostics_cog.run_profile(seconds)
+                        self._log_event("cpu_profile_completed", {
+                            "file": profile.get("file"),
+                            "samples": profile.get("samples"),
+                            "top": [row["name"] for row in profile.get("top_self", [])[:3]]
+                        })
+                    except Exception as e:
+                        logger.error(f"Live Monitor: CPU profile via dashboard failed: {e}")
+                        self._log_event("cpu_profile_failed", {"error": str(e)})
+
             elif cmd_type == "leave_guild":
                 guild_id = params.get("guild_id")
                 if guild_id is None:
@@ -3590,7 +3626,7 @@ echo json_encode([
 
     async def _handle_gemini_command(self, cmd: str, params: dict, user_discord_id: str):
         """Delegate gemini_* dashboard commands to GeminiServiceHelper."""
-        helper = self.bot.get_cog("GeminiServiceHelper")
+        helper = await self.bot.ensure_cog("GeminiServiceHelper") if hasattr(self.bot, "ensure_cog") else self.bot.get_cog("GeminiServiceHelper")
         if not helper:
             logger.warning("Live Monitor: GeminiServiceHelper not loaded — cannot handle gemini command")
             return
@@ -13110,6 +13146,10 @@ echo json_encode([
                                             <svg width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M21 15v4a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2v-4"/><polyline points="7 10 12 15 17 10"/><line x1="12" y1="15" x2="12" y2="3"/></svg>
                                             Dashboard Backup
                                         </button>
+                                        <button class="dash-action-btn" onclick="requestCpuProfile()">
+                                            <svg width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M8.5 14.5A2.5 2.5 0 0 0 11 12c0-1.38-.5-2-1-3-1.07-2.14 0-5.5 3-7 .5 2.5 2 4.9 4 6.5 2 1.6 3 3.5 3 5.5a7 7 0 1 1-14 0c0-1.15.43-2.29 1-3a2.5 2.5 0 0 0 2.5 2.5z"/></svg>
+                                            CPU Profile
+                                        </button>
                                         <button class="dash-action-btn" onclick="requestBotBackup()">
                                             <svg width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><rect x="2" y="2" width="20" height="8" rx="2" ry="2"/><rect x="2" y="14" width="20" height="8" rx="2" ry="2"/><line x1="6" y1="6" x2="6.01" y2="6"/><line x1="6" y1="18" x2="6.01" y2="18"/></svg>
                                             Bot Backup
@@ -16339,6 +16379,7 @@ if (typeof window !== 'undefined') {
             // DASHBOARD TAB
             if (tabName === 'dashboard') {
                 disableButton('button[onclick*="clear_cache"]', 'action_clear_cache', 'control_core');
+                disableButton('button[onclick*="requestCpuProfile"]', 'action_run_cpu_profile', 'control_core');
                 disableButton('button[onclick*="toggle_verbose_logging"]', 'action_toggle_logging', 'control_core');
                 disableButton('button[onclick*="toggle_debug_packages"]', 'action_toggle_debug_packages', 'control_core');
                 disableButton('button[onclick*="backup_bot_directory"]', 'action_backup_bot', 'control_backup');
@@ -16866,6 +16907,14 @@ if (typeof window !== 'undefined') {
             sendCommand('shutdown_bot', {});
         }
 
+        function requestCpuProfile() {
+            const raw = prompt('Profile duration in seconds (1-120):', '10');
+            if (raw === null) return;
+            const seconds = Math.max(1, Math.min(120, parseInt(raw, 10) || 10));
+            sendCommand('run_cpu_profile', { seconds });
+            showNotification('CPU profile started for ' + seconds + 's. Results appear on the Framework Health card; collapsed stacks are saved under ./data/profiles.', 'info');
+        }
+
         function requestBotBackup() {
             sendCommand('backup_bot_directory', {});
             showNotification('Bot backup requested. The archive will be saved on the bot host under ./data/Dashboardbackups as bot_backup_YYYYMMDD_HHMMSS.zip.', 'info');
@@ -18153,6 +18202,11 @@ if (typeof window !== 'undefined') {
                                     <div style="font-size: 10px; color: #8b949e; text-transform: uppercase;">Last Used</div>
                                     <div style="font-size: 12px; font-weight: 600; color: #60a5fa;">${cmd.last_used ? formatTime(cmd.last_used) : 'Never'}</div>
                                 </div>
+                                ${Object.entries(cmd.latency || {}).map(([kind, lat]) => `
+                                <div>
+                                    <div style="font-size: 10px; color: #8b949e; text-transform: uppercase;">${kind} p50 / p95</div>
+                                    <div style="font-size: 12px; font-weight: 600; color: ${lat.p95_ms > 3000 ? '#f87171' : '#60a5fa'};">${Math.round(lat.p50_ms)} / ${Math.round(lat.p95_ms)} ms</div>
+                                </div>`).join('')}
                             </div>
                             
                             ${(cmd.params && cmd.params.length > 0) || (cmd.subcommands && cmd.subcommands.length > 0) ? `
@@ -20128,6 +20182,22 @@ if (typeof window !== 'undefined') {
                     buildProperty('Status', buildBadge(data.health.status || 'unknown')) +
                     buildProperty('Error Rate', (data.health.error_rate ?? 0).toFixed(2) + '%') +
                     buildProperty('Event Loop Lag', (data.health.event_loop_lag_ms || 0).toFixed(2) + ' ms') +
+                    (data.health.event_loop ? (
+                        buildProperty('Lag p50 / p95 / p99', data.health.event_loop.lag.p50_ms + ' / ' + data.health.event_loop.lag.p95_ms + ' / ' + data.health.event_loop.lag.p99_ms + ' ms') +
+                        buildProperty('Lag Max (10s)', data.health.event_loop.lag.window_max_ms + ' ms') +
+                        buildProperty('Slow Callbacks', data.health.event_loop.slow_callbacks.total + ' over ' + data.health.event_loop.slow_callbacks.threshold_ms + ' ms') +
+                        (data.health.event_loop.slow_callbacks.top || []).slice(0, 3).map(entry => {
+                            const esc = (str) => String(str).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+                            return buildProperty(esc(entry.cog || entry.module), '<code>' + esc(entry.name) + '</code> ' + entry.count + 'x, max ' + Math.round(entry.max_ms) + ' ms');
+                        }).join('')
+                    ) : '') +
+                    (data.health.cpu_profile ? (
+                        buildProperty('CPU Profile', data.health.cpu_profile.running ? 'running…' : (data.health.cpu_profile.last ? data.health.cpu_profile.last.samples + ' samples / ' + data.health.cpu_profile.last.duration_s + 's' : 'none yet')) +
+                        (data.health.cpu_profile.last ? (data.health.cpu_profile.last.top_self || []).slice(0, 3).map(row => {
+                            const esc = (str) => String(str).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+                            return buildProperty(row.percent + '%', '<code>' + esc(row.name) + '</code>');
+                        }).join('') : '')
+                    ) : '') +
                     buildProperty('Write Failures', data.health.consecutive_write_failures || 0)
                 );
             }
@@ -20589,6 +20659,7 @@ if (typeof window !== 'undefined') {
                 // System Actions
                 { key: 'action_shutdown_bot', label: 'Shutdown Bot (DANGEROUS)' },
                 { key: 'action_generate_diagnostics', label: 'Generate Diagnostics' },
+                { key: 'action_run_cpu_profile', label: 'Run CPU Profile' },
                 { key: 'action_invalidate_cache', label: 'Invalidate Cache Entry' },
                 { key: 'action_force_release_lock', label: 'Force Release Lock (DANGEROUS)' },
                 
@@ -22907,6 +22978,8 @@ if (typeof window !== 'undefined') {
                                 <div style="display:flex;justify-content:space-between;color:#94a3b8;"><span>Errors</span><span style="color:${s.errors > 0 ? '#ef4444' : '#94a3b8'};font-weight:600;">${s.errors || 0}</span></div>
                                 <div style="display:flex;justify-content:space-between;color:#94a3b8;"><span>Connects</span><span style="color:#e2e8f0;font-weight:600;">${s.connects || 0}</span></div>
                                 <div style="display:flex;justify-content:space-between;color:#94a3b8;"><span>Disconnects</span><span style="color:${s.disconnects > 0 ? '#fbbf24' : '#94a3b8'};font-weight:600;">${s.disconnects || 0}</span></div>
+                                <div style="display:flex;justify-content:space-between;color:#94a3b8;"><span>Events/s</span><span style="color:#e2e8f0;font-weight:600;">${s.events_per_sec || 0} <span style="color:#64748b;font-weight:400;">(${s.events_per_min || 0}/min)</span></span></div>
+                                <div style="display:flex;justify-content:space-between;color:#94a3b8;"><span>Peak</span><span style="color:#e2e8f0;font-weight:600;">${s.events_peak_per_sec || 0}/s <span style="color:#64748b;font-weight:400;">(${s.events_peak_per_min || 0}/min)</span></span></div>
                             </div>
                             <div style="margin-top:8px;padding-top:8px;border-top:1px solid rgba(148,163,184,.1);font-size:11px;color:#64748b;">
                                 ${s.health_reason}
@@ -22917,6 +22990,7 @@ if (typeof window !== 'undefined') {
 
             const clusterMap = el('shard-cluster-map');
             if (clusterMap && mgr.clusters && mgr.clusters.length > 0) {
+                const agg = mgr.aggregate || {};
                 clusterMap.innerHTML = `
                     <div style="display:grid;grid-template-columns:repeat(auto-fill,minmax(240px,1fr));gap:12px;">
                         ${mgr.clusters.map(c => {
@@ -22935,10 +23009,17 @@ if (typeof window !== 'undefined') {
                                         <div style="display:flex;justify-content:space-between;"><span>Users</span><span style="color:#e2e8f0;font-weight:600;">${(c.user_count || 0).toLocaleString()}</span></div>
                                         <div style="display:flex;justify-content:space-between;"><span>Shards</span><span style="color:#e2e8f0;font-weight:600;">${c.shard_count || '?'}</span></div>
                                         <div style="display:flex;justify-content:space-between;"><span>Mode</span><span style="color:#818cf8;font-weight:600;">${c.mode || '?'}</span></div>
+                                        ${agg.clusters && agg.clusters[c.name] ? `<div style="display:flex;justify-content:space-between;"><span>Commands/s</span><span style="color:#e2e8f0;font-weight:600;">${agg.clusters[c.name].commands_per_sec.toFixed(2)}</span></div>` : ''}
                                     </div>
                                 </div>`;
                         }).join('')}
-                    </div>`;
+                    </div>
+                    ${agg.totals ? `
+                    <div style="margin-top:12px;font-size:12px;color:#94a3b8;display:flex;flex-wrap:wrap;gap:16px;">
+                        <span>Cluster-wide: <b style="color:#e2e8f0;">${agg.totals.commands_per_sec.toFixed(2)}</b> cmd/s</span>
+                        <span>Errors: <b style="color:#e2e8f0;">${agg.totals.error_count.toLocaleString()}</b> (${agg.totals.errors_per_sec.toFixed(2)}/s)</span>
+                        <span>Latency p50/p95/p99: <b style="color:#e2e8f0;">${Math.round(agg.totals.latency_p50)}/${Math.round(agg.totals.latency_p95)}/${Math.round(agg.totals.latency_p99)}ms</b></span>
+                    </div>` : ''}`;
             } else if (clusterMap && !mgr.clusters) {
                 clusterMap.innerHTML = '<div style="font-size:13px;color:#64748b;text-align:center;padding:30px;">Shard Manager not active. Enable ENABLE_SHARD_MANAGER in .env to use clustering.</div>';
             }
@@ -25432,9 +25513,10 @@ function lm_default_permissions_for_tier(string $tier): array {
                 'action_edit_file' => true,
                 'action_save_file' => true,
                 
-                // ACTION PERMISSIONS - System Actions (5)
+                // ACTION PERMISSIONS - System Actions (6)
                 'action_shutdown_bot' => true,
                 'action_generate_diagnostics' => true,
+                'action_run_cpu_profile' => true,
                 'action_invalidate_cache' => true,
                 'action_force_release_lock' => true,
                 'action_control_bot_status_config' => true,
@@ -25556,6 +25638,7 @@ function lm_default_permissions_for_tier(string $tier): array {
                 'action_save_file' => false,
                 'action_shutdown_bot' => false,
                 'action_generate_diagnostics' => false,
+                'action_run_cpu_profile' => false,
                 'action_invalidate_cache' => false,
                 'action_force_release_lock' => false,
                 'action_control_bot_status_config' => false,
@@ -30594,6 +30677,8 @@ function lm_command_allowed_for_permissions(string $command, array $perms): bool
             return !empty($perms['action_shutdown_bot']);
         case 'generate_framework_diagnostics':
             return !empty($perms['action_generate_diagnostics']);
+        case 'run_cpu_profile':
+            return !empty($perms['action_run_cpu_profile']);
         case 'af_invalidate_cache_entry':
             return !empty($perms['action_invalidate_cache']);
         case 'af_force_release_lock':
@@ -0,0 +1,400 @@
+"""
+Prometheus Metrics Exporter
+Serves framework metrics on a local HTTP endpoint in the Prometheus text
+exposition format (0.0.4), so the bot can be scraped by an existing
+Prometheus / VictoriaMetrics / Grafana Agent setup.
+
+Disabled unless METRICS_EXPORTER_PORT is set. The endpoint binds to
+127.0.0.1 by default and never touches subsystems on request: a background
+loop snapshots every subsystem every METRICS_EXPORTER_INTERVAL seconds,
+renders the exposition text in a worker thread and the handler returns the
+cached bytes.
+
+Environment:
+    METRICS_EXPORTER_PORT      — port to listen on (0 / unset = disabled)
+    METRICS_EXPORTER_HOST      — bind address (default 127.0.0.1)
+    METRICS_EXPORTER_INTERVAL  — snapshot interval in seconds (default 15)
+
+Sources:
+    bot.metrics (commands, messages, per-command latency, traced spans),
+    AtomicFileHandler, EventHooks, ShardMonitor (per shard), ShardManager
+    (IPC links, invalidation bus), FrameworkDiagnostics (loop lag, slow
+    callbacks) and Live Monitor delivery state. Every series carries a
+    ``cluster`` label; per-shard series also carry ``shard``.
+
+Slash commands:
+    /metricsexporter           — Show exporter status (Bot Owner Only)
+"""
+# MIT License — Copyright (c) 2026 TheHolyOneZ
+# Part of the Zoryx Discord Bot Framework
+# https://github.com/TheHolyOneZ/discord-bot-framework
+
+from discord.ext import commands, tasks
+import discord
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple, Any
+
+try:
+    from aiohttp import web
+    _AIOHTTP_OK = True
+except ImportError:
+    web = None
+    _AIOHTTP_OK = False
+
+try:
+    import psutil
+    _PSUTIL_OK = True
+except ImportError:
+    psutil = None
+    _PSUTIL_OK = False
+
+logger = logging.getLogger('discord.cogs.metrics_exporter')
+
+EXPORTER_PORT = int(os.getenv("METRICS_EXPORTER_PORT", 0))
+EXPORTER_HOST = os.getenv("METRICS_EXPORTER_HOST", "127.0.0.1")
+EXPORTER_INTERVAL = float(os.getenv("METRICS_EXPORTER_INTERVAL", 15))
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricFamily:
+    """One metric name with its TYPE/HELP header and labelled samples"""
+
+    __slots__ = ("name", "kind", "help", "samples")
+
+    def __init__(self, name: str, kind: str, help_text: str):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.samples: List[Tuple[str, Labels, float]] = []
+
+    def add(self, value: float, suffix: str = "", **labels):
+        if value is None:
+            return
+        self.samples.append((suffix, tuple(labels.items()), value))
+
+    def add_histogram(self, bounds, counts, total: float, scale: float = 1.0, **labels):
+        """Cumulative buckets from per-bucket counts; ``bounds`` are upper edges
+        and ``counts`` has one extra overflow slot. ``scale`` converts units
+        (e.g. 0.001 for ms buckets exported as seconds)."""
+        running = 0
+        for bound, count in zip(bounds, counts):
+            running += count
+            self.add(running, "_bucket", **labels, le=_number(bound * scale))
+        running += counts[-1]
+        self.add(running, "_bucket", **labels, le="+Inf")
+        self.add(total * scale, "_sum", **labels)
+        self.add(running, "_count", **labels)
+
+
+class MetricsRegistry:
+    """Collects families for one snapshot and renders the exposition text"""
+
+    def __init__(self, const_labels: Dict[str, str]):
+        self.const_labels = tuple(const_labels.items())
+        self.families: Dict[str, MetricFamily] = {}
+
+    def family(self, name: str, kind: str, help_text: str) -> MetricFamily:
+        fam = self.families.get(name)
+        if fam is None:
+            fam = self.families[name] = MetricFamily(name, kind, help_text)
+        return fam
+
+    def counter(self, name: str, help_text: str) -> MetricFamily:
+        return self.family(name, "counter", help_text)
+
+    def gauge(self, name: str, help_text: str) -> MetricFamily:
+        return self.family(name, "gauge", help_text)
+
+    def histogram(self, name: str, help_text: str) -> MetricFamily:
+        return self.family(name, "histogram", help_text)
+
+    def render(self) -> bytes:
+        lines = []
+        for fam in self.families.values():
+            if not fam.samples:
+                continue
+            lines.append(f"# HELP {fam.name} {fam.help}")
+            lines.append(f"# TYPE {fam.name} {fam.kind}")
+            for suffix, labels, value in fam.samples:
+                merged = self.const_labels + labels
+                label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in merged)
+                lines.append(f"{fam.name}{suffix}{{{label_text}}} {_number(value)}")
+        lines.append("")
+        return "\n".join(lines).encode("utf-8")
+
+    @property
+    def series(self) -> int:
+        return sum(len(f.samples) for f in self.families.values())
+
+
+class MetricsExporter(commands.Cog):
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.port = EXPORTER_PORT
+        self.host = EXPORTER_HOST
+        self._payload = b""
+        self._series = 0
+        self._last_render: Optional[float] = None
+        self._render_ms = 0.0
+        self._scrapes = 0
+        self._runner: Optional["web.AppRunner"] = None
+        self._process = None
+        self.refresh_snapshot.change_interval(seconds=max(1.0, EXPORTER_INTERVAL))
+
+    async def cog_load(self):
+        if not self.port:
+            logger.info("[MetricsExporter] Disabled (set METRICS_EXPORTER_PORT to enable)")
+            return
+        if not _AIOHTTP_OK:
+            logger.warning("[MetricsExporter] aiohttp not installed — exporter disabled")
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        try:
+            await web.TCPSite(self._runner, self.host, self.port).start()
+        except OSError as e:
+            logger.error(f"[MetricsExporter] Could not bind {self.host}:{self.port}: {e}")
+            await self._runner.cleanup()
+            self._runner = None
+            return
+        self.refresh_snapshot.start()
+        logger.info(f"[MetricsExporter] Serving http://{self.host}:{self.port}/metrics (refresh every {self.refresh_snapshot.seconds:g}s)")
+
+    async def cog_unload(self):
+        if self.refresh_snapshot.is_running():
+            self.refresh_snapshot.cancel()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        logger.info("[MetricsExporter] Cog unloaded")
+
+    async def _handle_metrics(self, request):
+        self._scrapes += 1
+        return web.Response(body=self._payload, headers={"Content-Type": CONTENT_TYPE})
+
+    @tasks.loop(seconds=15)
+    async def refresh_snapshot(self):
+        start = time.perf_counter()
+        try:
+            registry = self._collect()
+            loop = asyncio.get_running_loop()
+            self._payload = await loop.run_in_executor(None, self._finish, registry)
+            self._series = registry.series
+            self._last_render = time.time()
+        except Exception as e:
+            logger.error(f"[MetricsExporter] Snapshot failed: {e}", exc_info=True)
+        self._render_ms = (time.perf_counter() - start) * 1000
+
+    @refresh_snapshot.before_loop
+    async def before_refresh_snapshot(self):
+        await self.bot.wait_until_ready()
+
+    def _cluster_name(self) -> str:
+        manager = self.bot.get_cog("ShardManager")
+        return getattr(manager, "cluster_name", None) or os.getenv("SHARD_CLUSTER_NAME", "cluster-0")
+
+    def _finish(self, registry: MetricsRegistry) -> bytes:
+        """Worker-thread half of a snapshot: process stats and text rendering"""
+        if _PSUTIL_OK:
+            try:
+                if self._process is None:
+                    self._process = psutil.Process()
+                mem = self._process.memory_info()
+                cpu = self._process.cpu_times()
+                registry.gauge("process_resident_memory_bytes", "Resident memory size in bytes.").add(mem.rss)
+                registry.counter("process_cpu_seconds_total", "Total user and system CPU time spent in seconds.").add(cpu.user + cpu.system)
+                registry.gauge("process_open_fds", "Number of open file descriptors.").add(self._process.num_fds() if hasattr(self._process, "num_fds") else None)
+                registry.gauge("process_threads", "Number of OS threads.").add(self._process.num_threads())
+            except Exception as e:
+                logger.debug(f"[MetricsExporter] psutil collection failed: {e}")
+        registry.gauge("zdbf_exporter_series", "Series in the previous snapshot.").add(self._series)
+        registry.gauge("zdbf_exporter_render_milliseconds", "Duration of the previous snapshot.").add(round(self._render_ms, 3))
+        registry.counter("zdbf_exporter_scrapes_total", "Scrapes served since the exporter started.").add(self._scrapes)
+        return registry.render()
+
+    def _collect(self) -> MetricsRegistry:
+        """Loop-thread half of a snapshot: read in-memory counters only"""
+        registry = MetricsRegistry({"cluster": self._cluster_name()})
+        self._collect_bot(registry)
+        self._collect_atomic_fs(registry)
+        self._collect_event_hooks(registry)
+        self._collect_shards(registry)
+        self._collect_ipc(registry)
+        self._collect_diagnostics(registry)
+        self._collect_live_monitor(registry)
+        return registry
+
+    def _collect_bot(self, r: MetricsRegistry):
+        bot = self.bot
+        r.gauge("zdbf_guilds", "Guilds visible to this cluster.").add(len(bot.guilds))
+        r.gauge("zdbf_extensions_loaded", "Loaded extensions and framework cogs.").add(len(bot.extensions))
+        metrics = getattr(bot, "metrics", None)
+        if metrics is None:
+            return
+        r.gauge("zdbf_uptime_seconds", "Seconds since the metrics collector started.").add(round(metrics.get_uptime(), 3))
+        r.counter("zdbf_commands_processed_total", "Commands invoked.").add(metrics.commands_processed)
+        r.counter("zdbf_messages_seen_total", "Messages processed by on_message.").add(metrics.messages_seen)
+        r.counter("zdbf_command_errors_total", "Command errors.").add(metrics.error_count)
+        # command_count holds exact, never-evicted counts, so each series only grows
+        # until the process restarts (which Prometheus treats as a counter reset).
+        invocations = r.counter("zdbf_command_invocations_total", "Invocations per command since start.")
+        for name, count in list(metrics.command_count.items()):
+            invocations.add(count, command=name)
+
+        histograms = getattr(metrics, "command_latency", {})
+        duration = r.histogram("zdbf_command_duration_seconds", "End-to-end command latency.")
+        phases = r.family("zdbf_command_phase_seconds", "summary", "Command latency by phase (dispatch, prepare, execution, response).")
+        for key, by_phase in list(histograms.items()):
+            kind, name = key.split(":", 1)
+            for phase, hist in by_phase.items():
+                if not hist.count:
+                    continue
+                if phase == "total":
+                    duration.add_histogram(hist.BOUNDS, hist.counts, hist.total, scale=0.001, command=name, kind=kind)
+                else:
+                    phases.add(hist.total / 1000, "_sum", command=name, kind=kind, phase=phase)
+                    phases.add(hist.count, "_count", command=name, kind=kind, phase=phase)
+
+        spans = r.histogram("zdbf_span_duration_seconds", "Sections timed with bot.metrics.trace().")
+        for name, hist in list(getattr(metrics, "spans", {}).items()):
+            if hist.count:
+                spans.add_histogram(hist.BOUNDS, hist.counts, hist.total, scale=0.001, span=name)
+        r.counter("zdbf_spans_dropped_total", "Span records dropped because the name limit was reached.").add(getattr(metrics, "dropped_spans", 0))
+
+    def _collect_atomic_fs(self, r: MetricsRegistry):
+        handler = getattr(getattr(self.bot, "config", None), "file_handler", None)
+        if handler is None:
+            return
+        for key in ("reads", "writes", "cache_hits", "cache_misses", "cache_bypasses", "write_failures", "read_failures", "lock_cleanups", "cache_invalidations"):
+            r.counter(f"zdbf_atomic_fs_{key}_total", f"AtomicFileHandler {key.replace('_', ' ')}.").add(handler.metrics.get(key, 0))
+        r.gauge("zdbf_atomic_fs_cache_entries", "Cached file entries.").add(len(handler._cache))
+        r.gauge("zdbf_atomic_fs_active_locks", "Per-file locks currently held in the lock table.").add(len(handler._locks))
+
+    def _collect_event_hooks(self, r: MetricsRegistry):
+        creater = self.bot.get_cog("EventHooksCreater")
+        if creater is not None and hasattr(creater, "get_scheduler_stats"):
+            scheduler = creater.get_scheduler_stats()
+            r.gauge("zdbf_scheduled_hooks", "Scheduled announcement hooks on the shared timer.").add(scheduler["scheduled_hooks"])
+            if scheduler["next_fire_in"] is not None:
+                r.gauge("zdbf_scheduled_hooks_next_fire_seconds", "Seconds until the next scheduled hook fires.").add(scheduler["next_fire_in"])
+        hooks = self.bot.get_cog("EventHooks")
+        if hooks is None:
+            return
+        for key in ("total_emissions", "total_executions", "total_failures", "queue_full_count", "worker_restarts"):
+            name = key.replace("total_", "")
+            r.counter(f"zdbf_event_hooks_{name}_total", f"Event hook {name.replace('_', ' ')}.").add(hooks.metrics.get(key, 0))
+        queue = getattr(hooks, "_hook_queue", None)
+        if queue is not None:
+            r.gauge("zdbf_event_hooks_queue_depth", "Hook emissions waiting for the worker.").add(queue.qsize())
+
+    def _collect_shards(self, r: MetricsRegistry):
+        for shard_id, info in (self.bot.shards or {}).items():
+            r.gauge("zdbf_gateway_latency_seconds", "Heartbeat latency reported by discord.py.").add(
+                info.latency if info.latency == info.latency else None, shard=str(shard_id))
+        monitor = self.bot.get_cog("ShardMonitor")
+        if monitor is None:
+            return
+        threshold = getattr(monitor, "alert_threshold", 3)
+        for shard_id, m in list(monitor.metrics.items()):
+            shard = str(shard_id)
+            r.gauge("zdbf_shard_latency_p95_seconds", "p95 heartbeat latency over the in-memory window.").add(m.latency.percentile(0.95), shard=shard)
+            r.counter("zdbf_shard_messages_total", "Messages processed by the shard.").add(m.messages_processed, shard=shard)
+            r.counter("zdbf_shard_commands_total", "Commands executed on the shard.").add(m.commands_executed, shard=shard)
+            r.counter("zdbf_shard_errors_total", "Errors recorded for the shard.").add(m.error_count, shard=shard)
+            r.counter("zdbf_shard_connects_total", "Gateway connects.").add(m.connect_count, shard=shard)
+            r.counter("zdbf_shard_disconnects_total", "Gateway disconnects.").add(m.disconnect_count, shard=shard)
+            r.counter("zdbf_shard_reconnects_total", "Gateway resumes/reconnects.").add(m.reconnect_count, shard=shard)
+            r.gauge("zdbf_shard_events_per_second", "Events per second over the last minute.").add(round(m.all_events.per_second(), 3), shard=shard)
+            r.gauge("zdbf_shard_healthy", "1 when the shard passes its health check.").add(int(m.is_healthy(threshold)[0]), shard=shard)
+
+    def _collect_ipc(self, r: MetricsRegistry):
+        manager = self.bot.get_cog("ShardManager")
+        if manager is None:
+            return
+        r.counter("zdbf_bus_published_total", "Invalidation bus messages published.").add(manager.bus_stats.get("published", 0))
+        r.counter("zdbf_bus_received_total", "Invalidation bus messages received.").add(manager.bus_stats.get("received", 0))
+        links: Dict[str, dict] = {}
+        if manager.ipc_server is not None:
+            links = manager.ipc_server.link_stats()
+        elif manager.ipc_client is not None and manager.ipc_client._conn is not None:
+            links = {manager.ipc_client.server_cluster or "server": manager.ipc_client._conn.stats()}
+        r.gauge("zdbf_ipc_links", "Connected IPC links.").add(len(links))
+        for peer, stats in links.items():
+            r.gauge("zdbf_ipc_queue_depth", "Frames queued on the link.").add(stats["queue_depth"], peer=peer)
+            r.counter("zdbf_ipc_dropped_total", "Frames dropped by the slow-consumer policy.").add(stats["dropped"], peer=peer)
+            r.counter("zdbf_ipc_messages_sent_total", "Messages sent on the link.").add(stats["messages_sent"], peer=peer)
+            r.counter("zdbf_ipc_messages_received_total", "Messages received on the link.").add(stats["messages_received"], peer=peer)
+            r.counter("zdbf_ipc_bytes_sent_total", "Bytes sent on the link.").add(stats["bytes_sent"], peer=peer)
+            r.counter("zdbf_ipc_bytes_received_total", "Bytes received on the link.").add(stats["bytes_received"], peer=peer)
+            if stats.get("rtt_ms") is not None:
+                r.gauge("zdbf_ipc_rtt_seconds", "Smoothed round-trip time.").add(stats["rtt_ms"] / 1000, peer=peer)
+
+    def _collect_diagnostics(self, r: MetricsRegistry):
+        diag = self.bot.get_cog("FrameworkDiagnostics")
+        if diag is None:
+            return
+        r.gauge("zdbf_event_loop_lag_seconds", "Average event-loop lag over the last 10s.").add(diag.health_metrics.get("event_loop_lag_ms", 0) / 1000)
+        r.gauge("zdbf_diagnostics_write_failures", "Consecutive diagnostics write failures.").add(diag.health_metrics.get("consecutive_write_failures", 0))
+        lag = getattr(diag, "lag_histogram", None)
+        if lag is not None and lag.total:
+            r.histogram("zdbf_event_loop_lag_probe_seconds", "Event-loop lag per sampler probe.").add_histogram(
+                lag.BOUNDS, lag.counts, lag.sum_ms, scale=0.001)
+        slow = getattr(diag, "slow_callbacks", None)
+        if slow is not None:
+            r.counter("zdbf_slow_callbacks_total", "Callbacks that blocked the loop past FW_SLOW_CALLBACK_MS.").add(slow.total)
+
+    def _collect_live_monitor(self, r: MetricsRegistry):
+        monitor = self.bot.get_cog("LiveMonitor")
+        if monitor is None:
+            return
+        r.gauge("zdbf_live_monitor_enabled", "1 while the dashboard push loop is running.").add(int(bool(monitor.is_enabled)))
+        r.gauge("zdbf_live_monitor_send_failures", "Consecutive failed dashboard pushes.").add(monitor.send_failures)
+        if monitor.last_send_success is not None:
+            r.gauge("zdbf_live_monitor_last_success_timestamp_seconds", "Unix time of the last successful push.").add(monitor.last_send_success.timestamp())
+
+    @commands.hybrid_command(name="metricsexporter", help="Show Prometheus metrics exporter status (Bot Owner Only)")
+    @commands.is_owner()
+    async def metrics_exporter_command(self, ctx):
+        running = self._runner is not None
+        embed = discord.Embed(
+            title="📈 Metrics Exporter",
+            color=0x00ff00 if running else 0x808080,
+            timestamp=discord.utils.utcnow()
+        )
+        if running:
+            age = f"{time.time() - self._last_render:.0f}s ago" if self._last_render else "pending"
+            embed.description = f"Serving `http://{self.host}:{self.port}/metrics`"
+            embed.add_field(name="Snapshot", value=f"```{self._series} series\n{len(self._payload) / 1024:.1f} KB\nrendered {age} in {self._render_ms:.1f}ms```", inline=True)
+            embed.add_field(name="Scrapes", value=f"```{self._scrapes}```", inline=True)
+            embed.add_field(name="Interval", value=f"```{self.refresh_snapshot.seconds:g}s```", inline=True)
+        elif not self.port:
+            embed.description = "Disabled — set `METRICS_EXPORTER_PORT` in `.env` and reload the cog."
+        else:
+            embed.description = f"Not running — check the logs (aiohttp installed: {_AIOHTTP_OK})."
+        embed.set_footer(text="Framework Metrics Exporter")
+        await ctx.send(embed=embed, ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(MetricsExporter(bot))
+    logger.info("Metrics Exporter cog loaded successfully")
@@ -2,6 +2,10 @@
 Plugin Registry Cog
 Tracks metadata about loaded extensions and their provided features
 Enables dependency resolution, conflict detection, and auto-documentation
+
+The dependency graph (forward and reverse edges), the conflict index and the
+strongly connected components are maintained on register/unregister, and each
+plugin's validation status is cached until a change touches it.
 """
 
 from discord.ext import commands
@@ -85,11 +89,12 @@ class PluginListView(discord.ui.View):
             icons = []
             if metadata.scan_errors:
                 icons.append("⚠️")
-            if not self._cog.check_dependencies(name)[0]:
+            plugin_status = self._cog.validation_status(name) or {}
+            if not plugin_status.get("deps_ok", False):
                 icons.append("❌")
-            if self._cog.detect_conflicts(name)[0]:
+            if plugin_status.get("has_conflicts"):
                 icons.append("⚠️")
-            if self._cog._detect_circular_dependencies(name)[0]:
+            if plugin_status.get("has_cycle"):
                 icons.append("🔄")
             status = " ".join(icons) if icons else "✅"
             cmds = f"Commands: {len(metadata.commands)}" if metadata.commands else "No commands"
@@ -130,6 +135,17 @@ class PluginRegistry(commands.Cog):
         self.alert_channel_id = None
         self._save_failure_count: int = 0
 
+        # Dependency graph: reverse edges and the conflict index are keyed by the
+        # referenced name, registered or not, so a late registration can find
+        # the plugins it affects.
+        self._dependents: Dict[str, Set[str]] = {}
+        self._conflict_index: Dict[str, Set[str]] = {}
+        self._cycles: Dict[str, List[str]] = {}
+        self._status_cache: Dict[str, Dict[str, Any]] = {}
+        self._graph_version = 0
+        self._status_hits = 0
+        self._status_misses = 0
+
         self.registry_file.parent.mkdir(parents=True, exist_ok=True)
 
         # Load persisted config (alert channel + enforcement states)
@@ -150,6 +166,9 @@ class PluginRegistry(commands.Cog):
         bot.detect_conflicts = self.detect_conflicts
         bot.get_all_plugins = self.get_all_plugins
         bot.validate_plugin_load = self.validate_plugin_load
+        bot.get_plugin_status = self.validation_status
+        bot.get_plugin_dependents = self.get_dependents
+        bot.plugin_graph_stats = self.graph_stats
         
         logger.info("Plugin Registry: System initialized")
     
@@ -173,6 +192,7 @@ class PluginRegistry(commands.Cog):
         
         # Clear registry to remove stale data from deleted extensions
         self.registry.clear()
+        self._reset_graph()
         logger.info("Plugin Registry: Cleared stale registry data")
         
         scan_tasks = []
@@ -215,29 +235,190 @@ class PluginRegistry(commands.Cog):
         else:
             return True
     
-    def _detect_circular_dependencies(self, name: str, visited: Set[str] = None, path: List[str] = None) -> Tuple[bool, Optional[List[str]]]:
-        if visited is None:
-            visited = set()
-        if path is None:
-            path = []
-        
-        if name in visited:
-            cycle_start = path.index(name) if name in path else 0
-            return True, path[cycle_start:] + [name]
-        
-        metadata = self.get_plugin_info(name)
-        if not metadata:
-            return False, None
-        
-        visited.add(name)
-        path.append(name)
-        
-        for dep_name in metadata.dependencies.keys():
-            has_cycle, cycle_path = self._detect_circular_dependencies(dep_name, visited.copy(), path.copy())
-            if has_cycle:
-                return True, cycle_path
+    def _reset_graph(self):
+        self._dependents.clear()
+        self._conflict_index.clear()
+        self._cycles.clear()
+        self._status_cache.clear()
+        self._graph_version += 1
+    
+    def _link(self, metadata: PluginMetadata) -> Set[str]:
+        """Add a plugin's edges to the graph; returns the plugins whose status it affects."""
+        name = metadata.name
+        for dep_name in metadata.dependencies:
+            self._dependents.setdefault(dep_name, set()).add(name)
+        for conflict in metadata.conflicts_with:
+            self._conflict_index.setdefault(conflict, set()).add(name)
+        return {name} | self._dependents.get(name, set()) | self._conflict_index.get(name, set()) | set(metadata.conflicts_with)
+    
+    def _unlink(self, metadata: PluginMetadata) -> Set[str]:
+        """Remove a plugin's edges from the graph; returns the plugins whose status it affects."""
+        name = metadata.name
+        for dep_name in metadata.dependencies:
+            dependents = self._dependents.get(dep_name)
+            if dependents is not None:
+                dependents.discard(name)
+                if not dependents:
+                    del self._dependents[dep_name]
+        for conflict in metadata.conflicts_with:
+            declared_by = self._conflict_index.get(conflict)
+            if declared_by is not None:
+                declared_by.discard(name)
+                if not declared_by:
+                    del self._conflict_index[conflict]
+        return {name} | self._dependents.get(name, set()) | self._conflict_index.get(name, set()) | set(metadata.conflicts_with)
+    
+    def _graph_changed(self, affected: Set[str]):
+        """Recompute cycles and drop cached status for every plugin the change touched."""
+        self._graph_version += 1
+        previous = self._cycles
+        self._cycles = self._find_cycles()
+        for name in previous.keys() | self._cycles.keys():
+            if previous.get(name) != self._cycles.get(name):
+                affected.add(name)
+        for name in affected:
+            self._status_cache.pop(name, None)
+    
+    def _find_cycles(self) -> Dict[str, List[str]]:
+        """Tarjan's SCC over registered plugins. Maps every plugin that can reach a
+        cycle to one such cycle, as a path that starts and ends on the same plugin."""
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        component_of: Dict[str, int] = {}
+        component_cycle: List[Optional[List[str]]] = []
+        counter = 0
+        
+        def edges(node: str) -> List[str]:
+            return [dep for dep in self.registry[node].dependencies if dep in self.registry]
+        
+        for root in self.registry:
+            if root in index:
+                continue
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(edges(root)))]
+            while work:
+                node, successors = work[-1]
+                advanced = False
+                for succ in successors:
+                    if succ not in index:
+                        index[succ] = lowlink[succ] = counter
+                        counter += 1
+                        stack.append(succ)
+                        on_stack.add(succ)
+                        work.append((succ, iter(edges(succ))))
+                        advanced = True
+                        break
+                    if succ in on_stack:
+                        lowlink[node] = min(lowlink[node], index[succ])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] != index[node]:
+                    continue
+                members = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    members.append(member)
+                    if member == node:
+                        break
+                # Components are emitted sinks first, so every component this one
+                # depends on already has its reachable cycle resolved.
+                component_id = len(component_cycle)
+                for member in members:
+                    component_of[member] = component_id
+                cycle = self._component_cycle(members, edges)
+                if cycle is None:
+                    for member in members:
+                        for dep in edges(member):
+                            inherited = component_cycle[component_of[dep]]
+                            if inherited is not None:
+                                cycle = inherited
+                                break
+                        if cycle is not None:
+                            break
+                component_cycle.append(cycle)
         
-        return False, None
+        return {
+            name: component_cycle[component_id]
+            for name, component_id in component_of.items()
+            if component_cycle[component_id] is not None
+        }
+    
+    @staticmethod
+    def _component_cycle(members: List[str], edges) -> Optional[List[str]]:
+        start = members[-1]
+        if len(members) == 1:
+            return [start, start] if start in edges(start) else None
+        # Shortest path back to the start inside the component
+        inside = set(members)
+        parents: Dict[str, Optional[str]] = {start: None}
+        queue = [start]
+        for node in queue:
+            for dep in edges(node):
+                if dep == start:
+                    path = [node]
+                    while parents[path[-1]] is not None:
+                        path.append(parents[path[-1]])
+                    path.reverse()
+                    return path + [start]
+                if dep in inside and dep not in parents:
+                    parents[dep] = node
+                    queue.append(dep)
+        return None
+    
+    def _detect_circular_dependencies(self, name: str) -> Tuple[bool, Optional[List[str]]]:
+        cycle = self._cycles.get(name)
+        return (True, list(cycle)) if cycle else (False, None)
+    
+    def get_dependents(self, name: str) -> Set[str]:
+        """Registered plugins that declare a dependency on ``name``."""
+        return {dependent for dependent in self._dependents.get(name, ()) if dependent in self.registry}
+    
+    def validation_status(self, name: str) -> Optional[Dict[str, Any]]:
+        """Dependency, conflict and cycle state for a plugin, cached until the graph
+        changes around it. Returns None for unregistered plugins."""
+        if name not in self.registry:
+            return None
+        status = self._status_cache.get(name)
+        if status is not None:
+            self._status_hits += 1
+            return status
+        self._status_misses += 1
+        deps_ok, dep_issues = self._check_dependencies_uncached(name)
+        conflicts = self._conflicts_uncached(name)
+        cycle = self._cycles.get(name)
+        status = {
+            "deps_ok": deps_ok,
+            "dep_issues": dep_issues,
+            "has_conflicts": bool(conflicts),
+            "conflicts": conflicts,
+            "has_cycle": cycle is not None,
+            "cycle": list(cycle) if cycle else None,
+        }
+        self._status_cache[name] = status
+        return status
+    
+    def graph_stats(self) -> Dict[str, Any]:
+        lookups = self._status_hits + self._status_misses
+        return {
+            "plugins": len(self.registry),
+            "edges": sum(len(m.dependencies) for m in self.registry.values()),
+            "plugins_in_cycles": len(self._cycles),
+            "graph_version": self._graph_version,
+            "cached_status": len(self._status_cache),
+            "status_hits": self._status_hits,
+            "status_misses": self._status_misses,
+            "status_hit_rate": round(self._status_hits / lookups, 3) if lookups else 0.0,
+        }
     
     async def validate_plugin_load(self, name: str) -> Tuple[bool, List[str]]:
         errors = []
@@ -283,19 +464,24 @@ class PluginRegistry(commands.Cog):
         metadata.dependencies = dependencies or {}
         metadata.conflicts_with = set(conflicts_with or [])
         
-        metadata.load_time = getattr(self.bot, 'extension_load_times', {}).get(name, 0.0)
+        metadata.load_time = getattr(self.bot, 'extension_load_times', {}).get(f"extensions.{name}", 0.0)
         
         if auto_scan:
             full_name = f"extensions.{name}"
             if full_name in self.bot.extensions:
                 await self._auto_scan_extension(metadata, full_name)
         
+        previous = self.registry.get(name)
+        affected = self._unlink(previous) if previous else set()
         self.registry[name] = metadata
+        affected |= self._link(metadata)
+        self._graph_changed(affected)
 
         is_valid, validation_errors = await self.validate_plugin_load(name)
         if validation_errors:
             # Enforcement is blocking — remove the plugin and refuse registration
             del self.registry[name]
+            self._graph_changed(self._unlink(metadata))
             msg = (
                 f"❌ Plugin Registry: '{name}' refused — enforcement blocked:\n"
                 + "\n".join(f"- {e}" for e in validation_errors)
@@ -368,7 +554,8 @@ class PluginRegistry(commands.Cog):
     
     def unregister_plugin(self, name: str) -> bool:
         if name in self.registry:
-            del self.registry[name]
+            metadata = self.registry.pop(name)
+            self._graph_changed(self._unlink(metadata))
             logger.info(f"Plugin unregistered: {name}")
             return True
         return False
@@ -377,9 +564,13 @@ class PluginRegistry(commands.Cog):
         return self.registry.get(name)
     
     def check_dependencies(self, name: str) -> Tuple[bool, List[str]]:
-        metadata = self.get_plugin_info(name)
-        if not metadata:
+        status = self.validation_status(name)
+        if status is None:
             return False, ["Plugin not registered"]
+        return status["deps_ok"], list(status["dep_issues"])
+    
+    def _check_dependencies_uncached(self, name: str) -> Tuple[bool, List[str]]:
+        metadata = self.registry[name]
         
         missing = []
         version_mismatches = []
@@ -405,21 +596,19 @@ class PluginRegistry(commands.Cog):
         return len(all_issues) == 0, all_issues
     
     def detect_conflicts(self, name: str) -> Tuple[bool, List[str]]:
-        metadata = self.get_plugin_info(name)
-        if not metadata:
+        status = self.validation_status(name)
+        if status is None:
             return False, []
-        
-        conflicts = []
-        
-        for conflict in metadata.conflicts_with:
-            if conflict in self.registry:
-                conflicts.append(conflict)
-        
-        for other_name, other_meta in self.registry.items():
-            if other_name != name and name in other_meta.conflicts_with:
-                conflicts.append(other_name)
-        
-        return len(conflicts) > 0, conflicts
+        return status["has_conflicts"], list(status["conflicts"])
+    
+    def _conflicts_uncached(self, name: str) -> List[str]:
+        metadata = self.registry[name]
+        conflicts = sorted(c for c in metadata.conflicts_with if c in self.registry)
+        conflicts += sorted(
+            other for other in self._conflict_index.get(name, ())
+            if other != name and other in self.registry and other not in metadata.conflicts_with
+        )
+        return conflicts
     
     def get_all_plugins(self) -> Dict[str, PluginMetadata]:
         return self.registry.copy()
@@ -465,6 +654,21 @@ class PluginRegistry(commands.Cog):
             await self.bot.config.file_handler.atomic_write_json(str(self._config_file), cfg)
         except Exception as e:
             logger.error(f"Plugin Registry: Failed to save config: {e}")
+            return
+        
+        if hasattr(self.bot, 'publish_invalidation'):
+            await self.bot.publish_invalidation("plugin_registry", config=cfg)
+    
+    @commands.Cog.listener()
+    async def on_cluster_invalidation(self, channel: str, payload: dict):
+        """Pick up enforcement / alert settings changed on another cluster"""
+        if channel != "plugin_registry" or not isinstance(payload.get("config"), dict):
+            return
+        cfg = payload["config"]
+        self.alert_channel_id = cfg.get("alert_channel_id", self.alert_channel_id)
+        self.enforce_dependencies = cfg.get("enforce_dependencies", self.enforce_dependencies)
+        self.enforce_conflicts = cfg.get("enforce_conflicts", self.enforce_conflicts)
+        logger.debug("Plugin Registry: Config updated by another cluster")
 
     async def _send_alert(self, message: str):
         if not self.alert_channel_id:
@@ -697,6 +901,12 @@ class PluginRegistry(commands.Cog):
             delattr(self.bot, 'get_all_plugins')
         if hasattr(self.bot, 'validate_plugin_load'):
             delattr(self.bot, 'validate_plugin_load')
+        if hasattr(self.bot, 'get_plugin_status'):
+            delattr(self.bot, 'get_plugin_status')
+        if hasattr(self.bot, 'get_plugin_dependents'):
+            delattr(self.bot, 'get_plugin_dependents')
+        if hasattr(self.bot, 'plugin_graph_stats'):
+            delattr(self.bot, 'plugin_graph_stats')
         
         logger.info("Plugin Registry: Cog unloaded")
 
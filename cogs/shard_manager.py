@@ -46,7 +46,7 @@ import asyncio
 import os
 import json
 import time
-import hashlib
+import itertools
 import struct
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Callable
@@ -67,6 +67,40 @@ def is_bot_owner():
     return commands.check(predicate)
 
 
+try:
+    import msgpack
+    _MSGPACK_OK = True
+except ImportError:
+    msgpack = None
+    _MSGPACK_OK = False
+
+
+IPC_PROTOCOL_VERSION = 2
+IPC_FLAG_MSGPACK = 0x01
+IPC_MAX_MESSAGE = 1_000_000
+IPC_MAX_BATCH = 64
+IPC_QUEUE_MAX = int(os.getenv("SHARD_IPC_QUEUE_MAX", 2000))
+IPC_SLOW_POLICY = os.getenv("SHARD_IPC_SLOW_POLICY", "drop").lower()
+IPC_DRAIN_TIMEOUT = float(os.getenv("SHARD_IPC_DRAIN_TIMEOUT", 15))
+IPC_PING_INTERVAL = 15
+LAUNCHER_NAME = os.getenv("SHARD_LAUNCHER_NAME", "launcher")
+
+# version, flags, nonce, reply_to, timestamp — followed by op/source/target and the body
+_IPC_HEADER = struct.Struct('>BBQQd')
+_NONCE_PREFIX = int.from_bytes(os.urandom(4), 'big') << 32
+_nonce_counter = itertools.count(1)
+
+
+def _next_nonce() -> int:
+    """Process-unique 64-bit nonce: random 32-bit prefix + monotonic counter"""
+    return _NONCE_PREFIX | (next(_nonce_counter) & 0xFFFFFFFF)
+
+
+def _pack_str(value: str) -> bytes:
+    raw = value.encode('utf-8')[:255]
+    return bytes((len(raw),)) + raw
+
+
 class IPCMessage:
     """Represents an IPC message between shard clusters"""
     
@@ -76,23 +110,56 @@ class IPCMessage:
         self.source = source
         self.target = target
         self.timestamp = time.time()
-        self.nonce = hashlib.md5(f"{time.time()}{op}".encode()).hexdigest()[:12]
+        self.nonce = _next_nonce()
+        self.reply_to = 0
     
     def to_bytes(self) -> bytes:
-        """Serialize to bytes for wire transport"""
-        payload = json.dumps({
-            'op': self.op,
-            'data': self.data,
-            'source': self.source,
-            'target': self.target,
-            'timestamp': self.timestamp,
-            'nonce': self.nonce
-        }).encode('utf-8')
-        return struct.pack('>I', len(payload)) + payload
+        """Serialize to a length-prefixed binary frame for wire transport"""
+        if _MSGPACK_OK:
+            flags = IPC_FLAG_MSGPACK
+            body = msgpack.packb(self.data, use_bin_type=True, default=str)
+        else:
+            flags = 0
+            body = json.dumps(self.data, separators=(',', ':'), default=str).encode('utf-8')
+        frame = b''.join((
+            _IPC_HEADER.pack(IPC_PROTOCOL_VERSION, flags, self.nonce, self.reply_to, self.timestamp),
+            _pack_str(self.op), _pack_str(self.source), _pack_str(self.target),
+            body
+        ))
+        return struct.pack('>I', len(frame)) + frame
     
     @classmethod
     def from_bytes(cls, data: bytes) -> 'IPCMessage':
-        """Deserialize from bytes"""
+        """Deserialize a frame body (without the length prefix)"""
+        if data[:1] == b'{':
+            return cls._from_legacy_json(data)
+        
+        version, flags, nonce, reply_to, timestamp = _IPC_HEADER.unpack_from(data, 0)
+        if version != IPC_PROTOCOL_VERSION:
+            raise ValueError(f"Unsupported IPC protocol version {version}")
+        pos = _IPC_HEADER.size
+        fields = []
+        for _ in range(3):
+            n = data[pos]
+            fields.append(data[pos + 1:pos + 1 + n].decode('utf-8'))
+            pos += 1 + n
+        body = data[pos:]
+        if flags & IPC_FLAG_MSGPACK:
+            if not _MSGPACK_OK:
+                raise ValueError("Received msgpack IPC frame but msgpack is not installed")
+            payload = msgpack.unpackb(body, raw=False)
+        else:
+            payload = json.loads(body.decode('utf-8')) if body else {}
+        
+        msg = cls(op=fields[0], data=payload, source=fields[1] or 'unknown', target=fields[2] or 'all')
+        msg.timestamp = timestamp
+        msg.nonce = nonce
+        msg.reply_to = reply_to
+        return msg
+    
+    @classmethod
+    def _from_legacy_json(cls, data: bytes) -> 'IPCMessage':
+        """Decode v1 (JSON) frames so mixed-version clusters can still talk during a rolling deploy"""
         payload = json.loads(data.decode('utf-8'))
         msg = cls(
             op=payload['op'],
@@ -101,13 +168,160 @@ class IPCMessage:
             target=payload.get('target', 'all')
         )
         msg.timestamp = payload.get('timestamp', time.time())
-        msg.nonce = payload.get('nonce', '')
+        legacy = str(payload.get('nonce', ''))
+        msg.nonce = int(legacy, 16) if legacy and all(c in '0123456789abcdef' for c in legacy) else _next_nonce()
         return msg
     
     def __repr__(self):
         return f"IPCMessage(op={self.op}, source={self.source}, target={self.target})"
 
 
+async def _read_frame(reader: asyncio.StreamReader, idle_timeout: float = 120.0) -> Optional[bytes]:
+    """Read one length-prefixed frame, or None on EOF/timeout/oversize"""
+    try:
+        length_bytes = await asyncio.wait_for(reader.readexactly(4), timeout=idle_timeout)
+        length = struct.unpack('>I', length_bytes)[0]
+        if length > IPC_MAX_MESSAGE:
+            logger.warning("[IPC] Message too large, dropping connection")
+            return None
+        return await asyncio.wait_for(reader.readexactly(length), timeout=30.0)
+    except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+        return None
+
+
+class IPCConnection:
+    """
+    Outbound side of one IPC link.
+    
+    Frames are queued without awaiting and a single writer task coalesces whatever
+    is queued into one write + drain(), so senders never block on the socket.
+    The queue is bounded: when a slow consumer fills it, the link either drops its
+    oldest queued frames (``drop``) or is disconnected (``disconnect``). A drain that
+    stalls past ``IPC_DRAIN_TIMEOUT`` always disconnects.
+    """
+    
+    def __init__(self, name: str, writer: asyncio.StreamWriter,
+                 max_queue: int = IPC_QUEUE_MAX, policy: str = IPC_SLOW_POLICY):
+        self.name = name
+        self.writer = writer
+        self.policy = policy if policy in ("drop", "disconnect") else "drop"
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_queue))
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+        self.close_reason: Optional[str] = None
+        self.created_at = time.time()
+        self.messages_sent = 0
+        self.bytes_sent = 0
+        self.batches_sent = 0
+        self.messages_received = 0
+        self.bytes_received = 0
+        self.dropped = 0
+        self.peak_queue = 0
+        self.rtt: Optional[float] = None
+        self.rtt_updated: float = 0.0
+        self._window: deque = deque(maxlen=1024)  # (timestamp, bytes, messages) per written batch
+    
+    def start(self):
+        self._task = asyncio.create_task(self._writer_loop())
+    
+    def send(self, frame: bytes) -> bool:
+        if self.closed:
+            return False
+        try:
+            self._queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            if self.policy == "disconnect":
+                self._fail("outbound queue full")
+                return False
+            try:
+                self._queue.get_nowait()
+                self.dropped += 1
+            except asyncio.QueueEmpty:
+                pass
+            self._queue.put_nowait(frame)
+            if self.dropped % 100 == 1:
+                logger.warning(f"[IPC] Link {self.name} is slow — dropped {self.dropped} frame(s) so far")
+        depth = self._queue.qsize()
+        if depth > self.peak_queue:
+            self.peak_queue = depth
+        return True
+    
+    def record_received(self, size: int):
+        self.messages_received += 1
+        self.bytes_received += size
+    
+    def record_rtt(self, sent_at: float):
+        rtt = max(0.0, time.time() - sent_at)
+        self.rtt = rtt if self.rtt is None else self.rtt * 0.7 + rtt * 0.3
+        self.rtt_updated = time.time()
+    
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+    
+    def stats(self, window: float = 10.0) -> dict:
+        """Per-link metrics; throughput is averaged over the last ``window`` seconds"""
+        cutoff = time.time() - window
+        recent = [w for w in self._window if w[0] >= cutoff]
+        span = min(window, max(1.0, time.time() - self.created_at))
+        return {
+            'queue_depth': self.queue_depth,
+            'queue_max': self._queue.maxsize,
+            'peak_queue': self.peak_queue,
+            'dropped': self.dropped,
+            'messages_sent': self.messages_sent,
+            'bytes_sent': self.bytes_sent,
+            'messages_received': self.messages_received,
+            'bytes_received': self.bytes_received,
+            'msgs_per_sec': round(sum(w[2] for w in recent) / span, 2),
+            'bytes_per_sec': round(sum(w[1] for w in recent) / span, 1),
+            'avg_batch': round(self.messages_sent / self.batches_sent, 2) if self.batches_sent else 0,
+            'rtt_ms': round(self.rtt * 1000, 2) if self.rtt is not None else None,
+            'policy': self.policy,
+        }
+    
+    def _fail(self, reason: str):
+        if self.closed:
+            return
+        self.close_reason = reason
+        logger.warning(f"[IPC] Disconnecting slow link {self.name}: {reason}")
+        asyncio.ensure_future(self.close())
+    
+    async def _writer_loop(self):
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                while len(batch) < IPC_MAX_BATCH and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                data = b''.join(batch)
+                self.writer.write(data)
+                try:
+                    await asyncio.wait_for(self.writer.drain(), timeout=IPC_DRAIN_TIMEOUT)
+                except asyncio.TimeoutError:
+                    self._fail(f"drain stalled for {IPC_DRAIN_TIMEOUT:g}s")
+                    return
+                self.messages_sent += len(batch)
+                self.bytes_sent += len(data)
+                self.batches_sent += 1
+                self._window.append((time.time(), len(data), len(batch)))
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.debug(f"[IPC] Writer for {self.name} stopped: {e}")
+        finally:
+            self.closed = True
+    
+    async def close(self):
+        self.closed = True
+        if self._task and not self._task.done() and self._task is not asyncio.current_task():
+            self._task.cancel()
+        try:
+            self.writer.close()
+            await self.writer.wait_closed()
+        except Exception:
+            pass
+
+
 class IPCServer:
     """
     WebSocket-like IPC server for the primary cluster.
@@ -119,13 +333,16 @@ class IPCServer:
         self.port = port
         self.secret = secret
         self.cluster_name = cluster_name
-        self.clients: Dict[str, asyncio.StreamWriter] = {}
+        self.clients: Dict[str, IPCConnection] = {}
         self.client_info: Dict[str, dict] = {}
         self._server: Optional[asyncio.AbstractServer] = None
         self._handlers: Dict[str, List[Callable]] = defaultdict(list)
         self._running = False
         self._seen_nonces: deque = deque(maxlen=10000)
+        self._seen_set: set = set()
         self._max_nonces = 10000
+        self._dispatch_tasks: set = set()
+        self._ping_task: Optional[asyncio.Task] = None
     
     def on(self, op: str, handler: Callable):
         """Register a handler for an operation"""
@@ -137,18 +354,17 @@ class IPCServer:
             self._handle_client, self.host, self.port
         )
         self._running = True
+        self._ping_task = asyncio.create_task(self._ping_loop())
         logger.info(f"[IPC Server] Started on {self.host}:{self.port}")
     
     async def stop(self):
         """Stop the IPC server"""
         self._running = False
+        if self._ping_task:
+            self._ping_task.cancel()
         
-        for name, writer in list(self.clients.items()):
-            try:
-                writer.close()
-                await writer.wait_closed()
-            except Exception:
-                pass
+        for name, conn in list(self.clients.items()):
+            await conn.close()
         
         self.clients.clear()
         self.client_info.clear()
@@ -159,10 +375,46 @@ class IPCServer:
         
         logger.info("[IPC Server] Stopped")
     
+    async def _ping_loop(self):
+        """Measure per-link RTT; clients echo the timestamp back in a pong"""
+        while self._running:
+            await asyncio.sleep(IPC_PING_INTERVAL)
+            await self.broadcast(IPCMessage('ping', {'ts': time.time()}, self.cluster_name))
+    
+    def link_stats(self) -> Dict[str, dict]:
+        return {name: conn.stats() for name, conn in self.clients.items()}
+    
+    def cluster_names(self) -> set:
+        """Connected peers that run shards (excludes control links such as the launcher)"""
+        return {name for name, info in self.client_info.items() if info.get('role', 'cluster') == 'cluster'}
+    
+    def _is_duplicate(self, nonce: int) -> bool:
+        if nonce in self._seen_set:
+            return True
+        if len(self._seen_nonces) == self._seen_nonces.maxlen:
+            self._seen_set.discard(self._seen_nonces[0])
+        self._seen_nonces.append(nonce)
+        self._seen_set.add(nonce)
+        return False
+    
+    def _dispatch(self, msg: IPCMessage):
+        """Run handlers off the read loop so a slow handler can't stall the link"""
+        for handler in self._handlers.get(msg.op, []):
+            task = asyncio.create_task(self._run_handler(handler, msg))
+            self._dispatch_tasks.add(task)
+            task.add_done_callback(self._dispatch_tasks.discard)
+    
+    async def _run_handler(self, handler: Callable, msg: IPCMessage):
+        try:
+            await handler(msg)
+        except Exception as e:
+            logger.error(f"[IPC Server] Handler error for {msg.op}: {e}")
+    
     async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
         """Handle an incoming client connection"""
         addr = writer.get_extra_info('peername')
         client_name = None
+        conn: Optional[IPCConnection] = None
         
         try:
             raw = await asyncio.wait_for(self._read_message(reader), timeout=10.0)
@@ -181,29 +433,34 @@ class IPCServer:
                 return
             
             client_name = msg.data.get('cluster_name', f'unknown-{addr}')
-            self.clients[client_name] = writer
+            old = self.clients.pop(client_name, None)
+            if old:
+                await old.close()
+            conn = IPCConnection(client_name, writer)
+            conn.start()
+            self.clients[client_name] = conn
             self.client_info[client_name] = {
                 'connected_at': time.time(),
                 'address': str(addr),
                 'shard_ids': msg.data.get('shard_ids', []),
                 'shard_count': msg.data.get('shard_count', 0),
                 'guild_count': msg.data.get('guild_count', 0),
+                'role': msg.data.get('role', 'cluster'),
                 'last_heartbeat': time.time()
             }
             
-            auth_ok = IPCMessage('auth_response', {
+            conn.send(IPCMessage('auth_response', {
                 'success': True,
                 'server_cluster': self.cluster_name,
-                'connected_clients': list(self.clients.keys())
-            }, self.cluster_name)
-            writer.write(auth_ok.to_bytes())
-            await writer.drain()
+                'connected_clients': list(self.cluster_names())
+            }, self.cluster_name).to_bytes())
             
             logger.info(f"[IPC Server] Client authenticated: {client_name} from {addr}")
             
             await self.broadcast(IPCMessage('cluster_join', {
                 'cluster_name': client_name,
-                'shard_ids': msg.data.get('shard_ids', [])
+                'shard_ids': msg.data.get('shard_ids', []),
+                'role': msg.data.get('role', 'cluster')
             }, self.cluster_name), exclude=client_name)
             
             while self._running:
@@ -211,35 +468,37 @@ class IPCServer:
                 if not raw:
                     break
                 
-                msg = IPCMessage.from_bytes(raw)
+                conn.record_received(len(raw) + 4)
+                try:
+                    msg = IPCMessage.from_bytes(raw)
+                except Exception as e:
+                    logger.warning(f"[IPC Server] Undecodable frame from {client_name}: {e}")
+                    continue
                 msg.source = client_name
                 
-                if msg.nonce in self._seen_nonces:
+                if msg.op == 'pong':
+                    conn.record_rtt(msg.data.get('ts', time.time()))
+                    continue
+                
+                if self._is_duplicate(msg.nonce):
                     continue
-                self._seen_nonces.append(msg.nonce)
                 
                 if msg.op == 'heartbeat':
                     if client_name in self.client_info:
                         self.client_info[client_name]['last_heartbeat'] = time.time()
                         self.client_info[client_name]['guild_count'] = msg.data.get('guild_count', 0)
                     
-                    pong = IPCMessage('heartbeat_ack', {'timestamp': time.time()}, self.cluster_name, client_name)
-                    writer.write(pong.to_bytes())
-                    await writer.drain()
+                    conn.send(IPCMessage('heartbeat_ack', {'timestamp': time.time(), 'echo': msg.data.get('timestamp')}, self.cluster_name, client_name).to_bytes())
                     continue
                 
                 if msg.target == 'all':
                     await self.broadcast(msg, exclude=client_name)
-                elif msg.target == self.cluster_name:
-                    pass
-                elif msg.target in self.clients:
-                    await self._send_to(msg.target, msg)
+                elif msg.target != self.cluster_name:
+                    if msg.target in self.clients:
+                        await self._send_to(msg.target, msg)
+                    continue
                 
-                for handler in self._handlers.get(msg.op, []):
-                    try:
-                        await handler(msg)
-                    except Exception as e:
-                        logger.error(f"[IPC Server] Handler error for {msg.op}: {e}")
+                self._dispatch(msg)
         
         except asyncio.TimeoutError:
             logger.warning(f"[IPC Server] Auth timeout from {addr}")
@@ -248,7 +507,7 @@ class IPCServer:
         except Exception as e:
             logger.error(f"[IPC Server] Client error: {e}")
         finally:
-            if client_name:
+            if client_name and self.clients.get(client_name) is conn:
                 self.clients.pop(client_name, None)
                 self.client_info.pop(client_name, None)
                 logger.info(f"[IPC Server] Client disconnected: {client_name}")
@@ -257,55 +516,37 @@ class IPCServer:
                     'cluster_name': client_name
                 }, self.cluster_name))
             
-            try:
-                writer.close()
-                await writer.wait_closed()
-            except Exception:
-                pass
+            if conn:
+                await conn.close()
+            else:
+                try:
+                    writer.close()
+                    await writer.wait_closed()
+                except Exception:
+                    pass
     
     async def _read_message(self, reader: asyncio.StreamReader) -> Optional[bytes]:
         """Read a length-prefixed message"""
-        try:
-            length_bytes = await asyncio.wait_for(reader.readexactly(4), timeout=120.0)
-            length = struct.unpack('>I', length_bytes)[0]
-            
-            if length > 1_000_000:
-                logger.warning("[IPC Server] Message too large, dropping")
-                return None
-            
-            data = await asyncio.wait_for(reader.readexactly(length), timeout=30.0)
-            return data
-        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
-            return None
+        return await _read_frame(reader)
     
     async def broadcast(self, msg: IPCMessage, exclude: str = None):
-        """Broadcast message to all connected clients"""
-        data = msg.to_bytes()
-        disconnected = []
-        
-        for name, writer in self.clients.items():
-            if name == exclude:
-                continue
-            try:
-                writer.write(data)
-                await writer.drain()
-            except Exception:
-                disconnected.append(name)
+        """
+        Queue a message for every connected client.
         
-        for name in disconnected:
-            self.clients.pop(name, None)
-            self.client_info.pop(name, None)
+        Encoded once and never awaits a socket: each link's writer task drains its own
+        queue, so one congested cluster can't delay the others. A link that a slow-consumer
+        policy disconnects is cleaned up by its read loop (which also announces cluster_leave).
+        """
+        data = msg.to_bytes()
+        for name, conn in list(self.clients.items()):
+            if name != exclude:
+                conn.send(data)
     
     async def _send_to(self, target: str, msg: IPCMessage):
         """Send message to a specific client"""
-        writer = self.clients.get(target)
-        if writer:
-            try:
-                writer.write(msg.to_bytes())
-                await writer.drain()
-            except Exception:
-                self.clients.pop(target, None)
-                self.client_info.pop(target, None)
+        conn = self.clients.get(target)
+        if conn:
+            conn.send(msg.to_bytes())
 
 
 class IPCClient:
@@ -320,11 +561,17 @@ class IPCClient:
         self.cluster_name = cluster_name
         self._reader: Optional[asyncio.StreamReader] = None
         self._writer: Optional[asyncio.StreamWriter] = None
+        self._conn: Optional[IPCConnection] = None
         self._handlers: Dict[str, List[Callable]] = defaultdict(list)
         self._running = False
         self._connected = False
         self._reconnect_delay = 5
         self._max_reconnect_delay = 120
+        self._dispatch_tasks: set = set()
+        self.guild_count_provider: Optional[Callable[[], int]] = None
+        self.server_cluster: Optional[str] = None
+        self.peers: set = set()
+        self.role = 'cluster'
     
     def on(self, op: str, handler: Callable):
         """Register a handler for an operation"""
@@ -335,6 +582,7 @@ class IPCClient:
         self._running = True
         
         while self._running:
+            heartbeat = None
             try:
                 self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
                 
@@ -343,7 +591,8 @@ class IPCClient:
                     'cluster_name': self.cluster_name,
                     'shard_ids': shard_ids,
                     'shard_count': shard_count,
-                    'guild_count': guild_count
+                    'guild_count': guild_count,
+                    'role': self.role
                 }, self.cluster_name)
                 self._writer.write(auth.to_bytes())
                 await self._writer.drain()
@@ -359,24 +608,47 @@ class IPCClient:
                     await asyncio.sleep(self._reconnect_delay)
                     continue
                 
+                self.server_cluster = response.data.get('server_cluster')
+                self.peers = {c for c in response.data.get('connected_clients', []) if c != self.cluster_name}
+                if self.server_cluster:
+                    self.peers.add(self.server_cluster)
+                
+                self._conn = IPCConnection(self.server_cluster or 'server', self._writer)
+                self._conn.start()
                 self._connected = True
                 self._reconnect_delay = 5
                 logger.info(f"[IPC Client] Connected to IPC server at {self.host}:{self.port}")
                 
-                asyncio.create_task(self._heartbeat_loop(guild_count))
+                heartbeat = asyncio.create_task(self._heartbeat_loop(guild_count))
                 
                 while self._running:
                     raw = await self._read_message()
                     if not raw:
                         break
                     
-                    msg = IPCMessage.from_bytes(raw)
+                    self._conn.record_received(len(raw) + 4)
+                    try:
+                        msg = IPCMessage.from_bytes(raw)
+                    except Exception as e:
+                        logger.warning(f"[IPC Client] Undecodable frame: {e}")
+                        continue
+                    
+                    if msg.op == 'ping':
+                        await self.send(IPCMessage('pong', {'ts': msg.data.get('ts')}, self.cluster_name, msg.source))
+                        continue
+                    if msg.op == 'heartbeat_ack' and msg.data.get('echo'):
+                        self._conn.record_rtt(msg.data['echo'])
+                    
+                    if msg.op == 'cluster_join':
+                        if msg.data.get('role', 'cluster') == 'cluster':
+                            self.peers.add(msg.data.get('cluster_name'))
+                    elif msg.op == 'cluster_leave':
+                        self.peers.discard(msg.data.get('cluster_name'))
                     
                     for handler in self._handlers.get(msg.op, []):
-                        try:
-                            await handler(msg)
-                        except Exception as e:
-                            logger.error(f"[IPC Client] Handler error for {msg.op}: {e}")
+                        task = asyncio.create_task(self._run_handler(handler, msg))
+                        self._dispatch_tasks.add(task)
+                        task.add_done_callback(self._dispatch_tasks.discard)
             
             except (ConnectionRefusedError, OSError) as e:
                 logger.warning(f"[IPC Client] Connection failed: {e} — retrying in {self._reconnect_delay}s")
@@ -384,7 +656,12 @@ class IPCClient:
                 logger.error(f"[IPC Client] Error: {e}")
             finally:
                 self._connected = False
-                if self._writer:
+                if heartbeat:
+                    heartbeat.cancel()
+                if self._conn:
+                    await self._conn.close()
+                    self._conn = None
+                elif self._writer:
                     try:
                         self._writer.close()
                         await self._writer.wait_closed()
@@ -395,41 +672,40 @@ class IPCClient:
                 await asyncio.sleep(self._reconnect_delay)
                 self._reconnect_delay = min(self._reconnect_delay * 2, self._max_reconnect_delay)
     
+    async def _run_handler(self, handler: Callable, msg: IPCMessage):
+        try:
+            await handler(msg)
+        except Exception as e:
+            logger.error(f"[IPC Client] Handler error for {msg.op}: {e}")
+    
     async def send(self, msg: IPCMessage):
-        """Send a message to the IPC server"""
-        if not self._connected or not self._writer:
+        """Queue a message for the IPC server"""
+        if not self._connected or not self._conn:
             return False
-        try:
-            msg.source = self.cluster_name
-            self._writer.write(msg.to_bytes())
-            await self._writer.drain()
-            return True
-        except Exception:
+        msg.source = self.cluster_name
+        if not self._conn.send(msg.to_bytes()):
             self._connected = False
             return False
+        return True
     
     async def _read_message(self) -> Optional[bytes]:
         """Read a length-prefixed message"""
-        try:
-            length_bytes = await asyncio.wait_for(self._reader.readexactly(4), timeout=120.0)
-            length = struct.unpack('>I', length_bytes)[0]
-            if length > 1_000_000:
-                return None
-            data = await asyncio.wait_for(self._reader.readexactly(length), timeout=30.0)
-            return data
-        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
-            return None
+        return await _read_frame(self._reader)
     
     async def _heartbeat_loop(self, guild_count: int):
         """Send periodic heartbeats"""
         while self._running and self._connected:
             try:
+                if self.guild_count_provider:
+                    guild_count = self.guild_count_provider()
                 hb = IPCMessage('heartbeat', {
                     'timestamp': time.time(),
-                    'guild_count': len(self.bot.guilds)
+                    'guild_count': guild_count
                 }, self.cluster_name)
                 await self.send(hb)
                 await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                break
             except Exception:
                 break
     
@@ -437,7 +713,9 @@ class IPCClient:
         """Close the connection"""
         self._running = False
         self._connected = False
-        if self._writer:
+        if self._conn:
+            await self._conn.close()
+        elif self._writer:
             try:
                 self._writer.close()
                 await self._writer.wait_closed()
@@ -445,6 +723,27 @@ class IPCClient:
                 pass
 
 
+class _PendingRPC:
+    """Replies collected for one outstanding ``cluster_rpc`` request"""
+    
+    def __init__(self, expected: set):
+        self.expected = set(expected)
+        self.results: Dict[str, dict] = {}
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        if not self.expected:
+            self.future.set_result(None)
+    
+    def add(self, source: str, data: dict):
+        self.results[source] = data
+        self.expected.discard(source)
+        if not self.expected and not self.future.done():
+            self.future.set_result(None)
+    
+    def cancel(self):
+        if not self.future.done():
+            self.future.cancel()
+
+
 class ShardManager(commands.Cog):
     """
     Multi-Process Shard Management System (Bot Owner Only)
@@ -469,7 +768,22 @@ class ShardManager(commands.Cog):
         self.ipc_client: Optional[IPCClient] = None
         
         self.cluster_stats: Dict[str, dict] = {}
-        self.cross_shard_requests: Dict[str, asyncio.Future] = {}
+        self.cross_shard_requests: Dict[int, _PendingRPC] = {}
+        self._rpc_handlers: Dict[str, Callable] = {}
+        
+        self.register_rpc('stats', lambda payload: self._get_local_stats())
+        self.register_rpc('guild_count', lambda payload: {
+            'guild_count': len(self.bot.guilds),
+            'user_count': len(self.bot.users),
+            'shard_count': self.bot.shard_count
+        })
+        self.register_rpc('eval', lambda payload: self._safe_query(payload.get('query', '')))
+        self.register_rpc('metrics', lambda payload: self._local_metrics())
+        
+        self._metrics_prev: Dict[str, tuple] = {}
+        self._metrics_cache: Optional[dict] = None
+        self._metrics_cache_at = 0.0
+        self.bus_stats = {'published': 0, 'received': 0}
         
         self.data_dir = Path("./data/shard_manager")
         self.data_dir.mkdir(parents=True, exist_ok=True)
@@ -483,12 +797,18 @@ class ShardManager(commands.Cog):
         else:
             await self._start_client()
         
+        if hasattr(getattr(self.bot, 'config', None), 'subscribe'):
+            # Local sets only: applied updates from other clusters must not be re-broadcast
+            self.bot.config.subscribe("", self._on_config_set, local_only=True)
+        
         self.sync_stats.start()
         logger.info("[ShardManager] IPC system started")
     
     def cog_unload(self):
         """Stop IPC system"""
         self.sync_stats.cancel()
+        if hasattr(getattr(self.bot, 'config', None), 'unsubscribe'):
+            self.bot.config.unsubscribe("", self._on_config_set)
         asyncio.create_task(self._shutdown_ipc())
     
     async def _start_server(self):
@@ -499,6 +819,11 @@ class ShardManager(commands.Cog):
         self.ipc_server.on('stats_broadcast', self._handle_stats_broadcast)
         self.ipc_server.on('guild_count_request', self._handle_guild_count_request)
         self.ipc_server.on('eval_request', self._handle_eval_request)
+        self.ipc_server.on('rpc_request', self._handle_rpc_request)
+        self.ipc_server.on('rpc_response', self._handle_rpc_response)
+        self.ipc_server.on('cluster_ready_request', self._handle_ready_request)
+        self.ipc_server.on('cluster_shutdown', self._handle_cluster_shutdown)
+        self.ipc_server.on('bus_publish', self._handle_bus_publish)
         
         await self.ipc_server.start()
     
@@ -509,6 +834,12 @@ class ShardManager(commands.Cog):
         self.ipc_client.on('stats_request', self._handle_stats_request)
         self.ipc_client.on('guild_count_request', self._handle_guild_count_request)
         self.ipc_client.on('stats_broadcast', self._handle_stats_broadcast)
+        self.ipc_client.on('rpc_request', self._handle_rpc_request)
+        self.ipc_client.on('rpc_response', self._handle_rpc_response)
+        self.ipc_client.on('cluster_ready_request', self._handle_ready_request)
+        self.ipc_client.on('cluster_shutdown', self._handle_cluster_shutdown)
+        self.ipc_client.on('bus_publish', self._handle_bus_publish)
+        self.ipc_client.guild_count_provider = lambda: len(self.bot.guilds)
         
         shard_ids = list(self.bot.shards.keys()) if self.bot.shards else [0]
         asyncio.create_task(self.ipc_client.connect(
@@ -519,6 +850,9 @@ class ShardManager(commands.Cog):
     
     async def _shutdown_ipc(self):
         """Shutdown IPC connections"""
+        for pending in self.cross_shard_requests.values():
+            pending.cancel()
+        self.cross_shard_requests.clear()
         if self.ipc_server:
             await self.ipc_server.stop()
         if self.ipc_client:
@@ -556,19 +890,22 @@ class ShardManager(commands.Cog):
         elif self.ipc_client:
             await self.ipc_client.send(response)
     
+    def _safe_query(self, query: str):
+        """Owner safety: only preset queries, never arbitrary code"""
+        safe_queries = {
+            'guild_count': lambda: len(self.bot.guilds),
+            'user_count': lambda: len(self.bot.users),
+            'shard_count': lambda: self.bot.shard_count,
+            'latency': lambda: self.bot.latency,
+            'uptime': lambda: time.time() - self.bot.metrics.start_time if hasattr(self.bot, 'metrics') else 0,
+        }
+        fn = safe_queries.get(query)
+        return fn() if fn else 'unknown_query'
+    
     async def _handle_eval_request(self, msg: IPCMessage):
         """Handle eval request (owner safety: only preset queries)"""
         query = msg.data.get('query', '')
-        
-        safe_queries = {
-            'guild_count': len(self.bot.guilds),
-            'user_count': len(self.bot.users),
-            'shard_count': self.bot.shard_count,
-            'latency': self.bot.latency,
-            'uptime': time.time() - self.bot.metrics.start_time if hasattr(self.bot, 'metrics') else 0,
-        }
-        
-        result = safe_queries.get(query, 'unknown_query')
+        result = self._safe_query(query)
         response = IPCMessage('eval_response', {
             'query': query,
             'result': result
@@ -579,6 +916,270 @@ class ShardManager(commands.Cog):
         elif self.ipc_client:
             await self.ipc_client.send(response)
     
+    async def _send(self, msg: IPCMessage) -> bool:
+        """Route a message through whichever side of the mesh this cluster runs"""
+        if self.ipc_server:
+            if msg.target == 'all':
+                await self.ipc_server.broadcast(msg)
+            else:
+                await self.ipc_server._send_to(msg.target, msg)
+            return True
+        if self.ipc_client:
+            return await self.ipc_client.send(msg)
+        return False
+    
+    def _known_clusters(self) -> set:
+        """Remote clusters currently reachable from this one"""
+        if self.ipc_server:
+            return self.ipc_server.cluster_names()
+        if self.ipc_client and self.ipc_client._connected:
+            return set(self.ipc_client.peers)
+        return set()
+    
+    def register_rpc(self, op: str, handler: Callable):
+        """
+        Expose ``handler(payload) -> result`` (sync or async) to other clusters via ``cluster_rpc``.
+        Results must be msgpack/JSON serializable.
+        """
+        self._rpc_handlers[op] = handler
+    
+    async def cluster_rpc(self, target: str, op: str, payload: Optional[dict] = None, timeout: float = 5.0):
+        """
+        Call ``op`` on another cluster and await its reply.
+        
+        ``target`` is a cluster name, or ``'all'`` to scatter-gather: every reachable cluster
+        (including this one) is asked and a ``{cluster_name: result}`` dict is returned with
+        whatever replied before ``timeout``. A single-target call raises ``asyncio.TimeoutError``
+        if no reply arrives and ``RuntimeError`` if the remote handler failed.
+        """
+        payload = payload or {}
+        
+        if target == self.cluster_name:
+            return await self._invoke_rpc(op, payload)
+        
+        if target == 'all':
+            expected = self._known_clusters()
+        else:
+            expected = {target}
+        
+        msg = IPCMessage('rpc_request', {'op': op, 'payload': payload}, self.cluster_name, target)
+        pending = _PendingRPC(expected)
+        self.cross_shard_requests[msg.nonce] = pending
+        
+        try:
+            sent = bool(expected) and await self._send(msg)
+            if target == 'all':
+                local = asyncio.ensure_future(self._invoke_rpc(op, payload))
+                if sent:
+                    try:
+                        await asyncio.wait_for(asyncio.shield(pending.future), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                results = {name: r['result'] for name, r in pending.results.items() if r.get('ok')}
+                try:
+                    results[self.cluster_name] = await asyncio.wait_for(local, timeout=timeout)
+                except Exception as e:
+                    logger.debug(f"[ShardManager] Local RPC {op} failed: {e}")
+                return results
+            
+            if not sent:
+                raise ConnectionError(f"IPC link to {target} is not available")
+            await asyncio.wait_for(pending.future, timeout=timeout)
+            reply = pending.results.get(target, {})
+            if not reply.get('ok'):
+                raise RuntimeError(reply.get('error', 'remote error'))
+            return reply.get('result')
+        finally:
+            self.cross_shard_requests.pop(msg.nonce, None)
+    
+    async def _invoke_rpc(self, op: str, payload: dict):
+        handler = self._rpc_handlers.get(op)
+        if handler is None:
+            raise KeyError(f"unknown rpc op '{op}'")
+        result = handler(payload)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+    
+    async def _handle_rpc_request(self, msg: IPCMessage):
+        """Run a registered RPC handler and reply to the requester"""
+        try:
+            result = await self._invoke_rpc(msg.data.get('op', ''), msg.data.get('payload') or {})
+            data = {'ok': True, 'result': result}
+        except Exception as e:
+            data = {'ok': False, 'error': str(e)[:200]}
+        
+        reply = IPCMessage('rpc_response', data, self.cluster_name, msg.source)
+        reply.reply_to = msg.nonce
+        await self._send(reply)
+    
+    async def _handle_rpc_response(self, msg: IPCMessage):
+        """Correlate a reply with the pending request through its request id"""
+        pending = self.cross_shard_requests.get(msg.reply_to)
+        if pending:
+            pending.add(msg.source, msg.data)
+    
+    async def publish(self, channel: str, payload: Optional[dict] = None) -> bool:
+        """
+        Publish a cache invalidation to every other cluster.
+        
+        Receivers get it as the ``on_cluster_invalidation(channel, payload)`` event. The publisher
+        is expected to have applied the change locally, so nothing is echoed back to it.
+        Built-in channels: ``prefix`` (guild_id), ``config`` (key, value), ``plugin_registry``.
+        """
+        msg = IPCMessage('bus_publish', {'channel': channel, 'payload': payload or {}}, self.cluster_name, 'all')
+        sent = await self._send(msg)
+        if sent:
+            self.bus_stats['published'] += 1
+        return sent
+    
+    async def _handle_bus_publish(self, msg: IPCMessage):
+        channel = msg.data.get('channel')
+        if not channel:
+            return
+        self.bus_stats['received'] += 1
+        self.bot.dispatch('cluster_invalidation', channel, msg.data.get('payload') or {})
+    
+    async def _on_config_set(self, key: str, value: Any):
+        try:
+            await self.publish('config', {'key': key, 'value': value})
+        except Exception as e:
+            logger.warning(f"[ShardManager] Could not publish config change for {key}: {e}")
+    
+    def _local_metrics(self) -> dict:
+        """Raw counters for the cluster-wide ``metrics`` aggregation"""
+        stats = self.bot.metrics.get_stats() if hasattr(self.bot, 'metrics') else {}
+        latencies = []
+        for _, latency in getattr(self.bot, 'latencies', []):
+            if latency == latency and latency != float('inf'):
+                latencies.append(round(latency * 1000, 2))
+        
+        return {
+            'commands_processed': stats.get('commands_processed', 0),
+            'error_count': stats.get('error_count', 0),
+            'messages_seen': stats.get('messages_seen', 0),
+            'uptime': stats.get('uptime', 0),
+            'latencies_ms': latencies,
+            'timestamp': time.time()
+        }
+    
+    @staticmethod
+    def _percentile(values: List[float], q: float) -> float:
+        if not values:
+            return 0.0
+        idx = min(len(values) - 1, max(0, int(round(q * (len(values) - 1)))))
+        return values[idx]
+    
+    async def cluster_metrics(self, max_age: float = 10.0, timeout: float = 2.0) -> dict:
+        """
+        Cluster-wide metrics gathered with a scatter-gather ``metrics`` RPC.
+        
+        Rates are computed against the previous sample from the same cluster (lifetime average
+        on the first sample). The result is cached for ``max_age`` seconds so dashboards that
+        poll often don't turn into an RPC per request.
+        """
+        now = time.time()
+        if self._metrics_cache and now - self._metrics_cache_at < max_age:
+            return self._metrics_cache
+        
+        results = await self.cluster_rpc('all', 'metrics', timeout=timeout)
+        
+        clusters: Dict[str, dict] = {}
+        latencies: List[float] = []
+        totals = {
+            'commands_processed': 0,
+            'error_count': 0,
+            'messages_seen': 0,
+            'commands_per_sec': 0.0,
+            'errors_per_sec': 0.0
+        }
+        
+        for name, m in results.items():
+            if not isinstance(m, dict):
+                continue
+            ts = m.get('timestamp', now)
+            commands_done = m.get('commands_processed', 0)
+            errors = m.get('error_count', 0)
+            
+            prev = self._metrics_prev.get(name)
+            if prev and ts > prev[0] and commands_done >= prev[1]:
+                span = ts - prev[0]
+                cps = (commands_done - prev[1]) / span
+                eps = (errors - prev[2]) / span
+            else:
+                span = max(1.0, m.get('uptime', 0))
+                cps = commands_done / span
+                eps = errors / span
+            self._metrics_prev[name] = (ts, commands_done, errors)
+            
+            cluster_lat = sorted(m.get('latencies_ms', []))
+            latencies.extend(cluster_lat)
+            clusters[name] = {
+                'commands_processed': commands_done,
+                'error_count': errors,
+                'messages_seen': m.get('messages_seen', 0),
+                'commands_per_sec': round(cps, 3),
+                'errors_per_sec': round(eps, 3),
+                'latency_p50': self._percentile(cluster_lat, 0.5),
+                'latency_max': cluster_lat[-1] if cluster_lat else 0.0
+            }
+            
+            totals['commands_processed'] += commands_done
+            totals['error_count'] += errors
+            totals['messages_seen'] += m.get('messages_seen', 0)
+            totals['commands_per_sec'] += cps
+            totals['errors_per_sec'] += eps
+        
+        for name in list(self._metrics_prev):
+            if name not in results:
+                del self._metrics_prev[name]
+        
+        latencies.sort()
+        totals.update({
+            'commands_per_sec': round(totals['commands_per_sec'], 3),
+            'errors_per_sec': round(totals['errors_per_sec'], 3),
+            'latency_p50': self._percentile(latencies, 0.5),
+            'latency_p95': self._percentile(latencies, 0.95),
+            'latency_p99': self._percentile(latencies, 0.99),
+            'latency_max': latencies[-1] if latencies else 0.0,
+            'shards_reporting': len(latencies)
+        })
+        
+        self._metrics_cache = {
+            'clusters': clusters,
+            'totals': totals,
+            'cluster_count': len(clusters),
+            'timestamp': now
+        }
+        self._metrics_cache_at = now
+        return self._metrics_cache
+    
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """Tell the launcher (and peers) that this cluster's shards are up"""
+        await self._announce_ready('all')
+    
+    async def _announce_ready(self, target: str):
+        shard_ids = list(self.bot.shards.keys()) if self.bot.shards else [0]
+        await self._send(IPCMessage('cluster_ready', {
+            'cluster_name': self.cluster_name,
+            'shard_ids': shard_ids,
+            'guild_count': len(self.bot.guilds)
+        }, self.cluster_name, target))
+    
+    async def _handle_ready_request(self, msg: IPCMessage):
+        """Answer a readiness probe (the launcher may have missed the on_ready broadcast)"""
+        if self.bot.is_ready():
+            await self._announce_ready(msg.source)
+    
+    async def _handle_cluster_shutdown(self, msg: IPCMessage):
+        """Graceful stop requested by the launcher during a rolling restart"""
+        if msg.source != LAUNCHER_NAME:
+            logger.warning(f"[ShardManager] Ignoring cluster_shutdown from {msg.source}")
+            return
+        logger.info(f"[ShardManager] Shutdown requested by {msg.source} ({msg.data.get('reason', 'no reason')})")
+        asyncio.create_task(self.bot.close())
+    
     def _get_local_stats(self) -> dict:
         """Get stats for this cluster"""
         shard_ids = list(self.bot.shards.keys()) if self.bot.shards else [0]
@@ -628,6 +1229,17 @@ class ShardManager(commands.Cog):
     @commands.cooldown(1, 10, commands.BucketType.user)
     async def clusters_cmd(self, ctx):
         """Display all connected clusters"""
+        await ctx.defer()
+        
+        # Pull fresh stats instead of relying on the last periodic broadcast
+        try:
+            fresh = await self.cluster_rpc('all', 'stats', timeout=2.0)
+            now = time.time()
+            for name, stats in fresh.items():
+                if isinstance(stats, dict):
+                    self.cluster_stats[name] = {**stats, 'last_update': now}
+        except Exception as e:
+            logger.debug(f"[ShardManager] Live stats RPC failed: {e}")
         
         embed = discord.Embed(
             title="🌐 Shard Cluster Overview",
@@ -655,6 +1267,8 @@ class ShardManager(commands.Cog):
         
         if self.ipc_server:
             for name, info in self.ipc_server.client_info.items():
+                if info.get('role', 'cluster') != 'cluster':
+                    continue
                 time_ago = time.time() - info.get('last_heartbeat', 0)
                 status = "🟢" if time_ago < 60 else ("🟡" if time_ago < 180 else "🔴")
                 
@@ -723,6 +1337,24 @@ class ShardManager(commands.Cog):
             inline=False
         )
         
+        try:
+            agg = await self.cluster_metrics()
+            t = agg['totals']
+            embed.add_field(
+                name="📈 Cluster-wide Metrics",
+                value=(
+                    f"```\n"
+                    f"Commands: {t['commands_processed']:,} ({t['commands_per_sec']:.2f}/s)\n"
+                    f"Errors:   {t['error_count']:,} ({t['errors_per_sec']:.2f}/s)\n"
+                    f"Latency:  p50 {t['latency_p50']:.0f}ms • p95 {t['latency_p95']:.0f}ms • p99 {t['latency_p99']:.0f}ms\n"
+                    f"Shards:   {t['shards_reporting']} reporting from {agg['cluster_count']} cluster(s)\n"
+                    f"```"
+                ),
+                inline=False
+            )
+        except Exception as e:
+            logger.debug(f"[ShardManager] Cluster metrics unavailable: {e}")
+        
         if self.ipc_server:
             embed.add_field(
                 name="🔌 IPC Server Status",
@@ -764,6 +1396,9 @@ class ShardManager(commands.Cog):
                 f"Host:    {self.ipc_host}\n"
                 f"Port:    {self.ipc_port}\n"
                 f"Secret:  {'*' * len(self.ipc_secret[:4])}{'...' if len(self.ipc_secret) > 4 else ''}\n"
+                f"Wire:    v{IPC_PROTOCOL_VERSION} {'msgpack' if _MSGPACK_OK else 'json'}\n"
+                f"Pending: {len(self.cross_shard_requests)} RPC(s)\n"
+                f"Bus:     {self.bus_stats['published']} published / {self.bus_stats['received']} received\n"
                 f"```"
             ),
             inline=False
@@ -774,6 +1409,15 @@ class ShardManager(commands.Cog):
             for name, info in self.ipc_server.client_info.items():
                 time_ago = time.time() - info.get('last_heartbeat', 0)
                 clients_info.append(f"  {name}: {time_ago:.0f}s ago from {info.get('address', '?')}")
+                conn = self.ipc_server.clients.get(name)
+                if conn:
+                    ls = conn.stats()
+                    rtt = f"{ls['rtt_ms']}ms" if ls['rtt_ms'] is not None else "n/a"
+                    clients_info.append(
+                        f"    q {ls['queue_depth']}/{ls['queue_max']} (peak {ls['peak_queue']}) "
+                        f"• {ls['msgs_per_sec']}/s {ls['bytes_per_sec'] / 1024:.1f}KB/s "
+                        f"• drop {ls['dropped']} • rtt {rtt}"
+                    )
             
             embed.add_field(
                 name=f"📡 Server — {len(self.ipc_server.clients)} client(s)",
@@ -782,9 +1426,17 @@ class ShardManager(commands.Cog):
             )
         
         if self.ipc_client:
+            value = f"Connected: {self.ipc_client._connected}\nTarget:    {self.ipc_host}:{self.ipc_port}"
+            if self.ipc_client._conn:
+                ls = self.ipc_client._conn.stats()
+                value += (
+                    f"\nQueue:     {ls['queue_depth']}/{ls['queue_max']} (peak {ls['peak_queue']}, dropped {ls['dropped']})"
+                    f"\nOut:       {ls['msgs_per_sec']} msg/s, {ls['bytes_per_sec'] / 1024:.1f} KB/s"
+                    f"\nRTT:       {ls['rtt_ms'] if ls['rtt_ms'] is not None else 'n/a'} ms"
+                )
             embed.add_field(
                 name="📡 Client Connection",
-                value=f"```Connected: {self.ipc_client._connected}\nTarget:    {self.ipc_host}:{self.ipc_port}```",
+                value=f"```{value}```",
                 inline=False
             )
         
@@ -824,6 +1476,43 @@ class ShardManager(commands.Cog):
         embed.set_footer(text=f"Bot Owner Only • {ctx.author}")
         await ctx.send(embed=embed)
 
+    
+    @commands.hybrid_command(
+        name="rollingrestart",
+        help="Restart every cluster one at a time via launcher.py (Bot Owner Only)"
+    )
+    @is_bot_owner()
+    @commands.cooldown(1, 60, commands.BucketType.user)
+    async def rolling_restart(self, ctx):
+        """Ask the cluster launcher to restart all clusters one by one"""
+        await ctx.defer()
+        
+        try:
+            result = await self.cluster_rpc(LAUNCHER_NAME, 'rolling_restart', timeout=5.0)
+        except (asyncio.TimeoutError, ConnectionError):
+            await ctx.send(
+                f"❌ Launcher `{LAUNCHER_NAME}` is not reachable over IPC. "
+                f"Rolling restarts need the clusters to be started with `python launcher.py`."
+            )
+            return
+        except RuntimeError as e:
+            await ctx.send(f"❌ Launcher refused: `{e}`")
+            return
+        
+        embed = discord.Embed(
+            title="🔄 Rolling Restart Started",
+            description=(
+                f"```\n"
+                f"Clusters: {', '.join(result.get('order', []))}\n"
+                f"```\n"
+                f"Clients restart first, the IPC server cluster last. Each cluster must report ready "
+                f"before the next one is stopped."
+            ),
+            color=0xffa500,
+            timestamp=discord.utils.utcnow()
+        )
+        embed.set_footer(text=f"Bot Owner Only • {ctx.author}")
+        await ctx.send(embed=embed)
 
 async def setup(bot):
     """Load the ShardManager cog (respects ENABLE_SHARD_MANAGER env var)"""
@@ -47,9 +47,12 @@ import asyncio
 import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-from collections import defaultdict, deque
 import json
+import math
+import bisect
+from array import array
 from pathlib import Path
+import aiosqlite
 
 logger = logging.getLogger('discord.cogs.shard_monitor')
 
@@ -71,13 +74,331 @@ def is_bot_owner():
     return commands.check(predicate)
 
 
+class LatencySeries:
+    """
+    Fixed-size ring buffer of latency samples stored in parallel ``array('d')`` columns.
+    
+    A running sum and a sorted copy of the window are maintained on every push, so
+    avg/min/max/percentiles are O(1) reads instead of a pass over the history.
+    """
+    
+    def __init__(self, capacity: int = 120):
+        self.capacity = capacity
+        self._ts = array('d', bytes(8 * capacity))
+        self._values = array('d', bytes(8 * capacity))
+        self._sorted = array('d')
+        self._head = 0
+        self._count = 0
+        self._sum = 0.0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def push(self, timestamp: float, value: float):
+        if self._count == self.capacity:
+            evicted = self._values[self._head]
+            self._sum -= evicted
+            del self._sorted[bisect.bisect_left(self._sorted, evicted)]
+        else:
+            self._count += 1
+        
+        self._ts[self._head] = timestamp
+        self._values[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        self._sum += value
+        bisect.insort(self._sorted, value)
+    
+    def last(self) -> float:
+        return self._values[(self._head - 1) % self.capacity] if self._count else 0.0
+    
+    def avg(self) -> float:
+        return self._sum / self._count if self._count else 0.0
+    
+    def min(self) -> float:
+        return self._sorted[0] if self._count else 0.0
+    
+    def max(self) -> float:
+        return self._sorted[-1] if self._count else 0.0
+    
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile, ``q`` in [0, 1]"""
+        if not self._count:
+            return 0.0
+        return self._sorted[min(self._count - 1, max(0, int(round(q * (self._count - 1)))))]
+    
+    def items(self) -> List[Tuple[float, float]]:
+        """Samples oldest → newest"""
+        start = (self._head - self._count) % self.capacity
+        return [
+            (self._ts[(start + i) % self.capacity], self._values[(start + i) % self.capacity])
+            for i in range(self._count)
+        ]
+
+
+class LatencyRollups:
+    """
+    Downsampled per-shard latency history (1m / 1h / 1d buckets) in SQLite.
+    
+    Samples are folded into in-memory accumulators; ``flush()`` upserts them additively
+    (count/sum/min/max), so partial buckets can be written at any time and resumed after
+    a restart without double counting.
+    """
+    
+    RESOLUTIONS = (60, 3600, 86400)
+    RETENTION = {60: 3 * 86400, 3600: 90 * 86400, 86400: 730 * 86400}
+    MAX_PENDING_ROWS = 20000
+    
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.conn = None
+        self._acc: Dict[Tuple[int, int], list] = {}
+        self._finished: List[tuple] = []
+        self._last_prune = 0.0
+        self.rows_written = 0
+        self.rows_dropped = 0
+    
+    async def open(self):
+        self.conn = await aiosqlite.connect(str(self.db_path))
+        await self.conn.execute("PRAGMA journal_mode=WAL")
+        await self.conn.execute("PRAGMA synchronous=NORMAL")
+        await self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS latency_rollup (
+                resolution INTEGER NOT NULL,
+                shard_id INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                count INTEGER NOT NULL,
+                sum REAL NOT NULL,
+                min REAL NOT NULL,
+                max REAL NOT NULL,
+                PRIMARY KEY (resolution, shard_id, bucket)
+            ) WITHOUT ROWID
+        """)
+        await self.conn.commit()
+    
+    async def close(self):
+        if self.conn:
+            await self.flush()
+            await self.conn.close()
+            self.conn = None
+    
+    def add(self, shard_id: int, timestamp: float, value: float):
+        if self.conn is None:
+            return  # history unavailable (open failed or closed); don't buffer without bound
+        for res in self.RESOLUTIONS:
+            bucket = int(timestamp // res) * res
+            acc = self._acc.get((res, shard_id))
+            if acc is None or acc[0] != bucket:
+                if acc and acc[1]:
+                    self._finished.append((res, shard_id, *acc))
+                acc = [bucket, 0, 0.0, math.inf, -math.inf]
+                self._acc[(res, shard_id)] = acc
+                self._trim_pending()
+            acc[1] += 1
+            acc[2] += value
+            if value < acc[3]:
+                acc[3] = value
+            if value > acc[4]:
+                acc[4] = value
+    
+    def _trim_pending(self):
+        # Bounded while SQLite keeps failing: the oldest finished buckets go first
+        overflow = len(self._finished) - self.MAX_PENDING_ROWS
+        if overflow > 0:
+            del self._finished[:overflow]
+            self.rows_dropped += overflow
+    
+    def _drain(self) -> List[tuple]:
+        rows, self._finished = self._finished, []
+        for (res, shard_id), acc in self._acc.items():
+            if acc[1]:
+                rows.append((res, shard_id, *acc))
+                acc[1:] = [0, 0.0, math.inf, -math.inf]
+        return rows
+    
+    async def flush(self):
+        if not self.conn:
+            return
+        rows = self._drain()
+        if rows:
+            try:
+                await self._write(rows)
+            except Exception:
+                # Nothing was committed; keep the rows (upserts are additive) for the next flush
+                try:
+                    await self.conn.rollback()
+                except Exception:
+                    pass
+                self._finished[:0] = rows
+                self._trim_pending()
+                raise
+            self.rows_written += len(rows)
+        
+        now = time.time()
+        if now - self._last_prune > 3600:
+            self._last_prune = now
+            for res, keep in self.RETENTION.items():
+                await self.conn.execute(
+                    "DELETE FROM latency_rollup WHERE resolution = ? AND bucket < ?",
+                    (res, int(now - keep))
+                )
+            await self.conn.commit()
+    
+    async def _write(self, rows: List[tuple]):
+        await self.conn.executemany("""
+            INSERT INTO latency_rollup (resolution, shard_id, bucket, count, sum, min, max)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (resolution, shard_id, bucket) DO UPDATE SET
+                count = count + excluded.count,
+                sum = sum + excluded.sum,
+                min = MIN(min, excluded.min),
+                max = MAX(max, excluded.max)
+        """, rows)
+        await self.conn.commit()
+    
+    @classmethod
+    def pick_resolution(cls, span: float) -> int:
+        """Finest resolution that still covers ``span`` seconds"""
+        if span <= 6 * 3600:
+            return 60
+        if span <= 14 * 86400:
+            return 3600
+        return 86400
+    
+    async def query(self, shard_id: int, since: float, until: Optional[float] = None,
+                    resolution: Optional[int] = None) -> List[dict]:
+        """Rollup buckets for one shard, oldest first (latencies in seconds)"""
+        if not self.conn:
+            return []
+        until = until or time.time()
+        resolution = resolution or self.pick_resolution(until - since)
+        await self.flush()
+        
+        async with self.conn.execute("""
+            SELECT bucket, count, sum, min, max FROM latency_rollup
+            WHERE resolution = ? AND shard_id = ? AND bucket >= ? AND bucket <= ?
+            ORDER BY bucket
+        """, (resolution, shard_id, int(since // resolution) * resolution, int(until))) as cur:
+            rows = await cur.fetchall()
+        
+        return [
+            {'bucket': b, 'count': c, 'avg': s / c if c else 0.0, 'min': mn, 'max': mx}
+            for b, c, s, mn, mx in rows
+        ]
+    
+    async def summary(self, shard_id: int, window: float) -> Optional[dict]:
+        """avg/min/max over the last ``window`` seconds, or None without data"""
+        buckets = await self.query(shard_id, time.time() - window)
+        count = sum(b['count'] for b in buckets)
+        if not count:
+            return None
+        return {
+            'avg': sum(b['avg'] * b['count'] for b in buckets) / count,
+            'min': min(b['min'] for b in buckets),
+            'max': max(b['max'] for b in buckets),
+            'samples': count
+        }
+
+
+class SlidingCounter:
+    """
+    Event counts over the last 60 seconds (1s buckets) and last 60 minutes (1m buckets).
+    
+    Buckets are zeroed lazily as the clock moves on and running sums are kept for both
+    windows, so ``add`` and every read are O(1) (at most 60 buckets cleared after idling).
+    Peaks are the busiest completed second and minute seen so far.
+    """
+    
+    __slots__ = ('_sec', '_min', '_sec_at', '_min_at', '_sec_sum', '_min_sum',
+                 'total', 'peak_per_sec', 'peak_per_min', 'peak_sec_at', 'peak_min_at')
+    
+    def __init__(self):
+        now = int(time.monotonic())
+        self._sec = array('I', bytes(4 * 60))
+        self._min = array('I', bytes(4 * 60))
+        self._sec_at = now
+        self._min_at = now // 60
+        self._sec_sum = 0
+        self._min_sum = 0
+        self.total = 0
+        self.peak_per_sec = 0
+        self.peak_per_min = 0
+        self.peak_sec_at: Optional[float] = None
+        self.peak_min_at: Optional[float] = None
+    
+    def _advance(self):
+        sec = int(time.monotonic())
+        if sec <= self._sec_at:
+            return
+        
+        done = self._sec[self._sec_at % 60]
+        if done > self.peak_per_sec:
+            self.peak_per_sec = done
+            self.peak_sec_at = time.time() - (sec - self._sec_at)
+        for i in range(1, min(sec - self._sec_at, 60) + 1):
+            idx = (self._sec_at + i) % 60
+            self._sec_sum -= self._sec[idx]
+            self._sec[idx] = 0
+        self._sec_at = sec
+        
+        minute = sec // 60
+        if minute > self._min_at:
+            done = self._min[self._min_at % 60]
+            if done > self.peak_per_min:
+                self.peak_per_min = done
+                self.peak_min_at = time.time() - (sec - self._min_at * 60)
+            for i in range(1, min(minute - self._min_at, 60) + 1):
+                idx = (self._min_at + i) % 60
+                self._min_sum -= self._min[idx]
+                self._min[idx] = 0
+            self._min_at = minute
+    
+    def add(self, n: int = 1):
+        self._advance()
+        self._sec[self._sec_at % 60] += n
+        self._min[self._min_at % 60] += n
+        self._sec_sum += n
+        self._min_sum += n
+        self.total += n
+    
+    def last_second(self) -> int:
+        """Events in the last completed second"""
+        self._advance()
+        return self._sec[(self._sec_at - 1) % 60]
+    
+    def last_minute(self) -> int:
+        """Events in the last 60 seconds"""
+        self._advance()
+        return self._sec_sum
+    
+    def last_hour(self) -> int:
+        """Events in the last 60 minutes"""
+        self._advance()
+        return self._min_sum
+    
+    def per_second(self) -> float:
+        """Average rate over the last 60 seconds"""
+        return self.last_minute() / 60
+    
+    def snapshot(self) -> dict:
+        self._advance()
+        return {
+            'total': self.total,
+            'last_second': self.last_second(),
+            'last_minute': self._sec_sum,
+            'last_hour': self._min_sum,
+            'peak_per_sec': self.peak_per_sec,
+            'peak_per_min': self.peak_per_min,
+        }
+
+
 class ShardMetrics:
     """Tracks metrics for a single shard"""
     
     def __init__(self, shard_id: int):
         self.shard_id = shard_id
-        self.latency_history: deque = deque(maxlen=120)
-        self.event_counts: Dict[str, int] = defaultdict(int)
+        self.latency = LatencySeries(120)
+        self.event_rates: Dict[str, SlidingCounter] = {}
+        self.all_events = SlidingCounter()
         self.last_event_time: float = time.time()
         self.connect_count: int = 0
         self.disconnect_count: int = 0
@@ -96,16 +417,26 @@ class ShardMetrics:
         self.guilds_joined: int = 0
         self.guilds_left: int = 0
         
-    def record_latency(self, latency: float):
-        """Record latency measurement"""
-        self.latency_history.append({
-            'timestamp': time.time(),
-            'latency': latency
-        })
+    def record_latency(self, latency: float, timestamp: Optional[float] = None):
+        """Record latency measurement (non-finite readings from a shard without a heartbeat are skipped)"""
+        if math.isfinite(latency):
+            self.latency.push(timestamp or time.time(), latency)
         
+    def _rate(self, event_name: str) -> SlidingCounter:
+        counter = self.event_rates.get(event_name)
+        if counter is None:
+            counter = self.event_rates[event_name] = SlidingCounter()
+        return counter
+    
+    @property
+    def event_counts(self) -> Dict[str, int]:
+        """Lifetime count per event name"""
+        return {name: c.total for name, c in self.event_rates.items()}
+    
     def record_event(self, event_name: str):
         """Record an event"""
-        self.event_counts[event_name] += 1
+        self._rate(event_name).add()
+        self.all_events.add()
         self.last_event_time = time.time()
         
     def record_connect(self):
@@ -140,34 +471,34 @@ class ShardMetrics:
     def record_message(self):
         """Record message processed"""
         self.messages_processed += 1
+        self._rate('message').add()
+        self.all_events.add()
         
     def record_command(self):
         """Record command executed"""
         self.commands_executed += 1
+        self._rate('command').add()
+        self.all_events.add()
         
     def get_avg_latency(self) -> float:
         """Get average latency over history"""
-        if not self.latency_history:
-            return 0.0
-        return sum(m['latency'] for m in self.latency_history) / len(self.latency_history)
+        return self.latency.avg()
     
     def get_min_latency(self) -> float:
         """Get minimum latency from history"""
-        if not self.latency_history:
-            return 0.0
-        return min(m['latency'] for m in self.latency_history)
+        return self.latency.min()
     
     def get_max_latency(self) -> float:
         """Get maximum latency from history"""
-        if not self.latency_history:
-            return 0.0
-        return max(m['latency'] for m in self.latency_history)
+        return self.latency.max()
     
     def get_current_latency(self) -> float:
         """Get most recent latency"""
-        if not self.latency_history:
-            return 0.0
-        return self.latency_history[-1]['latency']
+        return self.latency.last()
+    
+    def get_latency_percentile(self, q: float) -> float:
+        """Get latency percentile over history (q in 0..1)"""
+        return self.latency.percentile(q)
     
     def get_uptime_percentage(self) -> float:
         """Calculate uptime percentage"""
@@ -181,12 +512,13 @@ class ShardMetrics:
         return max(0.0, (uptime / total_time) * 100)
     
     def get_events_per_minute(self) -> float:
-        """Get events per minute rate"""
-        elapsed = time.time() - self.uptime_start
-        if elapsed <= 0:
-            return 0.0
-        total_events = sum(self.event_counts.values())
-        return (total_events / elapsed) * 60
+        """Get events seen in the last 60 seconds"""
+        return float(self.all_events.last_minute())
+    
+    def get_event_rates(self) -> Dict[str, dict]:
+        """Current and peak rates per event name, busiest first"""
+        rates = {name: c.snapshot() for name, c in self.event_rates.items()}
+        return dict(sorted(rates.items(), key=lambda kv: kv[1]['last_minute'], reverse=True))
     
     def is_healthy(self, threshold: int = 3) -> Tuple[bool, str]:
         """Check if shard is healthy"""
@@ -228,7 +560,9 @@ class ShardMetrics:
             'latency_current': self.get_current_latency(),
             'latency_min': self.get_min_latency(),
             'latency_max': self.get_max_latency(),
-            'events': dict(self.event_counts),
+            'latency_p95': self.get_latency_percentile(0.95),
+            'events': self.event_counts,
+            'event_rates': self.get_event_rates(),
             'connects': self.connect_count,
             'disconnects': self.disconnect_count,
             'reconnects': self.reconnect_count,
@@ -314,6 +648,7 @@ class ShardMonitor(commands.Cog):
         self._last_alert_time: dict = {}
         self.data_dir = Path("./data/shard_monitor")
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.rollups = LatencyRollups(self.data_dir / "latency_history.db")
         
         self._load_alert_config()
         
@@ -353,16 +688,24 @@ class ShardMonitor(commands.Cog):
     
     async def cog_load(self):
         """Start monitoring tasks"""
+        try:
+            await self.rollups.open()
+        except Exception as e:
+            logger.error(f"ShardMonitor: Latency history unavailable: {e}")
         self.collect_metrics.start()
         self.health_check.start()
         self.save_metrics.start()
         logger.info("ShardMonitor tasks started")
     
-    def cog_unload(self):
+    async def cog_unload(self):
         """Stop monitoring tasks"""
         self.collect_metrics.cancel()
         self.health_check.cancel()
         self.save_metrics.cancel()
+        try:
+            await self.rollups.close()
+        except Exception as e:
+            logger.error(f"ShardMonitor: Error closing latency history: {e}")
         logger.info("ShardMonitor cog unloaded")
     
     
@@ -370,12 +713,15 @@ class ShardMonitor(commands.Cog):
     async def collect_metrics(self):
         """Collect metrics from all shards"""
         try:
+            now = time.time()
             for shard_id, shard in self.bot.shards.items():
                 if shard_id not in self.metrics:
                     self.metrics[shard_id] = ShardMetrics(shard_id)
                 
-                self.metrics[shard_id].record_latency(shard.latency)
+                self.metrics[shard_id].record_latency(shard.latency, now)
                 self.metrics[shard_id].record_event('metrics_collection')
+                if math.isfinite(shard.latency):
+                    self.rollups.add(shard_id, now, shard.latency)
                 
         except Exception as e:
             logger.error(f"Error collecting shard metrics: {e}")
@@ -410,16 +756,30 @@ class ShardMonitor(commands.Cog):
     
     @tasks.loop(minutes=5)
     async def save_metrics(self):
-        """Save metrics to disk for persistence"""
+        """Flush latency rollups and write the current snapshot"""
+        try:
+            await self.rollups.flush()
+        except Exception as e:
+            logger.error(f"Error flushing latency history: {e}")
         try:
             metrics_data = {str(sid): m.to_dict() for sid, m in self.metrics.items()}
             filepath = self.data_dir / "shard_metrics.json"
             await asyncio.to_thread(
-                lambda: filepath.write_text(json.dumps(metrics_data, indent=2))
+                lambda: filepath.write_text(json.dumps(metrics_data, separators=(',', ':')))
             )
         except Exception as e:
             logger.error(f"Error saving shard metrics: {e}")
     
+    async def query_latency(self, shard_id: int, since: float, until: Optional[float] = None,
+                            resolution: Optional[int] = None) -> List[dict]:
+        """
+        Persisted latency history for a shard.
+        
+        Returns ``[{'bucket', 'count', 'avg', 'min', 'max'}]`` (seconds), oldest first. The
+        resolution (60 / 3600 / 86400) is picked from the range unless given.
+        """
+        return await self.rollups.query(shard_id, since, until, resolution)
+    
     @save_metrics.before_loop
     async def before_save_metrics(self):
         await self.bot.wait_until_ready()
@@ -469,6 +829,8 @@ class ShardMonitor(commands.Cog):
         total_messages = sum(m.messages_processed for m in self.metrics.values())
         total_commands = sum(m.commands_executed for m in self.metrics.values())
         avg_latency = sum(m.get_avg_latency() for m in self.metrics.values()) / max(len(self.metrics), 1)
+        events_per_min = sum(m.all_events.last_minute() for m in self.metrics.values())
+        peak_per_sec = max((m.all_events.peak_per_sec for m in self.metrics.values()), default=0)
         
         embed.add_field(
             name="🌐 Cluster Stats",
@@ -478,6 +840,7 @@ class ShardMonitor(commands.Cog):
                 f"Avg Latency:    {avg_latency*1000:.1f}ms\n"
                 f"Messages:       {total_messages:,}\n"
                 f"Commands:       {total_commands:,}\n"
+                f"Events/min:     {events_per_min:,} (peak shard {peak_per_sec}/s)\n"
                 f"```"
             ),
             inline=False
@@ -660,6 +1023,7 @@ class ShardMonitor(commands.Cog):
             m = self.metrics[sid]
             status = m.get_health_status()
             time_since = time.time() - m.last_event_time
+            rates = m.all_events
             
             embed.add_field(
                 name=f"{status} Shard {sid}",
@@ -671,6 +1035,8 @@ class ShardMonitor(commands.Cog):
                     f"Disconnects:  {m.disconnect_count}\n"
                     f"Reconnects:   {m.reconnect_count}\n"
                     f"Errors:       {m.error_count}\n"
+                    f"Rate now:     {rates.last_second()}/s • {rates.last_minute()}/min\n"
+                    f"Peak:         {rates.peak_per_sec}/s • {rates.peak_per_min}/min\n"
                     f"Last Event:   {time_since:.0f}s ago\n"
                     f"```"
                 ),
@@ -811,11 +1177,32 @@ class ShardMonitor(commands.Cog):
                 f"Avg Latency:     {metrics.get_avg_latency()*1000:.1f}ms\n"
                 f"Min Latency:     {metrics.get_min_latency()*1000:.1f}ms\n"
                 f"Max Latency:     {metrics.get_max_latency()*1000:.1f}ms\n"
+                f"p50/p95/p99:     {metrics.get_latency_percentile(0.5)*1000:.0f} / "
+                f"{metrics.get_latency_percentile(0.95)*1000:.0f} / {metrics.get_latency_percentile(0.99)*1000:.0f}ms\n"
                 f"```"
             ),
             inline=False
         )
         
+        history_lines = []
+        for label, window in (("1h", 3600), ("24h", 86400), ("7d", 7 * 86400), ("30d", 30 * 86400)):
+            try:
+                summary = await self.rollups.summary(shard_id, window)
+            except Exception as e:
+                logger.debug(f"ShardMonitor: History query failed: {e}")
+                summary = None
+            if summary:
+                history_lines.append(
+                    f"{label:>4}: avg {summary['avg']*1000:6.1f}ms  "
+                    f"min {summary['min']*1000:6.1f}  max {summary['max']*1000:7.1f}"
+                )
+        if history_lines:
+            embed.add_field(
+                name="🕓 Latency History",
+                value="```" + "\n".join(history_lines) + "```",
+                inline=False
+            )
+        
         embed.add_field(
             name="📈 Activity",
             value=(
@@ -829,6 +1216,19 @@ class ShardMonitor(commands.Cog):
             inline=True
         )
         
+        rate_lines = []
+        for name, r in list(metrics.get_event_rates().items())[:6]:
+            rate_lines.append(
+                f"{name[:14]:<14} {r['last_second']:>4}/s {r['last_minute']:>6}/m  "
+                f"peak {r['peak_per_sec']}/s {r['peak_per_min']}/m"
+            )
+        if rate_lines:
+            embed.add_field(
+                name="⚡ Event Rates (now • peak)",
+                value="```" + "\n".join(rate_lines) + "```",
+                inline=False
+            )
+        
         embed.add_field(
             name="🔧 Reliability",
             value=(
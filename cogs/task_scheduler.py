@@ -175,6 +175,17 @@ class CronParser:
         return expression
 
 
+async def task_id_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+    """This guild's task ids, plus global tasks for the bot owner"""
+    service = interaction.client.autocomplete
+    choices = []
+    if interaction.guild_id is not None:
+        choices = await service.choices("scheduled_tasks", current, scope=interaction.guild_id)
+    if interaction.user.id == interaction.client.bot_owner_id and len(choices) < 25:
+        choices += await service.choices("scheduled_tasks", current, scope=None, limit=25 - len(choices))
+    return choices
+
+
 class TaskScheduler(commands.Cog, name="Task Scheduler"):
 
     VALID_TASK_TYPES = ("message", "hook", "log")
@@ -192,6 +203,7 @@ class TaskScheduler(commands.Cog, name="Task Scheduler"):
 
     def cog_unload(self):
         self.scheduler_tick.cancel()
+        self.bot.autocomplete.unregister("scheduled_tasks")
         logger.info("TaskScheduler cog unloaded")
 
     async def _load_tasks(self):
@@ -211,6 +223,7 @@ class TaskScheduler(commands.Cog, name="Task Scheduler"):
                     # Normalize SQLite int 1/0 to Python bool
                     task["enabled"] = bool(task.get("enabled", 1))
                     self._tasks_cache[task["task_id"]] = task
+                    self._index_task(task)
             enabled_count = sum(1 for t in self._tasks_cache.values() if t.get("enabled"))
             logger.info(f"TaskScheduler: Loaded {len(self._tasks_cache)} task(s) ({enabled_count} enabled)")
         except Exception as e:
@@ -220,6 +233,11 @@ class TaskScheduler(commands.Cog, name="Task Scheduler"):
             else:
                 logger.error(f"TaskScheduler: Failed to load tasks: {e}")
 
+    def _index_task(self, task: Dict[str, Any]):
+        self.bot.autocomplete.index("scheduled_tasks", task.get("guild_id")).add(
+            task["task_id"], f"{task['task_name']} ({task['task_id']})"
+        )
+
     async def _save_task(self, task: Dict[str, Any]) -> bool:
         db = getattr(self.bot, 'db', None)
         if db is None or db.conn is None:
@@ -478,6 +496,7 @@ class TaskScheduler(commands.Cog, name="Task Scheduler"):
             return
 
         self._tasks_cache[task["task_id"]] = task
+        self._index_task(task)
 
         embed = discord.Embed(
             title="Scheduled Task Created",
@@ -556,6 +575,7 @@ class TaskScheduler(commands.Cog, name="Task Scheduler"):
 
     @schedule_group.command(name="delete", description="Delete a scheduled task")
     @app_commands.describe(task_id="The task ID to delete")
+    @app_commands.autocomplete(task_id=task_id_autocomplete)
     async def schedule_delete(self, interaction: discord.Interaction, task_id: str):
         task = self._tasks_cache.get(task_id)
         if not task:
@@ -573,6 +593,7 @@ class TaskScheduler(commands.Cog, name="Task Scheduler"):
         success = await self._delete_task_db(task_id)
         if success:
             del self._tasks_cache[task_id]
+            self.bot.autocomplete.index("scheduled_tasks", task.get("guild_id")).discard(task_id)
             await interaction.response.send_message(
                 f"Task `{task['task_name']}` (`{task_id}`) deleted.", ephemeral=True
             )
@@ -584,6 +605,7 @@ class TaskScheduler(commands.Cog, name="Task Scheduler"):
 
     @schedule_group.command(name="toggle", description="Enable or disable a scheduled task")
     @app_commands.describe(task_id="The task ID to toggle")
+    @app_commands.autocomplete(task_id=task_id_autocomplete)
     async def schedule_toggle(self, interaction: discord.Interaction, task_id: str):
         task = self._tasks_cache.get(task_id)
         if not task:
@@ -616,6 +638,7 @@ class TaskScheduler(commands.Cog, name="Task Scheduler"):
 
     @schedule_group.command(name="info", description="Show details of a scheduled task")
     @app_commands.describe(task_id="The task ID to inspect")
+    @app_commands.autocomplete(task_id=task_id_autocomplete)
     async def schedule_info(self, interaction: discord.Interaction, task_id: str):
         task = self._tasks_cache.get(task_id)
         if not task:
@@ -697,6 +720,7 @@ class TaskScheduler(commands.Cog, name="Task Scheduler"):
         success = await self._save_task(task)
         if success:
             self._tasks_cache[task["task_id"]] = task
+            self._index_task(task)
             logger.info(f"TaskScheduler API: Created task '{task_name}' (ID: {task['task_id']})")
             return task["task_id"]
         return None
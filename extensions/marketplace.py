@@ -15,7 +15,7 @@ Violation of these terms will result in permanent ZygnalID deactivation and ban.
 import discord
 from discord.ext import commands
 from discord import app_commands
-from typing import Optional
+from typing import Optional, List
 import aiohttp
 import os
 import asyncio
@@ -453,6 +453,9 @@ class InstallConfirmView(discord.ui.View):
         )
         await interaction.response.edit_message(embed=embed, view=None)
 
+async def marketplace_extension_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[int]]:
+    return await interaction.client.autocomplete.choices("marketplace", current)
+
 class ExtensionMarketplace(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -465,6 +468,8 @@ class ExtensionMarketplace(commands.Cog):
         self.cache_time = None
         self.cache_duration = 300
         self.installed_deps_cache = set() 
+        self._prefetch: Optional[asyncio.Task] = None
+        self.bot.autocomplete.register("marketplace", self._load_autocomplete)
         self.log_file_path = "botlogs/current_run.log"
         os.makedirs(self.data_folder, exist_ok=True)
         os.makedirs(self.extensions_folder, exist_ok=True)
@@ -540,6 +545,19 @@ class ExtensionMarketplace(commands.Cog):
                 raise commands.CheckFailure("You must accept the marketplace license to use these commands.")
         return True
     
+    async def cog_unload(self):
+        self.bot.autocomplete.unregister("marketplace")
+    
+    async def _load_autocomplete(self, scope):
+        # Autocomplete must answer within 3 seconds, so the first query only starts the fetch
+        if self._prefetch is None or self._prefetch.done():
+            self._prefetch = asyncio.create_task(self.fetch_extensions())
+    
+    def _index_autocomplete(self, extensions):
+        self.bot.autocomplete.index("marketplace").replace(
+            (ext['id'], f"{ext.get('title', 'Untitled')} (#{ext['id']})", ext['id']) for ext in extensions
+        )
+    
     async def fetch_extensions(self, force_refresh=False):
         if not force_refresh and self.cache_time and (datetime.now() - self.cache_time).seconds < self.cache_duration:
             return self.cache
@@ -551,6 +569,7 @@ class ExtensionMarketplace(commands.Cog):
                         if data.get('success'):
                             self.cache = data
                             self.cache_time = datetime.now()
+                            self._index_autocomplete(data.get('extensions', []))
                             return data
                         else:
                             logger.error("API returned success: false")
@@ -739,6 +758,7 @@ class ExtensionMarketplace(commands.Cog):
     
     @marketplace_group.command(name='install')
     @commands.cooldown(1, 30, commands.BucketType.user)
+    @app_commands.autocomplete(extension_id=marketplace_extension_autocomplete)
     async def install_extension(self, ctx, extension_id: int):
         data = await self.fetch_extensions()
         if not data or data.get('error'):
@@ -764,6 +784,7 @@ class ExtensionMarketplace(commands.Cog):
     
     @marketplace_group.command(name='info')
     @commands.cooldown(1, 5, commands.BucketType.user)
+    @app_commands.autocomplete(extension_id=marketplace_extension_autocomplete)
     async def extension_info(self, ctx, extension_id: int):
         data = await self.fetch_extensions()
         if not data or data.get('error'):
@@ -0,0 +1,385 @@
+"""
+Cluster Launcher
+Runs the bot as several cluster processes on one host, wired together by the ShardManager IPC
+
+Usage:
+    python launcher.py
+
+The shard range is split into contiguous blocks, one per cluster. cluster-0 hosts the IPC
+server, the others connect to it as clients. The launcher itself joins the IPC network as a
+control link (it never counts as a cluster), restarts crashed clusters with backoff and
+performs rolling restarts on request (/rollingrestart or SIGHUP).
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import aiohttp
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from cogs.shard_manager import IPCClient, IPCMessage, LAUNCHER_NAME
+
+TOKEN = os.getenv("DISCORD_TOKEN")
+MAIN_SCRIPT = Path(__file__).resolve().with_name("main.py")
+
+CLUSTER_COUNT = int(os.getenv("LAUNCHER_CLUSTERS", os.cpu_count() or 1))
+READY_TIMEOUT = float(os.getenv("LAUNCHER_READY_TIMEOUT", 300))
+STOP_TIMEOUT = float(os.getenv("LAUNCHER_STOP_TIMEOUT", 30))
+RESTART_DELAY = 5
+MAX_RESTART_DELAY = 120
+STABLE_AFTER = 60
+
+logger = logging.getLogger('discord.launcher')
+
+
+def setup_logging():
+    root = logging.getLogger('discord')
+    root.setLevel(logging.INFO)
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(
+        '[{asctime}] [{levelname:<8}] {name}: {message}',
+        style='{',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    ))
+    root.addHandler(handler)
+
+
+def split_shards(shard_count: int, clusters: int) -> List[List[int]]:
+    """Contiguous, near-even shard blocks — the first ``shard_count % clusters`` blocks get one extra"""
+    clusters = max(1, min(clusters, shard_count))
+    base, extra = divmod(shard_count, clusters)
+    blocks, start = [], 0
+    for i in range(clusters):
+        size = base + (1 if i < extra else 0)
+        blocks.append(list(range(start, start + size)))
+        start += size
+    return blocks
+
+
+async def recommended_shards() -> int:
+    """Ask Discord for the recommended shard count (GET /gateway/bot)"""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(
+            "https://discord.com/api/v10/gateway/bot",
+            headers={"Authorization": f"Bot {TOKEN}"}
+        ) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+    return int(data.get("shards", 1))
+
+
+class ClusterProcess:
+    """One supervised ``main.py`` process owning a block of shards"""
+    
+    def __init__(self, index: int, shard_ids: List[int], shard_count: int, ipc_port: int):
+        self.index = index
+        self.name = f"cluster-{index}"
+        self.mode = "server" if index == 0 else "client"
+        self.shard_ids = shard_ids
+        self.shard_count = shard_count
+        self.ipc_port = ipc_port
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.ready = asyncio.Event()
+        self.started_at = 0.0
+        self.restarts = 0
+        self.restart_delay = RESTART_DELAY
+        self.managed_stop = False
+        self._watcher: Optional[asyncio.Task] = None
+    
+    def env(self) -> Dict[str, str]:
+        env = dict(os.environ)
+        env.update({
+            "SHARD_COUNT": str(self.shard_count),
+            "SHARD_IDS": ",".join(str(s) for s in self.shard_ids),
+            "ENABLE_SHARD_MANAGER": "true",
+            "SHARD_IPC_MODE": self.mode,
+            "SHARD_IPC_HOST": "127.0.0.1",
+            "SHARD_IPC_PORT": str(self.ipc_port),
+            "SHARD_CLUSTER_NAME": self.name,
+            "ZDBF_LAUNCHER": "1",
+        })
+        exporter_port = int(os.getenv("METRICS_EXPORTER_PORT", 0) or 0)
+        if exporter_port:
+            env["METRICS_EXPORTER_PORT"] = str(exporter_port + self.index)
+        return env
+    
+    @property
+    def running(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+    
+    async def start(self, on_exit):
+        self.ready.clear()
+        self.managed_stop = False
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable, str(MAIN_SCRIPT),
+            env=self.env(),
+            cwd=str(MAIN_SCRIPT.parent)
+        )
+        self.started_at = time.time()
+        self._watcher = asyncio.create_task(self._watch(self.process, on_exit))
+        logger.info(
+            f"[Launcher] Started {self.name} (pid {self.process.pid}, {self.mode}) "
+            f"shards {self.shard_ids[0]}-{self.shard_ids[-1]} of {self.shard_count}"
+        )
+    
+    async def _watch(self, process: asyncio.subprocess.Process, on_exit):
+        code = await process.wait()
+        # A rolling restart may already have replaced this process
+        if process is not self.process:
+            return
+        self.ready.clear()
+        if not self.managed_stop:
+            await on_exit(self, code)
+    
+    async def stop(self, send_shutdown) -> Optional[int]:
+        """Graceful shutdown over IPC, then SIGTERM, then kill"""
+        if not self.running:
+            return self.process.returncode if self.process else None
+        self.managed_stop = True
+        
+        steps = [
+            ("ipc", lambda: send_shutdown(self.name)),
+            ("terminate", self.process.terminate),
+            ("kill", self.process.kill),
+        ]
+        for step, action in steps:
+            try:
+                result = action()
+                if asyncio.iscoroutine(result):
+                    result = await result
+                if step == "ipc" and not result:
+                    continue
+            except ProcessLookupError:
+                break
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout=STOP_TIMEOUT)
+                break
+            except asyncio.TimeoutError:
+                logger.warning(f"[Launcher] {self.name} did not exit after {step} — escalating")
+        
+        return self.process.returncode
+    
+    def status(self) -> dict:
+        return {
+            'name': self.name,
+            'pid': self.process.pid if self.process else None,
+            'running': self.running,
+            'ready': self.ready.is_set(),
+            'shard_ids': self.shard_ids,
+            'restarts': self.restarts,
+            'uptime': time.time() - self.started_at if self.running else 0,
+        }
+
+
+class ClusterLauncher:
+    """Spawns, supervises and rolling-restarts the cluster processes"""
+    
+    def __init__(self):
+        self.ipc_port = int(os.getenv("SHARD_IPC_PORT", 20000))
+        self.ipc_secret = os.getenv("SHARD_IPC_SECRET", "change_me_please")
+        self.clusters: List[ClusterProcess] = []
+        self.ipc: Optional[IPCClient] = None
+        self._ipc_task: Optional[asyncio.Task] = None
+        self._rolling: Optional[asyncio.Task] = None
+        self._started = False
+        self._stopping = asyncio.Event()
+    
+    async def resolve_shard_count(self) -> int:
+        raw = os.getenv("SHARD_COUNT", "auto").strip().lower()
+        if raw not in ("", "auto", "0"):
+            return max(1, int(raw))
+        try:
+            count = await recommended_shards()
+            logger.info(f"[Launcher] Discord recommends {count} shard(s)")
+            return count
+        except Exception as e:
+            logger.warning(f"[Launcher] Could not fetch recommended shard count ({e}) — using 1")
+            return 1
+    
+    def _by_name(self, name: str) -> Optional[ClusterProcess]:
+        for cluster in self.clusters:
+            if cluster.name == name:
+                return cluster
+        return None
+    
+    # ---------------- IPC ----------------
+    
+    async def _connect_ipc(self):
+        self.ipc = IPCClient("127.0.0.1", self.ipc_port, self.ipc_secret, LAUNCHER_NAME)
+        self.ipc.role = "launcher"
+        # cluster-0 may still be binding its port; retry quickly and never back off far
+        self.ipc._reconnect_delay = 1
+        self.ipc._max_reconnect_delay = RESTART_DELAY
+        self.ipc.on('cluster_ready', self._on_cluster_ready)
+        self.ipc.on('rpc_request', self._on_rpc_request)
+        self._ipc_task = asyncio.create_task(self.ipc.connect([], 0, 0))
+    
+    async def _on_cluster_ready(self, msg: IPCMessage):
+        cluster = self._by_name(msg.data.get('cluster_name', msg.source))
+        if cluster and not cluster.ready.is_set():
+            cluster.ready.set()
+            logger.info(
+                f"[Launcher] {cluster.name} ready — {msg.data.get('guild_count', 0)} guild(s) "
+                f"after {time.time() - cluster.started_at:.1f}s"
+            )
+    
+    async def _on_rpc_request(self, msg: IPCMessage):
+        op = msg.data.get('op')
+        if op == 'rolling_restart':
+            if not self._started:
+                data = {'ok': False, 'error': 'clusters are still starting'}
+            elif self._rolling and not self._rolling.done():
+                data = {'ok': False, 'error': 'a rolling restart is already running'}
+            else:
+                self._rolling = asyncio.create_task(self.rolling_restart())
+                data = {'ok': True, 'result': {'order': [c.name for c in self._restart_order()]}}
+        elif op == 'status':
+            data = {'ok': True, 'result': [c.status() for c in self.clusters]}
+        else:
+            data = {'ok': False, 'error': f"unknown launcher op '{op}'"}
+        
+        reply = IPCMessage('rpc_response', data, LAUNCHER_NAME, msg.source)
+        reply.reply_to = msg.nonce
+        await self.ipc.send(reply)
+    
+    async def _send_shutdown(self, name: str) -> bool:
+        if not self.ipc:
+            return False
+        return await self.ipc.send(IPCMessage('cluster_shutdown', {'reason': 'launcher'}, LAUNCHER_NAME, name))
+    
+    async def _wait_ready(self, cluster: ClusterProcess) -> bool:
+        """Wait for cluster_ready, probing periodically in case the broadcast was missed"""
+        deadline = time.time() + READY_TIMEOUT
+        while time.time() < deadline and cluster.running and not self._stopping.is_set():
+            if self.ipc:
+                await self.ipc.send(IPCMessage('cluster_ready_request', {}, LAUNCHER_NAME, cluster.name))
+            try:
+                await asyncio.wait_for(cluster.ready.wait(), timeout=2)
+                return True
+            except asyncio.TimeoutError:
+                continue
+        return cluster.ready.is_set()
+    
+    # ---------------- Supervision ----------------
+    
+    async def _on_exit(self, cluster: ClusterProcess, code: int):
+        if self._stopping.is_set():
+            return
+        
+        if time.time() - cluster.started_at > STABLE_AFTER:
+            cluster.restart_delay = RESTART_DELAY
+        delay = cluster.restart_delay
+        cluster.restart_delay = min(cluster.restart_delay * 2, MAX_RESTART_DELAY)
+        cluster.restarts += 1
+        
+        logger.error(f"[Launcher] {cluster.name} exited with code {code} — restarting in {delay}s")
+        await asyncio.sleep(delay)
+        if not self._stopping.is_set() and not cluster.running:
+            await cluster.start(self._on_exit)
+    
+    def _restart_order(self) -> List[ClusterProcess]:
+        # Clients first; the IPC server cluster goes last so the others stay reachable meanwhile
+        return sorted(self.clusters, key=lambda c: (c.mode == "server", c.index))
+    
+    async def rolling_restart(self):
+        """Restart clusters one at a time, waiting for each to report ready"""
+        logger.info("[Launcher] Rolling restart started")
+        started = time.time()
+        
+        for cluster in self._restart_order():
+            if self._stopping.is_set():
+                return
+            await cluster.stop(self._send_shutdown)
+            await cluster.start(self._on_exit)
+            if not await self._wait_ready(cluster):
+                logger.error(f"[Launcher] {cluster.name} not ready after restart — aborting rolling restart")
+                return
+        
+        logger.info(f"[Launcher] Rolling restart finished in {time.time() - started:.1f}s")
+    
+    async def run(self):
+        shard_count = await self.resolve_shard_count()
+        blocks = split_shards(shard_count, CLUSTER_COUNT)
+        self.clusters = [ClusterProcess(i, ids, shard_count, self.ipc_port) for i, ids in enumerate(blocks)]
+        
+        logger.info(f"[Launcher] {shard_count} shard(s) across {len(self.clusters)} cluster(s)")
+        
+        self._install_signals()
+        
+        # Start sequentially so clusters don't compete for identify slots
+        for cluster in self.clusters:
+            if self._stopping.is_set():
+                break
+            await cluster.start(self._on_exit)
+            if cluster.mode == "server":
+                await self._connect_ipc()
+            if not await self._wait_ready(cluster):
+                logger.warning(f"[Launcher] {cluster.name} not ready after {READY_TIMEOUT:.0f}s — continuing")
+        
+        self._started = True
+        
+        await self._stopping.wait()
+        await self.shutdown()
+    
+    def _install_signals(self):
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGINT, self._stopping.set)
+            loop.add_signal_handler(signal.SIGTERM, self._stopping.set)
+            loop.add_signal_handler(signal.SIGHUP, self._request_rolling_restart)
+        except (NotImplementedError, AttributeError):
+            # Windows: Ctrl+C arrives as KeyboardInterrupt and there is no SIGHUP
+            pass
+    
+    def _request_rolling_restart(self):
+        if not self._started:
+            logger.warning("[Launcher] Clusters are still starting — rolling restart ignored")
+            return
+        if self._rolling and not self._rolling.done():
+            logger.warning("[Launcher] Rolling restart already in progress")
+            return
+        self._rolling = asyncio.create_task(self.rolling_restart())
+    
+    async def shutdown(self):
+        logger.info("[Launcher] Stopping all clusters...")
+        self._stopping.set()
+        if self._rolling:
+            self._rolling.cancel()
+        
+        # Server last, mirroring the restart order
+        await asyncio.gather(*(c.stop(self._send_shutdown) for c in self._restart_order() if c.mode != "server"))
+        for cluster in self.clusters:
+            if cluster.mode == "server":
+                await cluster.stop(self._send_shutdown)
+        
+        if self.ipc:
+            await self.ipc.close()
+        if self._ipc_task:
+            self._ipc_task.cancel()
+        logger.info("[Launcher] All clusters stopped")
+
+
+if __name__ == "__main__":
+    setup_logging()
+    
+    if not TOKEN:
+        logger.critical("DISCORD_TOKEN not found in .env!")
+        exit(1)
+    
+    if os.getenv("SHARD_IPC_SECRET", "change_me_please") == "change_me_please":
+        logger.critical("SHARD_IPC_SECRET must be set in .env — clusters refuse to start IPC with the default secret")
+        exit(1)
+    
+    launcher = ClusterLauncher()
+    try:
+        asyncio.run(launcher.run())
+    except KeyboardInterrupt:
+        logger.info("Launcher stopped by user")
@@ -4,50 +4,183 @@ from discord import app_commands
 import os
 import asyncio
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import atexit
 import aiosqlite
 import json
 import time
 import signal
 import sys
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Set, Tuple, FrozenSet, Iterable, Callable, Awaitable
 from pathlib import Path
 from dotenv import load_dotenv
 import traceback
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from contextlib import contextmanager
+import heapq
+import hashlib
+import struct
+import ctypes
+import ctypes.util
+import itertools
+import ast
+import importlib
+import importlib.util
+import py_compile
+from concurrent.futures import ThreadPoolExecutor
 from atomic_file_system import (
     AtomicFileHandler,
+    BucketHistogram,
     SafeConfig,
     SafeDatabaseManager,
     SafeLogRotator,
+    BatchedLogFileHandler,
+    JsonLinesFormatter,
+    LogRateLimiter,
     global_file_handler,
     global_log_rotator
 )
 from rich.console import Console 
 from rich.panel import Panel
-import shutil
 load_dotenv()
 TOKEN = os.getenv("DISCORD_TOKEN")
 BOT_OWNER_ID = int(os.getenv("BOT_OWNER_ID", 0))
 
 
+class LatencyHistogram(BucketHistogram):
+    """Fixed log-spaced millisecond buckets: O(1) record, constant memory,
+    percentiles interpolated within the bucket that holds the rank."""
+
+    BOUNDS = (
+        0.5, 1, 2, 3, 5, 7.5, 10, 15, 20, 30, 50, 75, 100, 150, 200, 300,
+        500, 750, 1000, 1500, 2000, 3000, 5000, 7500, 10000, 20000, 30000, 60000
+    )
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, ms: float):
+        self.bucket(ms)
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, pct: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = self.count * pct / 100
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            if bucket and seen + bucket >= rank:
+                lower = self.BOUNDS[index - 1] if index else 0.0
+                upper = self.BOUNDS[index] if index < len(self.BOUNDS) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / bucket)
+            seen += bucket
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count, 2) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50), 2),
+            "p95_ms": round(self.percentile(95), 2),
+            "p99_ms": round(self.percentile(99), 2),
+            "max_ms": round(self.max, 2)
+        }
+
+
 class MetricsCollector:
-    def __init__(self, max_commands: int = 100):
+    COMMAND_PHASES = ("dispatch", "prepare", "execution", "response", "total")
+
+    def __init__(self, max_commands: int = 100, max_spans: int = 200):
         self.command_count = defaultdict(int)
         self.error_count = 0
         self.start_time = time.time()
         self.messages_seen = 0
         self.commands_processed = 0
         self._max_commands = max_commands
+        self.command_latency: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self.spans: Dict[str, LatencyHistogram] = {}
+        self._max_spans = max_spans
+        self.dropped_spans = 0
     
     def record_command(self, command_name: str):
+        # Exact counts: names come from registered commands, so the table stays small.
+        # Top-N is picked with heapq.nlargest at read time.
         self.command_count[command_name] += 1
         self.commands_processed += 1
-        
-        if len(self.command_count) > self._max_commands:
-            sorted_commands = sorted(self.command_count.items(), key=lambda x: x[1], reverse=True)
-            self.command_count = defaultdict(int, dict(sorted_commands[:self._max_commands]))
+    
+    def record_command_timing(self, command_name: str, kind: str, phases: Dict[str, float]):
+        key = f"{kind}:{command_name}"
+        histograms = self.command_latency.get(key)
+        if histograms is None:
+            if len(self.command_latency) >= self._max_commands * 2:
+                return
+            histograms = self.command_latency[key] = {}
+        for phase, ms in phases.items():
+            if ms is None or ms < 0:
+                continue
+            hist = histograms.get(phase)
+            if hist is None:
+                hist = histograms[phase] = LatencyHistogram()
+            hist.record(ms)
+    
+    def record_span(self, name: str, duration_ms: float):
+        hist = self.spans.get(name)
+        if hist is None:
+            if len(self.spans) >= self._max_spans:
+                self.dropped_spans += 1
+                return
+            hist = self.spans[name] = LatencyHistogram()
+        hist.record(duration_ms)
+    
+    @contextmanager
+    def trace(self, name: str):
+        """Time a hot section: ``with bot.metrics.trace("mycog.refresh"): ...``.
+        Works around ``await`` too; the span covers wall-clock time."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_span(name, (time.perf_counter() - start) * 1000)
+    
+    def command_latency_summary(self, command_name: str, phase: str = "total") -> Dict[str, dict]:
+        out = {}
+        for kind in ("prefix", "slash"):
+            hist = self.command_latency.get(f"{kind}:{command_name}", {}).get(phase)
+            if hist and hist.count:
+                out[kind] = hist.summary()
+        return out
+    
+    def get_latency_stats(self, limit: int = 10) -> dict:
+        commands_out = []
+        for key, histograms in self.command_latency.items():
+            total = histograms.get("total")
+            if not total or not total.count:
+                continue
+            kind, name = key.split(":", 1)
+            commands_out.append({
+                "command": name,
+                "kind": kind,
+                **total.summary(),
+                "phases": {phase: histograms[phase].summary() for phase in self.COMMAND_PHASES if phase in histograms and phase != "total"}
+            })
+        spans_out = [{"name": name, **hist.summary()} for name, hist in self.spans.items() if hist.count]
+        return {
+            "slowest_commands": heapq.nlargest(limit, commands_out, key=lambda c: c["p95_ms"]),
+            "spans": heapq.nlargest(limit, spans_out, key=lambda s: s["p95_ms"] * s["count"]),
+            "tracked_timings": len(self.command_latency),
+            "tracked_spans": len(self.spans),
+            "dropped_spans": self.dropped_spans
+        }
     
     def record_error(self):
         self.error_count += 1
@@ -64,10 +197,62 @@ class MetricsCollector:
             "commands_processed": self.commands_processed,
             "messages_seen": self.messages_seen,
             "error_count": self.error_count,
-            "top_commands": dict(sorted(self.command_count.items(), key=lambda x: x[1], reverse=True)[:10]),
+            "top_commands": dict(heapq.nlargest(10, self.command_count.items(), key=lambda x: x[1])),
             "tracked_commands": len(self.command_count)
         }
 
+
+class CommandTimer:
+    """perf_counter marks for one invocation, stored on the Context."""
+
+    __slots__ = ("start", "checks", "prepared", "responded", "finished", "kind")
+
+    def __init__(self, start: float, kind: str):
+        self.start = start
+        self.kind = kind
+        self.checks = None
+        self.prepared = None
+        self.responded = None
+        self.finished = None
+
+    def phases(self) -> Dict[str, Optional[float]]:
+        ms = lambda a, b: (b - a) * 1000 if a is not None and b is not None else None
+        return {
+            "dispatch": ms(self.start, self.checks),
+            "prepare": ms(self.checks, self.prepared),
+            "execution": ms(self.prepared, self.finished),
+            "response": ms(self.start, self.responded),
+            "total": ms(self.start, self.finished)
+        }
+
+
+class FrameworkContext(commands.Context):
+    timer: Optional[CommandTimer] = None
+
+    def _mark_response(self):
+        if self.timer is not None and self.timer.responded is None:
+            self.timer.responded = time.perf_counter()
+
+    async def send(self, *args, **kwargs):
+        message = await super().send(*args, **kwargs)
+        self._mark_response()
+        return message
+
+    async def defer(self, *args, **kwargs):
+        await super().defer(*args, **kwargs)
+        if self.interaction is not None:
+            self._mark_response()
+
+
+class FrameworkCommandTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        interaction.extras.setdefault("zdbf_received", time.perf_counter())
+        lazy_cogs = getattr(self.client, "lazy_cogs", None)
+        if lazy_cogs is not None and lazy_cogs.app_owner:
+            return await lazy_cogs.route_interaction(interaction)
+        return True
+
+
 class PrefixCache:
     def __init__(self, ttl: int = 600):
         self._cache: Dict[int, tuple[str, bool, float]] = {}
@@ -93,6 +278,11 @@ class PrefixCache:
             if guild_id in self._cache:
                 del self._cache[guild_id]
 
+    async def clear(self, *_):
+        """Drop every entry; subscribed to the global prefix defaults the entries fall back to"""
+        async with self._lock:
+            self._cache.clear()
+
     async def cleanup_expired(self):
         async with self._lock:
             now = time.time()
@@ -103,6 +293,74 @@ class PrefixCache:
 BOT_OWNER_ONLY_COMMANDS = ["reload", "load", "unload", "sync", "atomictest", "cachestats", "shardinfo", "dbstats", "integritycheck", "cleanup", "shardmonitor", "sharddetails", "shardhealth", "shardalerts", "shardreset", "clusters", "ipcstatus", "broadcastmsg", "fw_migrations", "fw_migrate", "fw_config_validate", "fw_config_schema"]
 
 
+class PermissionResolver:
+    """``command_permissions`` compiled into per-command frozensets of role ids. Rebuilt when the
+    config loads and whenever the key changes, so checks never walk the config dict.
+    The owner-only set is re-snapshotted after every extension (re)load and whenever
+    ``BOT_OWNER_ONLY_COMMANDS`` changes length."""
+
+    def __init__(self):
+        self.owner_only: FrozenSet[str] = frozenset()
+        self._owner_only_len = -1
+        self.refresh_owner_only()
+        self.required: Dict[str, FrozenSet[int]] = {}
+        self.version = 0
+        self._config: Optional[SafeConfig] = None
+
+    def attach(self, config: SafeConfig):
+        self._config = config
+        config.subscribe("command_permissions", self.on_config_change)
+        self.compile()
+
+    def compile(self):
+        perms = self._config.get("command_permissions", {}) if self._config else {}
+        required = {}
+        for name, role_ids in (perms if isinstance(perms, dict) else {}).items():
+            try:
+                compiled = frozenset(int(role_id) for role_id in role_ids or ())
+            except (TypeError, ValueError):
+                logger.warning(f"Ignoring malformed permissions for command '{name}': {role_ids!r}")
+                continue
+            if compiled:
+                required[name] = compiled
+        self.required = required
+        self.refresh_owner_only()
+        self.version += 1
+
+    def refresh_owner_only(self):
+        self.owner_only = frozenset(BOT_OWNER_ONLY_COMMANDS)
+        self._owner_only_len = len(BOT_OWNER_ONLY_COMMANDS)
+
+    def on_config_change(self, key: str, value: Any):
+        self.compile()
+
+    def is_owner_only(self, command_name: str) -> bool:
+        # Extensions append to BOT_OWNER_ONLY_COMMANDS at import time, after setup_hook
+        if len(BOT_OWNER_ONLY_COMMANDS) != self._owner_only_len:
+            self.refresh_owner_only()
+        return command_name in self.owner_only
+
+    def required_roles(self, command_name: str) -> FrozenSet[int]:
+        return self.required.get(command_name, frozenset())
+
+    def allows(self, member: discord.Member, command_name: str) -> bool:
+        required = self.required.get(command_name)
+        if not required:
+            return True
+        # Member._roles is the raw snowflake array; avoids building and sorting Role objects
+        role_ids = getattr(member, "_roles", None)
+        if role_ids is None:
+            role_ids = [role.id for role in getattr(member, "roles", ())]
+        return not required.isdisjoint(role_ids)
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "restricted_commands": len(self.required),
+            "owner_only_commands": len(self.owner_only),
+        }
+
+
 def is_bot_owner():
     async def predicate(ctx):
         if ctx.author.id != BOT_OWNER_ID:
@@ -125,20 +383,18 @@ def has_command_permission():
             return True
         
         command_name = ctx.command.qualified_name
+        permissions = ctx.bot.permissions
         
-        if command_name in BOT_OWNER_ONLY_COMMANDS:
+        if permissions.is_owner_only(command_name):
             raise commands.CheckFailure(f"The command '{command_name}' is restricted to the bot owner.")
         
-        required_roles = ctx.bot.config.get(f"command_permissions.{command_name}", [])
-        
-        if not required_roles:
+        if not permissions.required_roles(command_name):
             return True
         
         if not ctx.guild:
             raise commands.CheckFailure("This command cannot be used in DMs.")
         
-        member_role_ids = [role.id for role in ctx.author.roles]
-        if not any(role_id in member_role_ids for role_id in required_roles):
+        if not permissions.allows(ctx.author, command_name):
             raise commands.CheckFailure(f"You need one of the required roles to use '{command_name}'.")
         
         return True
@@ -149,15 +405,15 @@ async def check_app_command_permissions(interaction: discord.Interaction, comman
     if interaction.user.id == BOT_OWNER_ID:
         return True
     
-    if command_name in BOT_OWNER_ONLY_COMMANDS:
+    permissions = interaction.client.permissions
+    if permissions.is_owner_only(command_name):
         await interaction.response.send_message(
             f"❌ The command `/{command_name}` is restricted to the bot owner only.",
             ephemeral=True
         )
         return False
     
-    bot = interaction.client
-    required_roles = bot.config.get(f"command_permissions.{command_name}", [])
+    required_roles = permissions.required_roles(command_name)
     
     if not required_roles:
         return True
@@ -169,7 +425,7 @@ async def check_app_command_permissions(interaction: discord.Interaction, comman
         )
         return False
     
-    member = interaction.guild.get_member(interaction.user.id)
+    member = interaction.user if isinstance(interaction.user, discord.Member) else interaction.guild.get_member(interaction.user.id)
     if not member:
         await interaction.response.send_message(
             "❌ Unable to verify your permissions.",
@@ -177,9 +433,8 @@ async def check_app_command_permissions(interaction: discord.Interaction, comman
         )
         return False
     
-    member_role_ids = [role.id for role in member.roles]
-    if not any(role_id in member_role_ids for role_id in required_roles):
-        role_mentions = ", ".join([f"<@&{rid}>" for rid in required_roles[:3]])
+    if not permissions.allows(member, command_name):
+        role_mentions = ", ".join([f"<@&{rid}>" for rid in sorted(required_roles)[:3]])
         await interaction.response.send_message(
             f"❌ You need one of these roles to use this command: {role_mentions}",
             ephemeral=True
@@ -188,26 +443,1001 @@ async def check_app_command_permissions(interaction: discord.Interaction, comman
     
     return True
 
+HELP_PAGE_SIZE = 5
+HELP_EMBED_CACHE_SIZE = 256
+
+
+AUTOCOMPLETE_LIMIT = 25
+AUTOCOMPLETE_TRIE_DEPTH = 32
+AUTOCOMPLETE_MEMO_SIZE = 128
+
+
+class AutocompleteIndex:
+    """One autocomplete source: ``key -> (label, value)`` in insertion order, with a prefix trie
+    over the start of every word in the label/key and 1-3 character n-gram postings for
+    substring matches. Entries are added and discarded individually, never rebuilt; recent
+    results are memoised until the next change, since every user types the same first letters."""
+    
+    def __init__(self):
+        self._entries: Dict[str, Tuple[str, Any, str]] = {}
+        self._root: Dict[str, Any] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._memo: "OrderedDict[Tuple[str, int], List[Tuple[str, Any]]]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key) -> bool:
+        return str(key) in self._entries
+    
+    @staticmethod
+    def _word_starts(text: str) -> List[str]:
+        return [
+            text[i:i + AUTOCOMPLETE_TRIE_DEPTH] for i, char in enumerate(text)
+            if char.isalnum() and (i == 0 or not text[i - 1].isalnum())
+        ]
+    
+    @staticmethod
+    def _ngrams(text: str) -> Set[str]:
+        return {text[i:i + n] for n in (1, 2, 3) for i in range(len(text) - n + 1)}
+    
+    def add(self, key, label: Optional[str] = None, value: Any = None):
+        key = str(key)
+        label = str(label) if label else key
+        value = key if value is None else value
+        current = self._entries.get(key)
+        if current is not None:
+            if current[0] == label and current[1] == value:
+                return
+            self.discard(key)
+        
+        text = label.lower() if key.lower() in label.lower() else f"{label} {key}".lower()
+        self._entries[key] = (label, value, text)
+        self._memo.clear()
+        for segment in self._word_starts(text):
+            node = self._root
+            for char in segment:
+                node = node.setdefault(char, {})
+            node.setdefault("", set()).add(key)
+        for gram in self._ngrams(text):
+            self._grams.setdefault(gram, set()).add(key)
+    
+    def discard(self, key):
+        key = str(key)
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._memo.clear()
+        text = entry[2]
+        for segment in self._word_starts(text):
+            path = [self._root]
+            for char in segment:
+                child = path[-1].get(char)
+                if child is None:
+                    break
+                path.append(child)
+            else:
+                terminal = path[-1].get("")
+                if terminal is not None:
+                    terminal.discard(key)
+                    if not terminal:
+                        del path[-1][""]
+                for depth in range(len(segment) - 1, -1, -1):
+                    if path[depth + 1]:
+                        break
+                    del path[depth][segment[depth]]
+        for gram in self._ngrams(text):
+            postings = self._grams.get(gram)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._grams[gram]
+    
+    def replace(self, entries: Iterable[Tuple[Any, Optional[str], Any]]):
+        """Make the index hold exactly ``(key, label, value)`` entries, in that order, touching
+        only the entries that changed"""
+        wanted = {str(key): (label, value) for key, label, value in entries}
+        for key in [key for key in self._entries if key not in wanted]:
+            self.discard(key)
+        for key, (label, value) in wanted.items():
+            self.add(key, label, value)
+        if list(self._entries) != list(wanted):
+            self._entries = {key: self._entries[key] for key in wanted}
+            self._memo.clear()
+    
+    def search(self, current: str, limit: int = AUTOCOMPLETE_LIMIT) -> List[Tuple[str, Any]]:
+        """Top ``limit`` ``(label, value)`` pairs: exact, then label prefix, then word prefix,
+        then substring matches; shorter labels first within each rank"""
+        needle = current.strip().lower()
+        memo_key = (needle, limit)
+        results = self._memo.get(memo_key)
+        if results is None:
+            results = self._memo[memo_key] = self._search(needle, limit)
+            if len(self._memo) > AUTOCOMPLETE_MEMO_SIZE:
+                self._memo.popitem(last=False)
+        else:
+            self._memo.move_to_end(memo_key)
+        return results
+    
+    def _search(self, needle: str, limit: int) -> List[Tuple[str, Any]]:
+        if not needle:
+            return [(label, value) for label, value, _ in itertools.islice(self._entries.values(), limit)]
+        
+        prefixed: Set[str] = set()
+        if len(needle) <= AUTOCOMPLETE_TRIE_DEPTH:
+            node = self._root
+            for char in needle:
+                node = node.get(char)
+                if node is None:
+                    break
+            else:
+                level = [node]
+                while level and len(prefixed) < limit:
+                    next_level = []
+                    for node in level:
+                        for char, child in node.items():
+                            if char:
+                                next_level.append(child)
+                            else:
+                                prefixed.update(child)
+                    level = next_level
+        
+        found = set(prefixed)
+        if len(found) < limit:
+            size = min(3, len(needle))
+            postings = sorted(
+                (self._grams.get(needle[i:i + size], ()) for i in range(len(needle) - size + 1)),
+                key=len
+            )
+            if postings[0]:
+                candidates = set(postings[0]).intersection(*postings[1:]) - found
+                found.update(key for key in candidates if needle in self._entries[key][2])
+        
+        def rank(key):
+            label, value, text = self._entries[key]
+            if needle == key.lower() or needle == label.lower():
+                tier = 0
+            elif text.startswith(needle):
+                tier = 1
+            else:
+                tier = 2 if key in prefixed else 3
+            return (tier, len(label), label)
+        
+        return [self._entries[key][:2] for key in heapq.nsmallest(limit, found, key=rank)]
+
+
+class AutocompleteService:
+    """Named autocomplete sources, optionally split per scope (usually a guild id). Owners keep
+    entries current through ``index(name, scope)``; a registered loader fills a scope the first
+    time it is queried. Available as ``bot.autocomplete``."""
+    
+    def __init__(self):
+        self._indexes: Dict[Tuple[str, Any], AutocompleteIndex] = {}
+        self._loaders: Dict[str, Callable[[Any], Awaitable[None]]] = {}
+        self.queries = 0
+        self.query_time = 0.0
+    
+    def register(self, name: str, loader: Optional[Callable[[Any], Awaitable[None]]] = None):
+        if loader is not None:
+            self._loaders[name] = loader
+    
+    def unregister(self, name: str):
+        """Forget a source and all of its scopes (call from ``cog_unload``)"""
+        self._loaders.pop(name, None)
+        for key in [key for key in self._indexes if key[0] == name]:
+            del self._indexes[key]
+    
+    def index(self, name: str, scope: Any = None) -> AutocompleteIndex:
+        index = self._indexes.get((name, scope))
+        if index is None:
+            index = self._indexes[(name, scope)] = AutocompleteIndex()
+        return index
+    
+    async def search(self, name: str, current: str, scope: Any = None, limit: int = AUTOCOMPLETE_LIMIT) -> List[Tuple[str, Any]]:
+        index = self._indexes.get((name, scope))
+        if index is None:
+            loader = self._loaders.get(name)
+            if loader is None:
+                return []
+            try:
+                await loader(scope)
+            except Exception as e:
+                logger.debug(f"Autocomplete loader for '{name}' failed: {e}")
+                return []
+            index = self._indexes.get((name, scope))
+            if index is None:
+                return []
+        
+        started = time.perf_counter()
+        results = index.search(current, limit)
+        self.queries += 1
+        self.query_time += time.perf_counter() - started
+        return results
+    
+    async def choices(self, name: str, current: str, scope: Any = None, limit: int = AUTOCOMPLETE_LIMIT) -> List[app_commands.Choice]:
+        return [
+            app_commands.Choice(name=label[:100], value=value)
+            for label, value in await self.search(name, current, scope, limit)
+        ]
+    
+    def stats(self) -> Dict[str, Any]:
+        sources: Dict[str, Dict[str, int]] = {}
+        for (name, _), index in self._indexes.items():
+            source = sources.setdefault(name, {"scopes": 0, "entries": 0})
+            source["scopes"] += 1
+            source["entries"] += len(index)
+        return {
+            "sources": sources,
+            "loaders": sorted(self._loaders),
+            "queries": self.queries,
+            "avg_query_us": round(self.query_time / self.queries * 1e6, 1) if self.queries else 0.0,
+        }
+
+
+class HelpIndex:
+    """Help menu categories, sorted command lists and rendered page embeds. Marked stale
+    whenever a command is added or removed (extension load/unload, lazy stubs) and rebuilt on
+    the next read, so the menu never walks ``bot.commands`` per use."""
+    
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.version = 0
+        self.rebuilds = 0
+        self.page_hits = 0
+        self.page_misses = 0
+        self._built = -1
+        self._categories: Dict[str, Tuple[commands.Command, ...]] = {}
+        self._pages: "OrderedDict[Tuple[str, str, int], discord.Embed]" = OrderedDict()
+    
+    def invalidate(self):
+        self.version += 1
+    
+    def _ensure(self):
+        if self._built == self.version:
+            return
+        categories: Dict[str, Tuple[commands.Command, ...]] = {}
+        by_name = lambda cmd: cmd.name
+        
+        main_commands = sorted((cmd for cmd in self.bot.commands if cmd.cog is None and not cmd.hidden), key=by_name)
+        if main_commands:
+            categories["Main"] = tuple(main_commands)
+        
+        for cog_name, cog in self.bot.cogs.items():
+            cmds = sorted((cmd for cmd in cog.get_commands() if not cmd.hidden), key=by_name)
+            if cmds:
+                categories[cog_name] = tuple(cmds)
+        
+        self._categories = categories
+        self._pages.clear()
+        self._built = self.version
+        self.rebuilds += 1
+    
+    @property
+    def categories(self) -> Dict[str, Tuple[commands.Command, ...]]:
+        self._ensure()
+        return self._categories
+    
+    def total_pages(self, category: str) -> int:
+        return max(0, len(self.categories.get(category, ())) - 1) // HELP_PAGE_SIZE + 1
+    
+    def page(self, prefix: str, category: str, page: int) -> discord.Embed:
+        """Page embed for a category, rendered once per prefix and copied on every use"""
+        self._ensure()
+        key = (prefix, category, page)
+        embed = self._pages.get(key)
+        if embed is None:
+            self.page_misses += 1
+            embed = _create_command_page_embed(
+                prefix, category, self._categories.get(category, ()), page,
+                HELP_PAGE_SIZE, self.total_pages(category), self.bot
+            )
+            self._pages[key] = embed
+            if len(self._pages) > HELP_EMBED_CACHE_SIZE:
+                self._pages.popitem(last=False)
+        else:
+            self.page_hits += 1
+            self._pages.move_to_end(key)
+        embed = embed.copy()
+        embed.timestamp = discord.utils.utcnow()
+        return embed
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "rebuilds": self.rebuilds,
+            "categories": len(self._categories),
+            "cached_pages": len(self._pages),
+            "page_hits": self.page_hits,
+            "page_misses": self.page_misses,
+        }
+
+
 async def command_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
-    commands_list = [cmd.name for cmd in interaction.client.commands]
-    return [
-        app_commands.Choice(name=cmd, value=cmd)
-        for cmd in commands_list
-        if current.lower() in cmd.lower()
-    ][:25]
+    return await interaction.client.autocomplete.choices("commands", current)
+
+# Framework cogs and the cogs they must follow; anything else in ./cogs loads after all of these
+FRAMEWORK_COG_MANIFEST = {
+    "event_hooks": (),
+    "plugin_registry": ("event_hooks",),
+    "framework_diagnostics": ("event_hooks",),
+    "shard_monitor": ("event_hooks",),
+    "shard_manager": ("shard_monitor",),
+    "db_migrations": ("event_hooks",),
+    "task_scheduler": ("event_hooks",),
+    "config_validator": ("event_hooks",),
+}
+EXTENSION_IMPORT_WORKERS = int(os.getenv("EXTENSION_IMPORT_WORKERS", 4))
+
+def scan_extension_source(filepath: Path) -> Tuple[List[str], List[str]]:
+    """Module-level absolute imports and ``__dependencies__`` read from the source without executing it."""
+    tree = ast.parse(filepath.read_text(encoding="utf-8"), filename=str(filepath))
+    imports: List[str] = []
+    dependencies: List[str] = []
+    pending = list(tree.body)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, ast.Import):
+            imports.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level == 0 and node.module:
+                imports.append(node.module)
+        elif isinstance(node, ast.Try):
+            pending.extend(node.body + node.orelse + node.finalbody)
+            for handler in node.handlers:
+                pending.extend(handler.body)
+        elif isinstance(node, ast.If):
+            if not (isinstance(node.test, ast.Name) and node.test.id == "TYPE_CHECKING"):
+                pending.extend(node.body + node.orelse)
+        elif isinstance(node, ast.Assign):
+            if any(isinstance(t, ast.Name) and t.id == "__dependencies__" for t in node.targets):
+                try:
+                    value = ast.literal_eval(node.value)
+                except ValueError:
+                    continue
+                if isinstance(value, (dict, list, tuple, set)):
+                    dependencies = [str(dep) for dep in value]
+    
+    local = []
+    for name in imports:
+        top = name.split(".")[0]
+        if top in ("cogs", "extensions") or Path(f"{top}.py").exists() or Path(top, "__init__.py").exists():
+            local.append(name)
+    return [name for name in dict.fromkeys(imports) if name not in local], dependencies
+
+def prewarm_extension(filepath: Path, imports: List[str]) -> float:
+    """Runs on the import pool: byte-compiles a stale source and imports its third-party
+    modules so the following ``load_extension`` only has to execute the module body."""
+    start = time.perf_counter()
+    if not sys.dont_write_bytecode:
+        try:
+            cached = Path(importlib.util.cache_from_source(str(filepath)))
+            if not cached.exists() or cached.stat().st_mtime < filepath.stat().st_mtime:
+                py_compile.compile(str(filepath), cfile=str(cached), doraise=True)
+        except (py_compile.PyCompileError, OSError, ValueError):
+            pass  # load_extension reports the real error
+    
+    for name in imports:
+        if name in sys.modules:
+            continue
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            logger.debug(f"Import prewarm skipped {name} for {filepath.name}: {e}")
+    return time.perf_counter() - start
+
+def order_extensions(graph: Dict[str, Set[str]], priority: Dict[str, int]) -> Tuple[List[str], List[str]]:
+    """Kahn's algorithm over ``graph`` (module -> modules it needs); ties keep ``priority`` order.
+    Returns the load order and the modules left over because they sit on a cycle."""
+    indegree = {module: 0 for module in graph}
+    dependents = defaultdict(list)
+    for module, deps in graph.items():
+        for dep in deps:
+            if dep in graph and dep != module:
+                indegree[module] += 1
+                dependents[dep].append(module)
+    
+    ready = [(priority[module], module) for module, count in indegree.items() if count == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        _, module = heapq.heappop(ready)
+        order.append(module)
+        for dependent in dependents[module]:
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                heapq.heappush(ready, (priority[dependent], dependent))
+    
+    cyclic = sorted((module for module, count in indegree.items() if count > 0), key=priority.get)
+    return order, cyclic
+
+LAZY_COG_DEFAULTS = ["ZExtensionAI", "GeminiService", "GeminiServiceHelper", "backup_restore"]
+LAZY_MANIFEST_PATH = "./data/lazy_cogs.json"
+LAZY_INTERACTION_WAIT = 2.5
+
+class LazyAppCommand(app_commands.Command):
+    """Placeholder that syncs the captured schema of a deferred cog's global slash command"""
+
+    def __init__(self, payload: dict, callback):
+        super().__init__(name=payload["name"], description=payload.get("description") or "…", callback=callback)
+        self.payload = payload
+
+    def to_dict(self, tree) -> Dict[str, Any]:
+        return json.loads(json.dumps(self.payload))
+
+
+class LazyCogManager:
+    """Keeps heavy optional cogs unimported until first use. The commands of each cog are
+    captured from a real load into ``data/lazy_cogs.json`` and replayed as stubs on later
+    boots while the source file is unchanged; otherwise the cog loads eagerly and is captured."""
+
+    def __init__(self, bot: "BotFrameWork"):
+        self.bot = bot
+        self.modules: Set[str] = set()
+        self.idle_seconds = 0.0
+        self.manifest: Dict[str, dict] = {}
+        self.stubbed: Dict[str, List[Any]] = {}
+        self.prefix_owner: Dict[str, str] = {}
+        self.app_owner: Dict[str, str] = {}
+        self.cog_owner: Dict[str, str] = {}
+        self.last_used: Dict[str, float] = {}
+        self.stats = {"stubbed_boot": 0, "loads": 0, "unloads": 0, "load_failures": 0}
+        self._loading: Dict[str, asyncio.Task] = {}
+
+    async def initialize(self, names: List[str], idle_minutes: float):
+        self.modules = {f"cogs.{name}" for name in names}
+        self.idle_seconds = max(0.0, idle_minutes) * 60
+        self.manifest = await global_file_handler.atomic_read_json(LAZY_MANIFEST_PATH) or {}
+        for module, entry in self.manifest.items():
+            if module in self.modules:
+                self._index(module, entry)
+        if self.modules and not self.idle_sweeper.is_running():
+            self.idle_sweeper.start()
+
+    @staticmethod
+    def _source(module: str) -> Path:
+        return Path(*module.split(".")).with_suffix(".py")
+
+    def _signature(self, module: str) -> str:
+        stat = self._source(module).stat()
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def _index(self, module: str, entry: dict):
+        for command in entry.get("prefix", []):
+            for name in [command["name"], *command.get("aliases", [])]:
+                self.prefix_owner[name] = module
+        for payload in entry.get("app", []):
+            self.app_owner[payload["name"]] = module
+        for cog_name in entry.get("cogs", []):
+            self.cog_owner[cog_name] = module
+
+    def can_defer(self, module: str) -> bool:
+        entry = self.manifest.get(module)
+        if not entry or entry.get("resident"):
+            return False
+        try:
+            return entry.get("signature") == self._signature(module)
+        except OSError:
+            return False
+
+    def _cogs_of(self, module: str) -> List[commands.Cog]:
+        return [cog for cog in self.bot.cogs.values() if cog.__module__ == module]
+
+    def _must_stay(self, module: str) -> bool:
+        for cog in self._cogs_of(module):
+            check = getattr(cog, "lazy_unload_ok", None)
+            if callable(check) and not check():
+                return True
+        return False
+
+    def _idle_unload_ok(self, module: str) -> bool:
+        # Opt-in: a cog holding in-memory state (chat sessions, reply context) without a
+        # lazy_unload_ok() hook is only deferred at boot, never unloaded while idle.
+        cogs = self._cogs_of(module)
+        return bool(cogs) and all(callable(getattr(cog, "lazy_unload_ok", None)) for cog in cogs)
+
+    async def capture(self, module: str):
+        """Record the command shapes of a loaded cog so the next boot can stub it"""
+        cogs = self._cogs_of(module)
+        previous = self.manifest.get(module, {})
+        entry = {
+            "signature": self._signature(module),
+            "cogs": [cog.qualified_name for cog in cogs],
+            "prefix": [
+                {"name": cmd.name, "aliases": list(cmd.aliases), "help": cmd.short_doc, "hidden": cmd.hidden}
+                for cog in cogs for cmd in cog.get_commands()
+            ],
+            "app": [cmd.to_dict(self.bot.tree) for cmd in self.bot.tree.get_commands() if getattr(cmd, "module", None) == module],
+            "resident": self._must_stay(module),
+        }
+        self.manifest[module] = entry
+        self._index(module, entry)
+        self.last_used.setdefault(module, time.time())
+        if entry != previous:
+            await global_file_handler.atomic_write_json(LAZY_MANIFEST_PATH, self.manifest)
+        if previous and previous.get("app") != entry["app"] and self.bot.is_ready():
+            logger.info(f"Lazy cog {module} changed its slash commands, resyncing")
+            await self.bot.sync_commands(force=True)
+
+    def install_stubs(self, module: str):
+        entry = self.manifest[module]
+        installed = []
+        
+        for command in entry["prefix"]:
+            stub = commands.Command(
+                self._prefix_stub(module), name=command["name"], aliases=command.get("aliases", []),
+                help=command.get("help") or None, hidden=command.get("hidden", False)
+            )
+            self.bot.add_command(stub)
+            installed.append(stub)
+        
+        for payload in entry["app"]:
+            async def app_stub(interaction: discord.Interaction):
+                await interaction.response.send_message("⏳ This command is still loading, try again.", ephemeral=True)
+            stub = LazyAppCommand(payload, app_stub)
+            self.bot.tree.add_command(stub)
+            installed.append(stub)
+        
+        self.stubbed[module] = installed
+
+    def _prefix_stub(self, module: str):
+        async def prefix_stub(ctx, *, arguments: str = None):
+            await self._invoke_prefix(ctx, module)
+        return prefix_stub
+
+    def remove_stubs(self, module: str):
+        for stub in self.stubbed.pop(module, []):
+            if isinstance(stub, LazyAppCommand):
+                self.bot.tree.remove_command(stub.name)
+            else:
+                self.bot.remove_command(stub.name)
+
+    def touch(self, module: Optional[str]):
+        if module in self.last_used:
+            self.last_used[module] = time.time()
+
+    async def ensure_loaded(self, module: str) -> bool:
+        """Load a deferred cog (once, even under concurrent callers); True when it is loaded"""
+        if module in self.bot.extensions:
+            self.touch(module)
+            return True
+        task = self._loading.get(module)
+        if task is None:
+            task = self._loading[module] = asyncio.create_task(self._load(module))
+            task.add_done_callback(lambda _t, m=module: self._loading.pop(m, None))
+        return await asyncio.shield(task)
+
+    async def _load(self, module: str) -> bool:
+        self.remove_stubs(module)
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            source = self._source(module)
+            imports, _ = await loop.run_in_executor(None, scan_extension_source, source)
+            import_time = await loop.run_in_executor(None, prewarm_extension, source, imports)
+            setup_start = time.perf_counter()
+            await self.bot.load_extension(module)
+        except Exception as e:
+            self.stats["load_failures"] += 1
+            logger.error(f"Failed loading deferred cog {module}: {e}")
+            if module in self.manifest:
+                self.install_stubs(module)
+            return False
+        
+        self.bot.extension_load_phases[module] = {"import": round(import_time, 4), "setup": round(time.perf_counter() - setup_start, 4)}
+        self.bot.extension_load_times[module] = time.perf_counter() - start
+        self.stats["loads"] += 1
+        self.last_used[module] = time.time()
+        logger.info(f"Deferred cog loaded on first use: {module} ({time.perf_counter() - start:.2f}s)")
+        await self.capture(module)
+        if hasattr(self.bot, 'emit_hook'):
+            await self.bot.emit_hook("extension_loaded", extension_name=module)
+        return True
+
+    async def _invoke_prefix(self, ctx: commands.Context, module: str):
+        if not await self.ensure_loaded(module):
+            await ctx.send("❌ This module failed to load. Check the bot logs.")
+            return
+        real_ctx = await self.bot.get_context(ctx.message)
+        if real_ctx.command is None or real_ctx.command.cog is None:
+            await ctx.send("❌ This command is no longer provided by its module.")
+            return
+        # on_command was already dispatched for the stub, so run the real command directly
+        # instead of through Bot.invoke. The stub's timer moves over so the latency (load
+        # included) is recorded once, against the real command.
+        real_ctx.timer, ctx.timer = getattr(ctx, "timer", None), None
+        try:
+            await real_ctx.command.invoke(real_ctx)
+        except commands.CommandError as exc:
+            ctx.command_failed = True
+            await real_ctx.command.dispatch_error(real_ctx, exc)
+
+    async def route_interaction(self, interaction: discord.Interaction) -> bool:
+        """Called from the tree's interaction_check: loads the owning cog of a stubbed slash command"""
+        if interaction.type not in (discord.InteractionType.application_command, discord.InteractionType.autocomplete):
+            return True
+        module = self.app_owner.get((interaction.data or {}).get("name"))
+        if module is None:
+            return True
+        if module in self.bot.extensions:
+            self.touch(module)
+            return True
+        
+        try:
+            loaded = await asyncio.wait_for(self.ensure_loaded(module), timeout=LAZY_INTERACTION_WAIT)
+        except asyncio.TimeoutError:
+            loaded = None
+        if loaded:
+            return True
+        
+        if interaction.type is discord.InteractionType.autocomplete:
+            await interaction.response.autocomplete([])
+        elif loaded is None:
+            await interaction.response.send_message("⏳ This module is starting up, try again in a few seconds.", ephemeral=True)
+        else:
+            await interaction.response.send_message("❌ This module failed to load. Check the bot logs.", ephemeral=True)
+        return False
+
+    async def ensure_cog(self, cog_name: str) -> Optional[commands.Cog]:
+        module = self.cog_owner.get(cog_name)
+        if module is not None and module not in self.bot.extensions:
+            await self.ensure_loaded(module)
+        cog = self.bot.get_cog(cog_name)
+        if cog is not None:
+            self.touch(cog.__module__)
+        return cog
+
+    @tasks.loop(minutes=1)
+    async def idle_sweeper(self):
+        now = time.time()
+        for module, used in list(self.last_used.items()):
+            if module not in self.bot.extensions:
+                continue
+            must_stay = self._must_stay(module)
+            if must_stay != bool(self.manifest.get(module, {}).get("resident")):
+                await self.capture(module)
+            if must_stay or not self.idle_seconds or now - used < self.idle_seconds:
+                continue
+            if not self._idle_unload_ok(module):
+                continue
+            
+            try:
+                await self.bot.unload_extension(module)
+            except Exception as e:
+                logger.error(f"Failed idle-unloading {module}: {e}")
+                continue
+            
+            self.install_stubs(module)
+            self.stats["unloads"] += 1
+            logger.info(f"Unloaded idle cog {module} after {(now - used) / 60:.0f} min")
+            if hasattr(self.bot, 'emit_hook'):
+                await self.bot.emit_hook("extension_unloaded", extension_name=module)
+
+    @idle_sweeper.before_loop
+    async def before_idle_sweeper(self):
+        await self.bot.wait_until_ready()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": bool(self.modules),
+            "idle_unload_minutes": self.idle_seconds / 60,
+            "modules": {
+                module: {
+                    "loaded": module in self.bot.extensions,
+                    "stubbed": module in self.stubbed,
+                    "resident": bool(self.manifest.get(module, {}).get("resident")),
+                    "idle_seconds": round(time.time() - self.last_used[module]) if module in self.last_used else None,
+                }
+                for module in sorted(self.modules)
+            },
+            **self.stats,
+        }
+
+
+HOT_RELOAD_DEBOUNCE = 0.5
+HOT_RELOAD_POLL_INTERVAL = 2.0
+INOTIFY_MASK = 0x00000002 | 0x00000008 | 0x00000080  # IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO
+
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    _INOTIFY_OK = sys.platform.startswith("linux") and hasattr(_libc, "inotify_init1")
+except OSError:
+    _libc = None
+    _INOTIFY_OK = False
+
+class ExtensionWatcher:
+    """Hot reload for ``extensions/*.py``. Changes arrive from inotify (a stat poll where inotify
+    is unavailable) and are debounced. A module is reloaded only when its content hash differs
+    from the source that was last loaded, followed by its dependents from the Plugin Registry."""
+    
+    def __init__(self, bot: commands.Bot, path: str = "./extensions"):
+        self.bot = bot
+        self.path = Path(path)
+        self.hashes: Dict[str, str] = {}
+        self.mode: Optional[str] = None
+        self.reloads = 0
+        self.unchanged = 0
+        self.failures = 0
+        self.last_batch: List[str] = []
+        self._pending: Set[str] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._poll_task: Optional[asyncio.Task] = None
+        self._fd: Optional[int] = None
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    @staticmethod
+    def file_hash(filepath: Path) -> Optional[str]:
+        try:
+            return hashlib.sha256(filepath.read_bytes()).hexdigest()
+        except OSError:
+            return None
+    
+    def source_hash(self, module: str) -> Optional[str]:
+        if not module.startswith("extensions."):
+            return None
+        return self.file_hash(self.path / f"{module.split('.', 1)[1]}.py")
+    
+    def record(self, module: str, digest: Optional[str] = None):
+        """Remember the hash of the source a module was (re)loaded from. ``digest`` is taken
+        before loading; if the file changed while the load ran, the module is queued again."""
+        if not module.startswith("extensions."):
+            return
+        current = self.source_hash(module)
+        digest = digest or current
+        if digest:
+            self.hashes[module] = digest
+        if self.running and current and current != digest:
+            self._pending.add(module.split(".", 1)[1])
+            self._wakeup.set()
+    
+    def forget(self, module: str):
+        self.hashes.pop(module, None)
+    
+    def start(self):
+        if self.running or not self.path.exists():
+            return
+        for module in self.bot.extensions:
+            if module.startswith("extensions.") and module not in self.hashes:
+                self.record(module)
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        if _INOTIFY_OK and self._start_inotify():
+            self.mode = "inotify"
+        else:
+            self.mode = "poll"
+            self._poll_task = asyncio.create_task(self._poll())
+        logger.info(f"Extension hot reload enabled ({self.mode})")
+    
+    def stop(self):
+        for task in (self._task, self._poll_task):
+            if task is not None:
+                task.cancel()
+        self._task = self._poll_task = None
+        if self._fd is not None:
+            try:
+                asyncio.get_running_loop().remove_reader(self._fd)
+            except RuntimeError:
+                pass
+            os.close(self._fd)
+            self._fd = None
+        if self.mode:
+            logger.info("Extension hot reload disabled")
+        self.mode = None
+    
+    def _start_inotify(self) -> bool:
+        fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            logger.warning(f"inotify unavailable ({os.strerror(ctypes.get_errno())}), polling instead")
+            return False
+        if _libc.inotify_add_watch(fd, str(self.path.resolve()).encode(), INOTIFY_MASK) < 0:
+            logger.warning(f"Cannot watch {self.path} ({os.strerror(ctypes.get_errno())}), polling instead")
+            os.close(fd)
+            return False
+        asyncio.get_running_loop().add_reader(fd, self._read_inotify)
+        self._fd = fd
+        return True
+    
+    def _read_inotify(self):
+        try:
+            data = os.read(self._fd, 65536)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + 16 <= len(data):
+            _, _, _, length = struct.unpack_from("iIII", data, offset)
+            name = data[offset + 16:offset + 16 + length].rstrip(b"\0").decode(errors="replace")
+            offset += 16 + length
+            if name.endswith(".py"):
+                self._pending.add(name[:-3])
+        if self._pending:
+            self._wakeup.set()
+    
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        stats = {}
+        try:
+            with os.scandir(self.path) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".py") and entry.is_file():
+                        stat = entry.stat()
+                        stats[entry.name[:-3]] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            pass
+        return stats
+    
+    async def _poll(self):
+        known = self._scan()
+        while True:
+            await asyncio.sleep(HOT_RELOAD_POLL_INTERVAL)
+            current = self._scan()
+            self._pending.update(stem for stem, stat in current.items() if known.get(stem) != stat)
+            known = current
+            if self._pending:
+                self._wakeup.set()
+    
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            # Editors write in bursts; wait for a quiet period before reloading
+            while True:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), HOT_RELOAD_DEBOUNCE)
+                except asyncio.TimeoutError:
+                    break
+            stems, self._pending = self._pending, set()
+            try:
+                await self.reload_changed(stems)
+            except Exception as e:
+                logger.error(f"Hot reload failed: {e}")
+                logger.debug(traceback.format_exc())
+    
+    def _dependency_graph(self) -> Dict[str, Set[str]]:
+        get_all_plugins = getattr(self.bot, "get_all_plugins", None)
+        plugins = get_all_plugins() if get_all_plugins else {}
+        return {
+            f"extensions.{name}": {f"extensions.{dep}" for dep in metadata.dependencies}
+            for name, metadata in plugins.items()
+        }
+    
+    async def reload_changed(self, stems: Iterable[str]) -> List[str]:
+        """Reload the loaded extensions among ``stems`` whose source changed, then their
+        dependents, in dependency order. Returns the modules that were reloaded."""
+        changed = []
+        for stem in sorted(stems):
+            module = f"extensions.{stem}"
+            if module not in self.bot.extensions:
+                continue
+            digest = self.file_hash(self.path / f"{stem}.py")
+            if digest is None or digest == self.hashes.get(module):
+                self.unchanged += 1
+                continue
+            changed.append(module)
+        if not changed:
+            return []
+        
+        requires = self._dependency_graph()
+        dependents = defaultdict(set)
+        for module, deps in requires.items():
+            for dep in deps:
+                dependents[dep].add(module)
+        targets = set(changed)
+        stack = list(changed)
+        while stack:
+            for dependent in dependents[stack.pop()]:
+                if dependent not in targets and dependent in self.bot.extensions:
+                    targets.add(dependent)
+                    stack.append(dependent)
+        
+        graph = {module: requires.get(module, set()) & targets for module in targets}
+        order, cyclic = order_extensions(graph, {module: index for index, module in enumerate(sorted(targets))})
+        
+        reloaded: List[str] = []
+        failed: Set[str] = set()
+        for module in order + cyclic:
+            stem = module.split(".", 1)[1]
+            if module not in changed and graph[module] & failed:
+                logger.warning(f"Skipped reloading {stem}.py: a dependency failed to reload")
+                failed.add(module)
+                continue
+            try:
+                await self.bot.reload_extension(module)
+            except Exception as e:
+                self.failures += 1
+                failed.add(module)
+                logger.error(f"Failed to reload {stem}.py: {e}")
+                continue
+            self.reloads += 1
+            reloaded.append(module)
+            logger.info(f"Hot-reloaded: {stem}.py" + ("" if module in changed else " (dependent)"))
+            if hasattr(self.bot, 'emit_hook'):
+                await self.bot.emit_hook("extension_loaded", extension_name=module)
+        
+        self.last_batch = reloaded
+        return reloaded
+    
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.running,
+            "mode": self.mode,
+            "tracked": len(self.hashes),
+            "reloads": self.reloads,
+            "unchanged_skipped": self.unchanged,
+            "failures": self.failures,
+            "last_batch": [module.split(".", 1)[1] for module in self.last_batch],
+        }
+
 
 class BotFrameWork(commands.AutoShardedBot):
     def __init__(self, *args, **kwargs):
+        kwargs.setdefault("tree_cls", FrameworkCommandTree)
+        self.help_index = HelpIndex(self)
+        self.autocomplete = AutocompleteService()
         super().__init__(*args, **kwargs)
         self.config: Optional[SafeConfig] = None
         self.db: Optional[SafeDatabaseManager] = None
         self.metrics = MetricsCollector()
         self.prefix_cache = PrefixCache(ttl=600)
+        self.permissions = PermissionResolver()
+        self.log_limiter = log_rate_limiter
         self.extension_load_times: Dict[str, float] = {}
-        self.last_extension_check = time.time()
+        self.extension_load_phases: Dict[str, Dict[str, float]] = {}
+        self.lazy_cogs = LazyCogManager(self)
+        self.extension_watcher = ExtensionWatcher(self)
         self._shutdown_event = asyncio.Event()
         self._slash_synced = False
         self.bot_owner_id = BOT_OWNER_ID
+        self.before_invoke(self._timing_before_invoke)
+        self.after_invoke(self._timing_after_invoke)
+
+    async def _load_extension_graph(self, modules: Dict[str, Path], requires: Dict[str, Set[str]] = None):
+        """Prewarms every module's imports concurrently on a thread pool, then runs each
+        ``setup()`` on the loop in dependency order. Yields ``(module, error)`` per module."""
+        requires = requires or {}
+        loop = asyncio.get_running_loop()
+        pool = ThreadPoolExecutor(max_workers=max(1, EXTENSION_IMPORT_WORKERS), thread_name_prefix="zdbf-import")
+        
+        try:
+            scans = await asyncio.gather(
+                *(loop.run_in_executor(pool, scan_extension_source, path) for path in modules.values()),
+                return_exceptions=True
+            )
+            
+            by_stem = {module.rsplit(".", 1)[-1]: module for module in modules}
+            graph: Dict[str, Set[str]] = {}
+            prewarms = {}
+            for (module, path), scan in zip(modules.items(), scans):
+                imports, declared = ([], []) if isinstance(scan, BaseException) else scan
+                graph[module] = set(requires.get(module, ())) | {by_stem.get(dep, dep) for dep in declared}
+                prewarms[module] = loop.run_in_executor(pool, prewarm_extension, path, imports)
+            
+            priority = {module: index for index, module in enumerate(modules)}
+            order, cyclic = order_extensions(graph, priority)
+            if cyclic:
+                logger.warning(f"Dependency cycle between {', '.join(cyclic)}; loading them in directory order")
+            
+            failed: Set[str] = set()
+            for module in order + cyclic:
+                import_time = await prewarms[module]
+                missing = sorted(graph[module] & failed)
+                if missing:
+                    logger.warning(f"Loading {module} although its dependencies failed: {', '.join(missing)}")
+                
+                start = time.perf_counter()
+                try:
+                    await self.load_extension(module)
+                except Exception as e:
+                    failed.add(module)
+                    yield module, e
+                    continue
+                
+                setup_time = time.perf_counter() - start
+                self.extension_load_phases[module] = {"import": round(import_time, 4), "setup": round(setup_time, 4)}
+                yield module, None
+        finally:
+            pool.shutdown(wait=False)
 
     async def load_framework_cogs(self):
         loaded = 0
@@ -219,49 +1449,55 @@ class BotFrameWork(commands.AutoShardedBot):
             logger.info("Created cogs directory for framework modules")
             return
         
-        load_order = ["event_hooks", "plugin_registry", "framework_diagnostics", "shard_monitor", "shard_manager", "db_migrations", "task_scheduler", "config_validator"]
+        modules: Dict[str, Path] = {}
+        requires: Dict[str, Set[str]] = {}
+        discovered = [name for name in FRAMEWORK_COG_MANIFEST if (cogs_path / f"{name}.py").exists()]
+        discovered += [filepath.stem for filepath in cogs_path.glob("*.py") if filepath.stem not in FRAMEWORK_COG_MANIFEST]
         
-        for cog_name in load_order:
-            cog_file = cogs_path / f"{cog_name}.py"
-            if not cog_file.exists():
-                continue
-            
+        for cog_name in discovered:
             if not self.config.get(f"framework.enable_{cog_name}", True):
                 logger.info(f"Framework cog disabled in config: {cog_name}")
                 continue
             
-            try:
-                await self.load_extension(f"cogs.{cog_name}")
-                logger.info(f"Framework cog loaded: {cog_name}")
-                loaded += 1
-            except Exception as e:
-                logger.error(f"Failed loading framework cog {cog_name}: {e}")
-                logger.debug(traceback.format_exc())
-                failed += 1
+            module = f"cogs.{cog_name}"
+            if module in self.lazy_cogs.modules and self.lazy_cogs.can_defer(module):
+                self.lazy_cogs.install_stubs(module)
+                self.lazy_cogs.stats["stubbed_boot"] += 1
+                logger.info(f"Framework cog deferred until first use: {cog_name} ({len(self.lazy_cogs.stubbed[module])} command stubs)")
+                continue
+            modules[module] = cogs_path / f"{cog_name}.py"
         
-        for filepath in cogs_path.glob("*.py"):
-            cog_name = filepath.stem
-            if cog_name in load_order:
+        core = {module for module in modules if module[5:] in FRAMEWORK_COG_MANIFEST}
+        for module in modules:
+            if module in core:
+                requires[module] = {f"cogs.{dep}" for dep in FRAMEWORK_COG_MANIFEST[module[5:]]}
+            else:
+                requires[module] = core
+        
+        started = time.perf_counter()
+        async for module, error in self._load_extension_graph(modules, requires):
+            cog_name = module[5:]
+            if error is not None:
+                logger.error(f"Failed loading framework cog {cog_name}: {error}")
+                logger.debug("".join(traceback.format_exception(error)))
+                failed += 1
                 continue
             
-            if not self.config.get(f"framework.enable_{cog_name}", True):
-                logger.info(f"Framework cog disabled in config: {cog_name}")
-                continue
+            phases = self.extension_load_phases[module]
+            self.extension_load_times[module] = phases["import"] + phases["setup"]
+            logger.info(f"Framework cog loaded: {cog_name} (import {phases['import']:.3f}s, setup {phases['setup']:.3f}s)")
+            loaded += 1
             
-            try:
-                await self.load_extension(f"cogs.{cog_name}")
-                logger.info(f"Framework cog loaded: {cog_name}")
-                loaded += 1
-            except Exception as e:
-                logger.error(f"Failed loading framework cog {cog_name}: {e}")
-                logger.debug(traceback.format_exc())
-                failed += 1
+            if module in self.lazy_cogs.modules:
+                await self.lazy_cogs.capture(module)
         
-        logger.info(f"Framework cogs: {loaded} loaded, {failed} failed")
+        logger.info(f"Framework cogs: {loaded} loaded, {failed} failed ({time.perf_counter() - started:.2f}s)")
 
 
 
     async def cleanup_pycache(self):
+        """Remove bytecode whose source file is gone. Current bytecode is kept so restarts and
+        reloads skip recompiling; Python already rewrites it whenever a source changes."""
         cleaned = 0
         try:
             base_dirs = [Path("./"), Path("./extensions"), Path("./cogs")]
@@ -270,16 +1506,22 @@ class BotFrameWork(commands.AutoShardedBot):
                 if not base_dir.exists():
                     continue
                 
-                for pycache_dir in base_dir.rglob("__pycache__"):
-                    try:
-                        shutil.rmtree(pycache_dir)
-                        cleaned += 1
-                        logger.debug(f"Cleaned pycache: {pycache_dir}")
-                    except Exception as e:
-                        logger.error(f"Failed to clean {pycache_dir}: {e}")
+                pycache_dirs = [base_dir / "__pycache__"] if base_dir == Path("./") else base_dir.rglob("__pycache__")
+                for pycache_dir in pycache_dirs:
+                    if not pycache_dir.is_dir():
+                        continue
+                    for cached in pycache_dir.glob("*.pyc"):
+                        if (pycache_dir.parent / f"{cached.name.split('.', 1)[0]}.py").exists():
+                            continue
+                        try:
+                            cached.unlink()
+                            cleaned += 1
+                            logger.debug(f"Removed stale bytecode: {cached}")
+                        except Exception as e:
+                            logger.error(f"Failed to remove {cached}: {e}")
             
             if cleaned > 0:
-                logger.info(f"Cleaned up {cleaned} __pycache__ directories")
+                logger.info(f"Removed {cleaned} stale bytecode files")
             
             return cleaned
         except Exception as e:
@@ -301,7 +1543,7 @@ class BotFrameWork(commands.AutoShardedBot):
             
             cleaned = await self.cleanup_pycache()
             
-            logger.debug(f"Database maintenance completed (cleaned {cleaned} pycache dirs)")
+            logger.debug(f"Database maintenance completed (removed {cleaned} stale bytecode files)")
 
     @db_maintenance_task.before_loop
     async def before_db_maintenance(self):
@@ -310,6 +1552,17 @@ class BotFrameWork(commands.AutoShardedBot):
     async def setup_hook(self):
         self.config = SafeConfig(file_handler=global_file_handler)
         await self.config.initialize()
+        self.permissions.attach(self.config)
+        self.config.subscribe("prefix", self.prefix_cache.clear)
+        self.config.subscribe("allow_mention_prefix", self.prefix_cache.clear)
+        log_rate_limiter.configure(self.config.get("logging.rate_limits"))
+        self.config.subscribe("logging.rate_limits", lambda key, value: log_rate_limiter.configure(self.config.get("logging.rate_limits")))
+        
+        if self.config.get("framework.lazy_load", False):
+            await self.lazy_cogs.initialize(
+                self.config.get("framework.lazy_cogs", LAZY_COG_DEFAULTS),
+                float(self.config.get("framework.lazy_idle_minutes", 0))
+            )
         
         base_db_path = self.config.get("database.base_path", "./data")
         self.db = SafeDatabaseManager(base_db_path)
@@ -324,9 +1577,11 @@ class BotFrameWork(commands.AutoShardedBot):
         self.status_update_task.start()
         
         if self.config.get("auto_reload", False):
-            self.extension_reloader.start()
+            self.extension_watcher.start()
+        self.config.subscribe("auto_reload", self._on_auto_reload_change)
         
         self.log_rotation_task.start()
+        self.log_summary_task.start()
         self.db_maintenance_task.start()
 
         # Manually load the atomic_file_system cog from the root directory (Mainly for GeminiService.py)
@@ -356,6 +1611,7 @@ class BotFrameWork(commands.AutoShardedBot):
             logger.warning("Created extensions directory")
             return
         
+        modules: Dict[str, Path] = {}
         for filepath in list(extensions_path.glob("*.py")):
             ext_name = filepath.stem
             original_filepath = filepath
@@ -382,47 +1638,58 @@ class BotFrameWork(commands.AutoShardedBot):
                 logger.info(f"Skipped blacklisted: {filepath.name}")
                 continue
             
-            try:
-                start_time = time.time()
-                await self.load_extension(f"extensions.{ext_name}")
-                load_time = time.time() - start_time
-                self.extension_load_times[ext_name] = load_time
-                logger.info(f"Extension loaded: {ext_name}.py ({load_time:.3f}s)")
-                
-                if hasattr(self, 'emit_hook'):
-                    await self.emit_hook("extension_loaded", extension_name=f"extensions.{ext_name}")
-                
-                loaded += 1
-            except Exception as e:
-                logger.error(f"Failed loading {ext_name}.py: {e}")
-                logger.debug(traceback.format_exc())
+            modules[f"extensions.{ext_name}"] = filepath
+        
+        started = time.perf_counter()
+        async for module, error in self._load_extension_graph(modules):
+            ext_name = module[11:]
+            if error is not None:
+                logger.error(f"Failed loading {ext_name}.py: {error}")
+                logger.debug("".join(traceback.format_exception(error)))
                 failed += 1
-        
-        logger.info(f"Extensions: {loaded} loaded, {failed} failed")
-    
-    @tasks.loop(seconds=30)
-    async def extension_reloader(self):
-        extensions_path = Path("./extensions")
-        if not extensions_path.exists():
-            return
-        
-        for filepath in extensions_path.glob("*.py"):
-            ext_name = f"extensions.{filepath.stem}"
-            file_mtime = filepath.stat().st_mtime
+                continue
             
-            if file_mtime > self.last_extension_check and ext_name in self.extensions:
-                try:
-                    await self.reload_extension(ext_name)
-                    logger.info(f"Hot-reloaded: {filepath.name}")
-                    self.extension_load_times[filepath.stem] = time.time() - self.last_extension_check
-                except Exception as e:
-                    logger.error(f"Failed to reload {filepath.name}: {e}")
+            phases = self.extension_load_phases[module]
+            load_time = phases["import"] + phases["setup"]
+            self.extension_load_times[module] = load_time
+            logger.info(f"Extension loaded: {ext_name}.py ({load_time:.3f}s, setup {phases['setup']:.3f}s)")
+            
+            if hasattr(self, 'emit_hook'):
+                await self.emit_hook("extension_loaded", extension_name=module)
+            
+            loaded += 1
         
-        self.last_extension_check = time.time()
+        logger.info(f"Extensions: {loaded} loaded, {failed} failed ({time.perf_counter() - started:.2f}s)")
     
-    @extension_reloader.before_loop
-    async def before_extension_reloader(self):
-        await self.wait_until_ready()
+    def _on_auto_reload_change(self, key: str, value: Any):
+        if self.config.get("auto_reload", False):
+            self.extension_watcher.start()
+        else:
+            self.extension_watcher.stop()
+    
+    # extension_load_times / extension_load_phases are keyed by full module path
+    # ("cogs.x", "extensions.x"), the same keys as self.extensions.
+    async def load_extension(self, name: str, *, package: Optional[str] = None):
+        digest = self.extension_watcher.source_hash(name)
+        start = time.perf_counter()
+        await super().load_extension(name, package=package)
+        self.extension_load_times[name] = time.perf_counter() - start
+        self.extension_watcher.record(name, digest)
+        self.permissions.refresh_owner_only()
+    
+    async def reload_extension(self, name: str, *, package: Optional[str] = None):
+        digest = self.extension_watcher.source_hash(name)
+        start = time.perf_counter()
+        await super().reload_extension(name, package=package)
+        self.extension_load_times[name] = time.perf_counter() - start
+        self.extension_watcher.record(name, digest)
+        self.permissions.refresh_owner_only()
+    
+    async def unload_extension(self, name: str, *, package: Optional[str] = None):
+        await super().unload_extension(name, package=package)
+        self.extension_load_times.pop(name, None)
+        self.extension_load_phases.pop(name, None)
+        self.extension_watcher.forget(name)
     
     @tasks.loop(hours=1)
     async def log_rotation_task(self):
@@ -437,6 +1704,11 @@ class BotFrameWork(commands.AutoShardedBot):
     async def before_log_rotation(self):
         await self.wait_until_ready()
     
+    @tasks.loop(minutes=1)
+    async def log_summary_task(self):
+        for path, line, count in log_rate_limiter.flush():
+            logger.info(f"Log limiter: suppressed {count} similar messages from {Path(path).name}:{line}")
+    
     @tasks.loop(minutes=5)
     async def status_update_task(self):
         try:
@@ -500,27 +1772,95 @@ class BotFrameWork(commands.AutoShardedBot):
     async def before_status_update(self):
         await self.wait_until_ready()
     
-    async def get_prefix(self, message: discord.Message):
-        if not message.guild:
-            base_prefix = self.config.get("prefix", "!")
-            allow_mention = self.config.get("allow_mention_prefix", True)
-        else:
-            cached = await self.prefix_cache.get(message.guild.id)
-            if cached:
-                base_prefix, allow_mention = cached
+    async def get_context(self, origin, /, *, cls=FrameworkContext):
+        start = time.perf_counter()
+        ctx = await super().get_context(origin, cls=cls)
+        if isinstance(ctx, FrameworkContext):
+            if ctx.interaction is not None:
+                ctx.timer = CommandTimer(ctx.interaction.extras.get("zdbf_received", start), "slash")
             else:
-                custom_prefix = await self.db.get_guild_prefix(message.guild.id)
-                base_prefix = custom_prefix if custom_prefix else self.config.get("prefix", "!")
-                allow_mention = await self.db.get_guild_mention_prefix_enabled(message.guild.id)
-                if allow_mention is None:
-                    allow_mention = self.config.get("allow_mention_prefix", True)
-                await self.prefix_cache.set(message.guild.id, base_prefix, allow_mention)
+                ctx.timer = CommandTimer(start, "prefix")
+        return ctx
+
+    async def can_run(self, ctx, /, *, call_once: bool = False) -> bool:
+        # Global checks run first inside Command.can_run, so this marks the
+        # start of the check/conversion phase for the invocation.
+        timer = getattr(ctx, "timer", None)
+        if timer is not None and not call_once and timer.checks is None:
+            timer.checks = time.perf_counter()
+        return await super().can_run(ctx, call_once=call_once)
+
+    async def _timing_before_invoke(self, ctx):
+        timer = getattr(ctx, "timer", None)
+        if timer is not None:
+            timer.prepared = time.perf_counter()
+        self.lazy_cogs.touch(getattr(ctx.cog, "__module__", None))
+
+    async def _timing_after_invoke(self, ctx):
+        timer = getattr(ctx, "timer", None)
+        if timer is None or timer.finished is not None or ctx.command is None:
+            return
+        timer.finished = time.perf_counter()
+        self.metrics.record_command_timing(ctx.command.qualified_name, timer.kind, timer.phases())
+        if ctx.interaction is not None:
+            ctx.interaction.extras["zdbf_timed"] = True
+
+    def add_command(self, command: commands.Command, /):
+        super().add_command(command)
+        self.help_index.invalidate()
+        self.autocomplete.index("commands").add(command.name)
+    
+    def remove_command(self, name: str, /) -> Optional[commands.Command]:
+        command = super().remove_command(name)
+        if command is not None and name not in command.aliases:
+            self.help_index.invalidate()
+            self.autocomplete.index("commands").discard(command.name)
+        return command
+
+    async def prefix_settings(self, guild: Optional[discord.Guild]) -> Tuple[str, bool]:
+        """``(prefix, allow_mention)`` for a guild, served from the prefix cache"""
+        if not guild:
+            return self.config.get("prefix", "!"), self.config.get("allow_mention_prefix", True)
+        
+        cached = await self.prefix_cache.get(guild.id)
+        if cached:
+            return cached
+        
+        custom_prefix = await self.db.get_guild_prefix(guild.id)
+        base_prefix = custom_prefix if custom_prefix else self.config.get("prefix", "!")
+        allow_mention = await self.db.get_guild_mention_prefix_enabled(guild.id)
+        if allow_mention is None:
+            allow_mention = self.config.get("allow_mention_prefix", True)
+        await self.prefix_cache.set(guild.id, base_prefix, allow_mention)
+        return base_prefix, allow_mention
+
+    async def get_prefix(self, message: discord.Message):
+        base_prefix, allow_mention = await self.prefix_settings(message.guild)
 
         if allow_mention:
             return commands.when_mentioned_or(base_prefix)(self, message)
         else:
             return base_prefix
     
+    async def invalidate_prefix(self, guild_id: int):
+        """Drop the cached prefix for a guild here and on every other cluster"""
+        await self.prefix_cache.invalidate(guild_id)
+        await self.publish_invalidation("prefix", guild_id=guild_id)
+    
+    async def publish_invalidation(self, channel: str, **payload):
+        """Forward a cache invalidation to the other clusters (no-op without ShardManager)"""
+        shard_manager_cog = self.get_cog("ShardManager")
+        if not shard_manager_cog:
+            return
+        try:
+            await shard_manager_cog.publish(channel, payload)
+        except Exception as e:
+            logger.warning(f"Could not publish {channel} invalidation: {e}")
+    
+    async def ensure_cog(self, cog_name: str) -> Optional[commands.Cog]:
+        """``get_cog`` that first loads the cog if lazy loading deferred it"""
+        return await self.lazy_cogs.ensure_cog(cog_name)
+
     async def sync_commands(self, force: bool = False):
         if self._slash_synced and not force:
             logger.info("Commands already synced, skipping")
@@ -555,12 +1895,14 @@ class BotFrameWork(commands.AutoShardedBot):
         logger.info("Shutting down bot...")
         
         self.status_update_task.cancel()
-        if hasattr(self, 'extension_reloader'):
-            self.extension_reloader.cancel()
+        self.extension_watcher.stop()
         if hasattr(self, 'log_rotation_task'):
             self.log_rotation_task.cancel()
+        if hasattr(self, 'log_summary_task'):
+            self.log_summary_task.cancel()
         if hasattr(self, 'db_maintenance_task'):
             self.db_maintenance_task.cancel()
+        self.lazy_cogs.idle_sweeper.cancel()
         
         shard_manager_cog = self.get_cog("ShardManager")
         if shard_manager_cog:
@@ -577,7 +1919,13 @@ class BotFrameWork(commands.AutoShardedBot):
         await super().close()
         logger.info("Bot shutdown complete")
 
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+log_listener: Optional[QueueListener] = None
+log_rate_limiter = LogRateLimiter()
+
 def setup_logging():
+    """Loggers only enqueue records; one writer thread formats them and writes files and console"""
+    global log_listener
     os.makedirs("./botlogs", exist_ok=True)
     
     logger = logging.getLogger('discord')
@@ -589,27 +1937,44 @@ def setup_logging():
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
-    permanent_handler = RotatingFileHandler(
+    log_queue = queue.SimpleQueue()
+    
+    # LOG_FORMAT=json switches the permanent log to JSON lines; the current-run log stays
+    # plain text because the marketplace and dashboard parse it
+    permanent_handler = BatchedLogFileHandler(
         filename='./botlogs/permanent.log',
         encoding='utf-8',
         maxBytes=10485760,
-        backupCount=5
+        backupCount=5,
+        pending=log_queue
     )
-    permanent_handler.setFormatter(formatter)
+    permanent_handler.setFormatter(JsonLinesFormatter() if LOG_FORMAT == "json" else formatter)
+    
+    # Clusters spawned by launcher.py each get their own current-run log
+    run_log = 'current_run.log'
+    if os.getenv("ZDBF_LAUNCHER"):
+        run_log = f"current_run_{os.getenv('SHARD_CLUSTER_NAME', 'cluster')}.log"
     
-    current_handler = logging.FileHandler(
-        filename='./botlogs/current_run.log',
+    current_handler = BatchedLogFileHandler(
+        filename=f'./botlogs/{run_log}',
         encoding='utf-8',
-        mode='w'
+        mode='w',
+        pending=log_queue
     )
     current_handler.setFormatter(formatter)
     
     console = logging.StreamHandler()
     console.setFormatter(formatter)
     
-    logger.addHandler(permanent_handler)
-    logger.addHandler(current_handler)
-    logger.addHandler(console)
+    log_listener = QueueListener(log_queue, permanent_handler, current_handler, console, respect_handler_level=True)
+    log_listener.start()
+    atexit.register(log_listener.stop)
+    global_log_rotator.attach_handler(permanent_handler)
+    
+    # Rate limits apply before enqueueing, so suppressed records cost no formatting or I/O
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(log_rate_limiter)
+    logger.addHandler(queue_handler)
     
     return logger
 
@@ -735,6 +2100,24 @@ async def on_command(ctx: commands.Context):
     await bot.db.increment_command_usage(ctx.command.name)
     logger.info(f"Command: {ctx.command.name} | User: {ctx.author} | Guild: {ctx.guild}")
 
+@bot.event
+async def on_app_command_completion(interaction: discord.Interaction, command):
+    # Hybrid commands are timed by the after_invoke hook; this covers pure
+    # app commands, which only expose receipt and completion.
+    if interaction.extras.get("zdbf_timed"):
+        return
+    received = interaction.extras.get("zdbf_received")
+    if received is not None:
+        bot.metrics.record_command_timing(command.qualified_name, "slash", {"total": (time.perf_counter() - received) * 1000})
+
+@bot.event
+async def on_cluster_invalidation(channel: str, payload: dict):
+    if channel == "prefix" and payload.get("guild_id"):
+        await bot.prefix_cache.invalidate(int(payload["guild_id"]))
+    elif channel == "config" and payload.get("key"):
+        bot.config.apply(payload["key"], payload.get("value"))
+        logger.debug(f"Config key {payload['key']} updated by another cluster")
+
 @bot.event
 async def on_command_error(ctx: commands.Context, error: Exception):
     bot.metrics.record_error()
@@ -811,7 +2194,7 @@ async def cleanup_command(ctx):
     try:
         pycache_cleaned = await bot.cleanup_pycache()
 
-        results.append(f"✅ Cleaned {pycache_cleaned} __pycache__ directories")
+        results.append(f"✅ Removed {pycache_cleaned} stale bytecode files")
         
         expired_prefix = await bot.prefix_cache.cleanup_expired()
         results.append(f"✅ Cleaned expired prefix cache entries")
@@ -860,27 +2243,8 @@ async def help_command(ctx):
     if ctx.interaction:
         if not await check_app_command_permissions(ctx.interaction, "help"):
             return
-    categories = {}
-    
-    main_commands = [cmd for cmd in bot.commands if cmd.cog is None and not cmd.hidden]
-    if main_commands:
-        categories["Main"] = main_commands
-    
-    for cog_name, cog in bot.cogs.items():
-        cmds = [cmd for cmd in cog.get_commands() if not cmd.hidden]
-        if cmds:
-            categories[cog_name] = cmds
-    
-    prefix = await bot.get_prefix(ctx.message)
-    if isinstance(prefix, list):
-        prefix = prefix[-1]
-    
-    if ctx.guild:
-        allow_mention = await bot.db.get_guild_mention_prefix_enabled(ctx.guild.id)
-        if allow_mention is None:
-            allow_mention = bot.config.get("allow_mention_prefix", True)
-    else:
-        allow_mention = bot.config.get("allow_mention_prefix", True)
+    categories = bot.help_index.categories
+    prefix, allow_mention = await bot.prefix_settings(ctx.guild)
     
     if allow_mention:
         prefix_info = f"Current Prefix: {prefix} or @{bot.user.name}"
@@ -949,10 +2313,39 @@ async def stats_command(ctx):
         inline=False
     )
     
+    shard_manager_cog = bot.get_cog("ShardManager")
+    if shard_manager_cog and shard_manager_cog._known_clusters():
+        try:
+            agg = await shard_manager_cog.cluster_metrics()
+            t = agg['totals']
+            embed.add_field(
+                name=f"🌐 All Clusters ({agg['cluster_count']})",
+                value=(
+                    f"```Commands: {t['commands_processed']} ({t['commands_per_sec']:.2f}/s)\n"
+                    f"Messages: {t['messages_seen']}\n"
+                    f"Errors: {t['error_count']}\n"
+                    f"Latency p50/p95: {t['latency_p50']:.0f}/{t['latency_p95']:.0f}ms```"
+                ),
+                inline=False
+            )
+        except Exception as e:
+            logger.debug(f"Cluster metrics unavailable: {e}")
+    
     if stats['top_commands']:
         top_cmds = '\n'.join([f"{cmd}: {count}" for cmd, count in list(stats['top_commands'].items())[:5]])
         embed.add_field(name="🔥 Top Commands", value=f"```{top_cmds}```", inline=False)
     
+    latency = bot.metrics.get_latency_stats(limit=5)
+    if latency['slowest_commands']:
+        slow_cmds = '\n'.join(
+            f"{c['kind'][0]}:{c['command'][:18]:<18} p50 {c['p50_ms']:>6.0f} p95 {c['p95_ms']:>6.0f}ms"
+            for c in latency['slowest_commands']
+        )
+        embed.add_field(name="⏱️ Slowest Commands (p = prefix, s = slash)", value=f"```{slow_cmds}```", inline=False)
+    if latency['spans']:
+        spans = '\n'.join(f"{sp['name'][:22]:<22} p95 {sp['p95_ms']:>6.1f}ms x{sp['count']}" for sp in latency['spans'])
+        embed.add_field(name="🔬 Traced Sections", value=f"```{spans}```", inline=False)
+    
     embed.set_footer(text=f"Requested by {ctx.author}", icon_url=ctx.author.display_avatar.url)
     await ctx.send(embed=embed)
     
@@ -1254,7 +2647,6 @@ async def reload_command(ctx, *, extension: str):
         start_time = time.time()
         await bot.reload_extension(f"extensions.{final_ext_to_load}")
         load_time = time.time() - start_time
-        bot.extension_load_times[final_ext_to_load] = load_time
         
         if hasattr(bot, 'emit_hook'):
             await bot.emit_hook("extension_loaded", extension_name=f"extensions.{final_ext_to_load}")
@@ -1308,7 +2700,6 @@ async def load_command(ctx, *, extension: str):
         start_time = time.time()
         await bot.load_extension(f"extensions.{final_ext_to_load}")
         load_time = time.time() - start_time
-        bot.extension_load_times[final_ext_to_load] = load_time
         
         embed = discord.Embed(
             title="✅ Extension Loaded",
@@ -1387,9 +2778,6 @@ async def unload_command(ctx, *, extension: str):
         if hasattr(bot, 'emit_hook'):
             await bot.emit_hook("extension_unloaded", extension_name=final_ext_name)
         
-        if simple_name in bot.extension_load_times:
-            del bot.extension_load_times[simple_name]
-            
         embed = discord.Embed(
             title="✅ Extension Unloaded",
             description=f"```Successfully unloaded: {simple_name}```",
@@ -1449,7 +2837,7 @@ async def extensions_command(ctx):
         ext_list = []
         for ext_name in sorted(user_extensions.keys()):
             simple_name = ext_name.replace("extensions.", "")
-            load_time = bot.extension_load_times.get(simple_name, 0)
+            load_time = bot.extension_load_times.get(ext_name, 0)
             ext_list.append(f"• {simple_name} ({load_time:.3f}s)")
         
         embed.add_field(
@@ -1502,7 +2890,7 @@ async def setprefix_command(ctx, prefix: str):
         return
     
     await bot.db.set_guild_prefix(ctx.guild.id, prefix)
-    await bot.prefix_cache.invalidate(ctx.guild.id)
+    await bot.invalidate_prefix(ctx.guild.id)
     
     embed = discord.Embed(
         title="✅ Prefix Changed",
@@ -1552,7 +2940,7 @@ async def config_command(ctx, command_name: str = None, role: discord.Role = Non
         restricted_cmds = []
         
         for cmd in sorted([cmd.name for cmd in bot.commands]):
-            if cmd in BOT_OWNER_ONLY_COMMANDS:
+            if bot.permissions.is_owner_only(cmd):
                 restricted_cmds.append(cmd)
             else:
                 configurable_cmds.append(cmd)
@@ -1618,7 +3006,7 @@ async def config_command(ctx, command_name: str = None, role: discord.Role = Non
             pass
         return
     
-    if command_name in BOT_OWNER_ONLY_COMMANDS and not is_owner:
+    if bot.permissions.is_owner_only(command_name) and not is_owner:
         embed = discord.Embed(
             title="🔒 Restricted Command",
             description=f"```Command '{command_name}' is restricted to the bot owner and cannot be configured by guild owners```",
@@ -1651,7 +3039,7 @@ async def config_command(ctx, command_name: str = None, role: discord.Role = Non
     current_perms = bot.config.get("command_permissions", {})
     
     if command_name.lower() == "none" or role is None:
-        if command_name in BOT_OWNER_ONLY_COMMANDS and not is_owner:
+        if bot.permissions.is_owner_only(command_name) and not is_owner:
             embed = discord.Embed(
                 title="🔒 Access Denied",
                 description=f"```You cannot modify permissions for bot owner commands```",
@@ -1683,7 +3071,7 @@ async def config_command(ctx, command_name: str = None, role: discord.Role = Non
                 timestamp=discord.utils.utcnow()
             )
     else:
-        if command_name in BOT_OWNER_ONLY_COMMANDS and not is_owner:
+        if bot.permissions.is_owner_only(command_name) and not is_owner:
             embed = discord.Embed(
                 title="🔒 Access Denied",
                 description=f"```You cannot add permissions to bot owner commands```",
@@ -2215,27 +3603,27 @@ class CategorySelect(discord.ui.Select):
             await interaction.response.send_message("❌ No categories available", ephemeral=True)
             return
         
-        cmds = self.categories[selected]
+        help_index = interaction.client.help_index
+        if selected not in help_index.categories:
+            await interaction.response.send_message("❌ That category is no longer available", ephemeral=True)
+            return
         
         page = 0
-        per_page = 5
-        total_pages = (len(cmds) - 1) // per_page + 1
+        total_pages = help_index.total_pages(selected)
         
-        embed = _create_command_page_embed(self.prefix, selected, cmds, page, per_page, total_pages, interaction.client)
+        embed = help_index.page(self.prefix, selected, page)
 
-        view = CategoryView(selected, cmds, page, per_page, total_pages, interaction.user, self.prefix)
+        view = CategoryView(selected, page, total_pages, interaction.user, self.prefix)
         await interaction.response.edit_message(embed=embed, view=view)
         logger.info(f"{interaction.user} selected category '{selected}'")
 
 
 
 class CategoryView(discord.ui.View):
-    def __init__(self, category, cmds, page, per_page, total_pages, author, prefix):
+    def __init__(self, category, page, total_pages, author, prefix):
         super().__init__(timeout=180)
         self.category = category
-        self.cmds = cmds
         self.page = page
-        self.per_page = per_page
         self.total_pages = total_pages
         self.author = author
         self.prefix = prefix
@@ -2265,7 +3653,7 @@ class PrevButton(discord.ui.Button):
         if view.page > 0:
             view.page -= 1
 
-        embed = _create_command_page_embed(self.prefix, view.category, view.cmds, view.page, view.per_page, view.total_pages, interaction.client)
+        embed = interaction.client.help_index.page(self.prefix, view.category, view.page)
         await interaction.response.edit_message(embed=embed, view=view)
 
 class NextButton(discord.ui.Button):
@@ -2278,7 +3666,7 @@ class NextButton(discord.ui.Button):
         if view.page < view.total_pages - 1:
             view.page += 1
 
-        embed = _create_command_page_embed(self.prefix, view.category, view.cmds, view.page, view.per_page, view.total_pages, interaction.client)
+        embed = interaction.client.help_index.page(self.prefix, view.category, view.page)
         await interaction.response.edit_message(embed=embed, view=view)
 
 class BackButton(discord.ui.Button):
@@ -2287,16 +3675,7 @@ class BackButton(discord.ui.Button):
         self.prefix = prefix
     
     async def callback(self, interaction: discord.Interaction):
-        categories = {}
-        
-        main_commands = [cmd for cmd in interaction.client.commands if cmd.cog is None and not cmd.hidden]
-        if main_commands:
-            categories["Main"] = main_commands
-        
-        for cog_name, cog in interaction.client.cogs.items():
-            cmds = [cmd for cmd in cog.get_commands() if not cmd.hidden]
-            if cmds:
-                categories[cog_name] = cmds
+        categories = interaction.client.help_index.categories
         
         if not categories:
             embed = discord.Embed(
@@ -2309,13 +3688,7 @@ class BackButton(discord.ui.Button):
             return
         
         total_categories = len(categories)
-        
-        if interaction.guild:
-            allow_mention = await interaction.client.db.get_guild_mention_prefix_enabled(interaction.guild.id)
-            if allow_mention is None:
-                allow_mention = interaction.client.config.get("allow_mention_prefix", True)
-        else:
-            allow_mention = interaction.client.config.get("allow_mention_prefix", True)
+        _, allow_mention = await interaction.client.prefix_settings(interaction.guild)
         
         if allow_mention:
             prefix_info = f"Current Prefix: {self.prefix} or @{interaction.client.user.name}"